@@ -1,8 +1,9 @@
 import time
 
-from anthropic import AsyncAnthropic
+from anthropic import APIStatusError, AsyncAnthropic
 
-from app.adapters.base import BaseAdapter, GenerationResponse
+from app.adapters.base import BaseAdapter, GenerationResponse, ProviderError, parse_retry_after
+from app.adapters.streaming import StreamTimer
 
 
 class AnthropicAdapter(BaseAdapter):
@@ -18,7 +19,7 @@ class AnthropicAdapter(BaseAdapter):
 
         start = time.perf_counter()
 
-        client = AsyncAnthropic(api_key=self.api_key)
+        client = self._client()
 
         kwargs: dict[str, object] = {
             "model": self.model.api_model,
@@ -31,6 +32,12 @@ class AnthropicAdapter(BaseAdapter):
 
         try:
             message = await client.messages.create(**kwargs)
+        except APIStatusError as exc:
+            raise ProviderError(
+                f"Anthropic API error: {exc}",
+                status_code=exc.status_code,
+                retry_after=parse_retry_after(exc.response.headers),
+            ) from exc
         except Exception as exc:
             raise ValueError(f"Anthropic API error: {exc}") from exc
 
@@ -61,3 +68,63 @@ class AnthropicAdapter(BaseAdapter):
             completion_tokens=completion_tokens,
             raw=raw,
         )
+
+    async def stream_generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        max_tokens: int = 512,
+    ) -> GenerationResponse:
+        if not self.api_key:
+            raise ValueError("ANTHROPIC_API_KEY is not configured.")
+
+        kwargs: dict[str, object] = {
+            "model": self.model.api_model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system_prompt:
+            kwargs["system"] = system_prompt
+
+        timer = StreamTimer()
+        parts: list[str] = []
+        try:
+            async with self._client().messages.stream(**kwargs) as stream:
+                async for text in stream.text_stream:
+                    if text:
+                        timer.mark()
+                        parts.append(text)
+                message = await stream.get_final_message()
+        except APIStatusError as exc:
+            raise ProviderError(
+                f"Anthropic API error: {exc}",
+                status_code=exc.status_code,
+                retry_after=parse_retry_after(exc.response.headers),
+            ) from exc
+        except Exception as exc:
+            raise ValueError(f"Anthropic API error: {exc}") from exc
+
+        usage = message.usage
+        prompt_tokens = getattr(usage, "input_tokens", 0) or 0
+        completion_tokens = getattr(usage, "output_tokens", 0) or timer.chunks
+        return GenerationResponse(
+            text="".join(parts),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            raw={
+                "usage": {"input_tokens": prompt_tokens, "output_tokens": completion_tokens},
+                "stream": True,
+            },
+            **timer.metrics(completion_tokens),
+        )
+
+    def _client(self) -> AsyncAnthropic:
+        # The SDK keeps its own connection pool; share one instance per key
+        if self.http_pool is None:
+            return AsyncAnthropic(api_key=self.api_key)
+        return self.http_pool.shared(
+            ("anthropic", self.api_key),
+            lambda: AsyncAnthropic(api_key=self.api_key),
+        )
@@ -1,7 +1,16 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 from enum import StrEnum
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+if TYPE_CHECKING:
+    from app.adapters.http_pool import HTTPClientPool
 
 
 class Provider(StrEnum):
@@ -17,6 +26,16 @@ class Provider(StrEnum):
 class Pricing:
     prompt_per_1k: float = 0.0
     completion_per_1k: float = 0.0
+    # Fraction taken off list price for batch-API calls
+    batch_discount: float = 0.5
+
+
+@dataclass(slots=True)
+class RateLimits:
+    """Requests/tokens per minute; None means unlimited."""
+
+    rpm: float | None = None
+    tpm: float | None = None
 
 
 @dataclass(slots=True)
@@ -26,6 +45,7 @@ class ModelConfig:
     api_model: str
     enabled: bool = True
     pricing: Pricing = field(default_factory=Pricing)
+    rate_limits: RateLimits = field(default_factory=RateLimits)
 
 
 @dataclass(slots=True)
@@ -35,16 +55,72 @@ class GenerationResponse:
     prompt_tokens: int
     completion_tokens: int
     raw: dict[str, Any]
+    cached: bool = False
+    # Served by a provider batch API (discounted pricing)
+    batched: bool = False
+    # Provider requests behind this response (retries and hedges included)
+    attempts: int = 1
+    # Streaming-only timings; None when the response was not streamed
+    ttft_ms: float | None = None
+    inter_token_latency_ms: float | None = None
+    tokens_per_second: float | None = None
 
     @property
     def total_tokens(self) -> int:
         return self.prompt_tokens + self.completion_tokens
 
 
+class ProviderError(ValueError):
+    """A provider call was rejected; carries the HTTP status and any Retry-After hint."""
+
+    def __init__(
+        self, message: str, status_code: int | None = None, retry_after: float | None = None
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @classmethod
+    def from_response(cls, provider: str, response: httpx.Response) -> "ProviderError":
+        return cls(
+            f"{provider} API error {response.status_code}: {response.text}",
+            status_code=response.status_code,
+            retry_after=parse_retry_after(response.headers),
+        )
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """Seconds to wait from ``retry-after-ms`` / ``retry-after`` (delta or HTTP date)."""
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(tz=UTC)).total_seconds())
+
+
 class BaseAdapter(ABC):
-    def __init__(self, model: ModelConfig, api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        model: ModelConfig,
+        api_key: str | None = None,
+        http_pool: "HTTPClientPool | None" = None,
+    ) -> None:
         self.model = model
         self.api_key = api_key
+        self.http_pool = http_pool
 
     @abstractmethod
     async def generate(
@@ -55,3 +131,30 @@ class BaseAdapter(ABC):
         max_tokens: int = 512,
     ) -> GenerationResponse:
         """Generate a model response."""
+
+    async def stream_generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        max_tokens: int = 512,
+    ) -> GenerationResponse:
+        """Generate via the provider's streaming API, recording token timings.
+
+        Adapters without a streaming implementation fall back to ``generate``.
+        """
+        return await self.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
+    @asynccontextmanager
+    async def _http(self, timeout: float) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared pooled client, or a one-off client when none was injected."""
+        if self.http_pool is not None:
+            yield self.http_pool.get(self.model.provider)
+            return
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            yield client
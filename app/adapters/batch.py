@@ -0,0 +1,240 @@
+"""Provider batch APIs (OpenAI Batch, Anthropic Message Batches).
+
+A ``BatchBackend`` knows how to upload a set of requests, report the batch
+status and download the results. Backends talk plain HTTP through the shared
+``HTTPClientPool`` and take a ``base_url``, so a local fake batch server (or an
+``httpx.MockTransport``) can stand in for the provider.
+"""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from app.adapters.base import GenerationResponse, ModelConfig, Provider, ProviderError
+
+if TYPE_CHECKING:
+    from app.adapters.http_pool import HTTPClientPool
+
+# Normalized batch states
+PENDING = "pending"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+@dataclass(slots=True)
+class BatchItem:
+    custom_id: str
+    prompt: str
+    system_prompt: str | None = None
+    temperature: float = 0.0
+    max_tokens: int = 512
+
+
+class BatchBackend(ABC):
+    provider: Provider
+    # Largest number of requests the provider accepts in one batch
+    max_requests: int = 50_000
+
+    def __init__(
+        self,
+        api_key: str | None,
+        base_url: str,
+        http_pool: HTTPClientPool | None = None,
+        timeout: float = 120.0,
+    ) -> None:
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.http_pool = http_pool
+        self.timeout = timeout
+
+    @abstractmethod
+    async def submit(self, model: ModelConfig, items: list[BatchItem]) -> str:
+        """Upload the requests and return the provider's batch id."""
+
+    @abstractmethod
+    async def status(self, batch_id: str) -> str:
+        """Return PENDING, COMPLETED or FAILED."""
+
+    @abstractmethod
+    async def results(self, batch_id: str) -> dict[str, GenerationResponse | Exception]:
+        """Download the finished batch, keyed by custom_id.
+
+        ``latency_ms`` on the responses is left at 0; the caller knows how long
+        the batch took end to end.
+        """
+
+    @abstractmethod
+    async def cancel(self, batch_id: str) -> None:
+        """Ask the provider to stop working on the batch."""
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        if self.http_pool is not None:
+            response = await self.http_pool.get(self.provider).request(
+                method, url, headers=self._headers(), timeout=self.timeout, **kwargs
+            )
+        else:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.request(method, url, headers=self._headers(), **kwargs)
+        if response.is_error:
+            raise ProviderError.from_response(f"{self.provider.value} batch", response)
+        return response
+
+    @abstractmethod
+    def _headers(self) -> dict[str, str]:
+        """Auth headers for every batch API call."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    provider = Provider.OPENAI
+    max_requests = 50_000
+
+    async def submit(self, model: ModelConfig, items: list[BatchItem]) -> str:
+        lines = []
+        for item in items:
+            messages: list[dict[str, str]] = []
+            if item.system_prompt:
+                messages.append({"role": "system", "content": item.system_prompt})
+            messages.append({"role": "user", "content": item.prompt})
+            lines.append(
+                json.dumps(
+                    {
+                        "custom_id": item.custom_id,
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": model.api_model,
+                            "messages": messages,
+                            "temperature": item.temperature,
+                            "max_tokens": item.max_tokens,
+                        },
+                    }
+                )
+            )
+        upload = await self._request(
+            "POST",
+            f"{self.base_url}/files",
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", "\n".join(lines).encode(), "application/jsonl")},
+        )
+        batch = await self._request(
+            "POST",
+            f"{self.base_url}/batches",
+            json={
+                "input_file_id": upload.json()["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+        )
+        return batch.json()["id"]
+
+    async def status(self, batch_id: str) -> str:
+        data = (await self._request("GET", f"{self.base_url}/batches/{batch_id}")).json()
+        if data["status"] == "completed":
+            return COMPLETED
+        if data["status"] in ("failed", "expired", "cancelled"):
+            return FAILED
+        return PENDING
+
+    async def results(self, batch_id: str) -> dict[str, GenerationResponse | Exception]:
+        data = (await self._request("GET", f"{self.base_url}/batches/{batch_id}")).json()
+        results: dict[str, GenerationResponse | Exception] = {}
+        for file_id in (data.get("output_file_id"), data.get("error_file_id")):
+            if not file_id:
+                continue
+            content = await self._request("GET", f"{self.base_url}/files/{file_id}/content")
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                response = row.get("response") or {}
+                body = response.get("body") or {}
+                if row.get("error") or response.get("status_code", 500) >= 400:
+                    error = row.get("error") or body.get("error") or body
+                    results[row["custom_id"]] = ProviderError(
+                        f"OpenAI batch error {response.get('status_code')}: {error}",
+                        status_code=response.get("status_code"),
+                    )
+                    continue
+                usage = body.get("usage", {})
+                results[row["custom_id"]] = GenerationResponse(
+                    text=body["choices"][0]["message"]["content"] or "",
+                    latency_ms=0.0,
+                    prompt_tokens=usage.get("prompt_tokens", 0),
+                    completion_tokens=usage.get("completion_tokens", 0),
+                    raw={"batch_id": batch_id, "usage": usage},
+                    batched=True,
+                )
+        return results
+
+    async def cancel(self, batch_id: str) -> None:
+        await self._request("POST", f"{self.base_url}/batches/{batch_id}/cancel")
+
+    def _headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"}
+
+
+class AnthropicBatchBackend(BatchBackend):
+    provider = Provider.ANTHROPIC
+    max_requests = 100_000
+    API_VERSION = "2023-06-01"
+
+    async def submit(self, model: ModelConfig, items: list[BatchItem]) -> str:
+        requests = []
+        for item in items:
+            params: dict[str, object] = {
+                "model": model.api_model,
+                "max_tokens": item.max_tokens,
+                "temperature": item.temperature,
+                "messages": [{"role": "user", "content": item.prompt}],
+            }
+            if item.system_prompt:
+                params["system"] = item.system_prompt
+            requests.append({"custom_id": item.custom_id, "params": params})
+        batch = await self._request(
+            "POST", f"{self.base_url}/messages/batches", json={"requests": requests}
+        )
+        return batch.json()["id"]
+
+    async def status(self, batch_id: str) -> str:
+        data = (await self._request("GET", f"{self.base_url}/messages/batches/{batch_id}")).json()
+        return COMPLETED if data["processing_status"] == "ended" else PENDING
+
+    async def results(self, batch_id: str) -> dict[str, GenerationResponse | Exception]:
+        data = (await self._request("GET", f"{self.base_url}/messages/batches/{batch_id}")).json()
+        content = await self._request("GET", data["results_url"])
+        results: dict[str, GenerationResponse | Exception] = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            result = row.get("result") or {}
+            if result.get("type") != "succeeded":
+                error = (result.get("error") or {}).get("error") or result.get("type")
+                results[row["custom_id"]] = ProviderError(f"Anthropic batch error: {error}")
+                continue
+            message = result["message"]
+            usage = message.get("usage", {})
+            text = "".join(
+                block.get("text", "") for block in message.get("content", [])
+                if block.get("type") == "text"
+            )
+            results[row["custom_id"]] = GenerationResponse(
+                text=text,
+                latency_ms=0.0,
+                prompt_tokens=usage.get("input_tokens", 0),
+                completion_tokens=usage.get("output_tokens", 0),
+                raw={"batch_id": batch_id, "usage": usage},
+                batched=True,
+            )
+        return results
+
+    async def cancel(self, batch_id: str) -> None:
+        await self._request("POST", f"{self.base_url}/messages/batches/{batch_id}/cancel")
+
+    def _headers(self) -> dict[str, str]:
+        return {"x-api-key": self.api_key or "", "anthropic-version": self.API_VERSION}
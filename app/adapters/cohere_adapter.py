@@ -1,8 +1,12 @@
+import json
 import time
 
 import httpx
 
-from app.adapters.base import BaseAdapter, GenerationResponse
+from app.adapters.base import BaseAdapter, GenerationResponse, ProviderError
+from app.adapters.streaming import StreamTimer, iter_sse, raise_for_stream_status
+
+API_URL = "https://api.cohere.com/v2/chat"
 
 
 class CohereAdapter(BaseAdapter):
@@ -30,18 +34,17 @@ class CohereAdapter(BaseAdapter):
         }
 
         headers = {"Authorization": f"Bearer {self.api_key}"}
-        async with httpx.AsyncClient(timeout=60) as client:
+        async with self._http(timeout=60) as client:
             response = await client.post(
-                "https://api.cohere.com/v2/chat",
+                API_URL,
                 json=payload,
                 headers=headers,
+                timeout=60,
             )
             try:
                 response.raise_for_status()
             except httpx.HTTPStatusError as exc:
-                raise ValueError(
-                    f"Cohere API error {exc.response.status_code}: {exc.response.text}"
-                ) from exc
+                raise ProviderError.from_response("Cohere", exc.response) from exc
             data = response.json()
 
         latency_ms = (time.perf_counter() - start) * 1000
@@ -59,3 +62,59 @@ class CohereAdapter(BaseAdapter):
             completion_tokens=output_tokens,
             raw=data,
         )
+
+    async def stream_generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        max_tokens: int = 512,
+    ) -> GenerationResponse:
+        if not self.api_key:
+            raise ValueError("COHERE_API_KEY is not configured.")
+
+        messages: list[dict[str, str]] = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        payload = {
+            "model": self.model.api_model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+        }
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+
+        timer = StreamTimer()
+        parts: list[str] = []
+        usage: dict = {}
+        async with self._http(timeout=60) as client:
+            async with client.stream(
+                "POST", API_URL, json=payload, headers=headers, timeout=60
+            ) as response:
+                await raise_for_stream_status(response, "Cohere")
+                async for _, data in iter_sse(response):
+                    event = json.loads(data)
+                    if event.get("type") == "content-delta":
+                        text = (
+                            event.get("delta", {})
+                            .get("message", {})
+                            .get("content", {})
+                            .get("text", "")
+                        )
+                        if text:
+                            timer.mark()
+                            parts.append(text)
+                    elif event.get("type") == "message-end":
+                        usage = event.get("delta", {}).get("usage", {})
+
+        tokens = usage.get("tokens", {})
+        completion_tokens = tokens.get("output_tokens", timer.chunks)
+        return GenerationResponse(
+            text="".join(parts),
+            prompt_tokens=tokens.get("input_tokens", 0),
+            completion_tokens=completion_tokens,
+            raw={"usage": usage, "stream": True},
+            **timer.metrics(completion_tokens),
+        )
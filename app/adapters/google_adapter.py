@@ -1,8 +1,12 @@
+import json
 import time
 
 import httpx
 
-from app.adapters.base import BaseAdapter, GenerationResponse
+from app.adapters.base import BaseAdapter, GenerationResponse, ProviderError
+from app.adapters.streaming import StreamTimer, iter_sse, raise_for_stream_status
+
+API_BASE = "https://generativelanguage.googleapis.com/v1beta/models"
 
 
 class GoogleAdapter(BaseAdapter):
@@ -22,19 +26,14 @@ class GoogleAdapter(BaseAdapter):
             "contents": [{"role": "user", "parts": [{"text": full_prompt}]}],
             "generationConfig": {"temperature": temperature, "maxOutputTokens": max_tokens},
         }
-        url = (
-            f"https://generativelanguage.googleapis.com/v1beta/models/"
-            f"{self.model.api_model}:generateContent?key={self.api_key}"
-        )
+        url = f"{API_BASE}/{self.model.api_model}:generateContent?key={self.api_key}"
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post(url, json=payload)
+        async with self._http(timeout=60) as client:
+            response = await client.post(url, json=payload, timeout=60)
             try:
                 response.raise_for_status()
             except httpx.HTTPStatusError as exc:
-                raise ValueError(
-                    f"Google API error {exc.response.status_code}: {exc.response.text}"
-                ) from exc
+                raise ProviderError.from_response("Google", exc.response) from exc
             data = response.json()
 
         latency_ms = (time.perf_counter() - start) * 1000
@@ -61,3 +60,48 @@ class GoogleAdapter(BaseAdapter):
             completion_tokens=usage.get("candidatesTokenCount", usage.get("totalTokenCount", 0)),
             raw=data,
         )
+
+    async def stream_generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        max_tokens: int = 512,
+    ) -> GenerationResponse:
+        if not self.api_key:
+            raise ValueError("GOOGLE_API_KEY is not configured.")
+
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": full_prompt}]}],
+            "generationConfig": {"temperature": temperature, "maxOutputTokens": max_tokens},
+        }
+        url = (
+            f"{API_BASE}/{self.model.api_model}:streamGenerateContent"
+            f"?alt=sse&key={self.api_key}"
+        )
+
+        timer = StreamTimer()
+        parts: list[str] = []
+        usage: dict = {}
+        async with self._http(timeout=60) as client:
+            async with client.stream("POST", url, json=payload, timeout=60) as response:
+                await raise_for_stream_status(response, "Google")
+                async for _, data in iter_sse(response):
+                    chunk = json.loads(data)
+                    usage = chunk.get("usageMetadata", usage)
+                    for candidate in chunk.get("candidates", [])[:1]:
+                        for part in candidate.get("content", {}).get("parts", []):
+                            # Skip "thought" parts (gemini-2.5-pro thinking mode)
+                            if "thought" not in part and part.get("text"):
+                                timer.mark()
+                                parts.append(part["text"])
+
+        completion_tokens = usage.get("candidatesTokenCount", timer.chunks)
+        return GenerationResponse(
+            text="".join(parts),
+            prompt_tokens=usage.get("promptTokenCount", 0),
+            completion_tokens=completion_tokens,
+            raw={"usageMetadata": usage, "stream": True},
+            **timer.metrics(completion_tokens),
+        )
@@ -0,0 +1,85 @@
+"""Long-lived, pooled HTTP clients shared by the httpx-based adapters.
+
+One ``httpx.AsyncClient`` per provider keeps TCP/TLS connections alive across
+cases (and across runs), so reported latency reflects the model rather than a
+fresh handshake per request. The pool is owned by the app lifespan.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+import httpx
+
+from app.adapters.base import Provider
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HTTPClientPool:
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: float = 60.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = http2 and self._http2_available()
+        # Optional transport override (e.g. httpx.MockTransport for a fake provider)
+        self.transport = transport
+        self._clients: dict[Provider, httpx.AsyncClient] = {}
+        # SDK clients (e.g. AsyncAnthropic) that keep their own connection pools
+        self._shared: dict[Hashable, Any] = {}
+
+    def get(self, provider: Provider) -> httpx.AsyncClient:
+        """Return the shared client for ``provider``, creating it on first use."""
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+                transport=self.transport,
+            )
+            self._clients[provider] = client
+        return client
+
+    def shared(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Return a long-lived SDK client for ``key``; it is closed with the pool."""
+        if key not in self._shared:
+            self._shared[key] = factory()
+        return self._shared[key]
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        shared, self._shared = self._shared, {}
+        for provider, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception:  # noqa: BLE001
+                logger.warning("HTTP pool: failed to close %s client", provider, exc_info=True)
+        for sdk_client in shared.values():
+            try:
+                await sdk_client.close()
+            except Exception:  # noqa: BLE001
+                logger.warning("HTTP pool: failed to close SDK client", exc_info=True)
+
+    @staticmethod
+    def _http2_available() -> bool:
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP2_ENABLED is set but 'h2' is not installed – using HTTP/1.1")
+            return False
+        return True
@@ -1,6 +1,8 @@
+import asyncio
 import time
 
 from app.adapters.base import BaseAdapter, GenerationResponse
+from app.adapters.streaming import StreamTimer
 
 
 class MockAdapter(BaseAdapter):
@@ -24,3 +26,27 @@ class MockAdapter(BaseAdapter):
             completion_tokens=completion_tokens,
             raw={"provider": "mock"},
         )
+
+    async def stream_generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        max_tokens: int = 512,
+    ) -> GenerationResponse:
+        timer = StreamTimer()
+        content = f"[mock:{self.model.id}] {prompt[: min(len(prompt), max_tokens)]}"
+        chunks = content.split()
+        for _ in chunks:
+            # Yield to the loop between "tokens" like a real stream would
+            await asyncio.sleep(0)
+            timer.mark()
+        completion_tokens = max(1, len(chunks))
+
+        return GenerationResponse(
+            text=content,
+            prompt_tokens=max(1, len(prompt.split())),
+            completion_tokens=completion_tokens,
+            raw={"provider": "mock", "stream": True},
+            **timer.metrics(completion_tokens),
+        )
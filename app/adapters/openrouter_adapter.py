@@ -2,7 +2,10 @@ import time
 
 import httpx
 
-from app.adapters.base import BaseAdapter, GenerationResponse
+from app.adapters.base import BaseAdapter, GenerationResponse, ProviderError
+from app.adapters.streaming import stream_chat_completions
+
+API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
 
 class OpenRouterAdapter(BaseAdapter):
@@ -34,25 +37,19 @@ class OpenRouterAdapter(BaseAdapter):
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "HTTP-Referer": "https://github.com/sakshiasati17/LLm-Evaluation-Analytics",
-            "X-Title": "SentinelAI LLM Evaluation Platform",
-            "Content-Type": "application/json",
-        }
+        headers = self._headers()
 
-        async with httpx.AsyncClient(timeout=90) as client:
+        async with self._http(timeout=90) as client:
             response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
+                API_URL,
                 json=payload,
                 headers=headers,
+                timeout=90,
             )
             try:
                 response.raise_for_status()
             except httpx.HTTPStatusError as exc:
-                raise ValueError(
-                    f"OpenRouter API error {exc.response.status_code}: {exc.response.text}"
-                ) from exc
+                raise ProviderError.from_response("OpenRouter", exc.response) from exc
             data = response.json()
 
         latency_ms = (time.perf_counter() - start) * 1000
@@ -66,3 +63,46 @@ class OpenRouterAdapter(BaseAdapter):
             completion_tokens=usage.get("completion_tokens", 0),
             raw=data,
         )
+
+    async def stream_generate(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        temperature: float = 0.0,
+        max_tokens: int = 512,
+    ) -> GenerationResponse:
+        if not self.api_key:
+            raise ValueError("OPENROUTER_API_KEY is not configured.")
+
+        messages: list[dict[str, str]] = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        payload = {
+            "model": self.model.api_model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+        async with self._http(timeout=90) as client:
+            text, usage, timer = await stream_chat_completions(
+                client, API_URL, payload, self._headers(), timeout=90, provider="OpenRouter"
+            )
+
+        completion_tokens = usage.get("completion_tokens", timer.chunks)
+        return GenerationResponse(
+            text=text,
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=completion_tokens,
+            raw={"usage": usage, "stream": True},
+            **timer.metrics(completion_tokens),
+        )
+
+    def _headers(self) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "HTTP-Referer": "https://github.com/sakshiasati17/LLm-Evaluation-Analytics",
+            "X-Title": "SentinelAI LLM Evaluation Platform",
+            "Content-Type": "application/json",
+        }
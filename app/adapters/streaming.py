@@ -0,0 +1,111 @@
+"""Helpers for streaming generation: SSE parsing and token-timing metrics."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from app.adapters.base import ProviderError
+
+
+class StreamTimer:
+    """Records when output arrives so TTFT and decode throughput can be derived."""
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.first: float | None = None
+        self.last: float | None = None
+        self.chunks = 0
+
+    def mark(self) -> None:
+        """Call once per received chunk that carries output text."""
+        now = time.perf_counter()
+        if self.first is None:
+            self.first = now
+        self.last = now
+        self.chunks += 1
+
+    def metrics(self, completion_tokens: int) -> dict[str, float | None]:
+        """Return latency_ms, ttft_ms, inter_token_latency_ms and tokens_per_second."""
+        end = time.perf_counter()
+        latency_ms = (end - self.start) * 1000
+        if self.first is None or self.last is None:
+            return {
+                "latency_ms": latency_ms,
+                "ttft_ms": None,
+                "inter_token_latency_ms": None,
+                "tokens_per_second": None,
+            }
+        decode_s = self.last - self.first
+        tokens = max(completion_tokens, self.chunks)
+        return {
+            "latency_ms": latency_ms,
+            "ttft_ms": (self.first - self.start) * 1000,
+            "inter_token_latency_ms": decode_s * 1000 / (tokens - 1) if tokens > 1 else None,
+            "tokens_per_second": (tokens - 1) / decode_s if tokens > 1 and decode_s > 0 else None,
+        }
+
+
+async def iter_sse(response: httpx.Response) -> AsyncIterator[tuple[str | None, str]]:
+    """Yield ``(event, data)`` pairs from a Server-Sent Events response."""
+    event: str | None = None
+    data: list[str] = []
+    async for line in response.aiter_lines():
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = None, []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        value = value.removeprefix(" ")
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+    if data:
+        yield event, "\n".join(data)
+
+
+async def raise_for_stream_status(response: httpx.Response, provider: str) -> None:
+    if response.status_code >= 400:
+        await response.aread()
+        raise ProviderError.from_response(provider, response)
+
+
+async def stream_chat_completions(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict[str, Any],
+    headers: dict[str, str],
+    timeout: float,
+    provider: str,
+) -> tuple[str, dict[str, Any], StreamTimer]:
+    """Consume an OpenAI-compatible chat completions stream.
+
+    Returns the concatenated text, the usage block (if the provider sent one)
+    and the timer holding the chunk arrival times.
+    """
+    body = {**payload, "stream": True, "stream_options": {"include_usage": True}}
+    timer = StreamTimer()
+    parts: list[str] = []
+    usage: dict[str, Any] = {}
+    async with client.stream("POST", url, json=body, headers=headers, timeout=timeout) as response:
+        await raise_for_stream_status(response, provider)
+        async for _, data in iter_sse(response):
+            if data.strip() == "[DONE]":
+                break
+            chunk = json.loads(data)
+            if chunk.get("usage"):
+                usage = chunk["usage"]
+            for choice in chunk.get("choices") or []:
+                text = (choice.get("delta") or {}).get("content")
+                if text:
+                    timer.mark()
+                    parts.append(text)
+    return "".join(parts), usage, timer
@@ -1,18 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from app.core.config import Settings
 from app.schemas.evaluation import (
     BenchmarkListResponse,
+    CaseQueryRequest,
+    CaseQueryResponse,
     CompareRequest,
     CompareResponse,
+    CompareTiming,
     EvalGateRequest,
     EvalGateResponse,
+    JobInfo,
+    JobListResponse,
     MetricsResponse,
     ModelComparisonResponse,
     RunBenchmarkRequest,
     RunBenchmarkResponse,
     RunEvalRequest,
     RunEvalResponse,
+    RunHeader,
     RunTaskRequest,
     RunTaskResponse,
     TaskInfo,
@@ -22,10 +34,13 @@ from app.schemas.evaluation import (
 from app.services.alerts import AlertService
 from app.services.analytics import AnalyticsService
 from app.services.benchmark import BenchmarkService
+from app.services.case_analytics import CaseAnalyticsService
 from app.services.db_store import DBStore
 from app.services.evaluator import EvaluatorService
 from app.services.gate import EvalGateService
+from app.services.jobs import JobService
 from app.services.model_registry import ModelRegistry
+from app.services.run_store import RunStore
 from app.services.task_recommender import TaskRecommender
 
 router = APIRouter()
@@ -55,6 +70,14 @@ def get_analytics(request: Request) -> AnalyticsService:
     return request.app.state.analytics
 
 
+def get_run_store(request: Request) -> RunStore:
+    return request.app.state.run_store
+
+
+def get_case_analytics(request: Request) -> CaseAnalyticsService:
+    return request.app.state.case_analytics
+
+
 def get_db_store(request: Request) -> DBStore:
     return request.app.state.db_store
 
@@ -67,14 +90,25 @@ def get_task_recommender(request: Request) -> TaskRecommender:
     return request.app.state.task_recommender
 
 
+def get_jobs(request: Request) -> JobService:
+    return request.app.state.jobs
+
+
 @router.get("/health")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
 @router.get("/models")
-async def models(registry: ModelRegistry = Depends(get_registry)) -> dict[str, object]:
-    return {"default_model": registry.get_default_model_id(), "models": registry.list_models()}
+async def models(
+    registry: ModelRegistry = Depends(get_registry),
+    evaluator: EvaluatorService = Depends(get_evaluator),
+) -> dict[str, object]:
+    items = registry.list_models()
+    if evaluator.breaker is not None:
+        for item in items:
+            item["circuit"] = evaluator.breaker.snapshot(str(item["provider"]), str(item["id"]))
+    return {"default_model": registry.get_default_model_id(), "models": items}
 
 
 @router.get("/metrics", response_model=MetricsResponse)
@@ -83,16 +117,42 @@ async def metrics(
     prompt_version: str | None = None,
     dataset_version: str | None = None,
     limit: int = 100,
+    since: str | None = Query(default=None, description="ISO timestamp; runs created at or after."),
+    until: str | None = Query(default=None, description="ISO timestamp; runs created before."),
     analytics: AnalyticsService = Depends(get_analytics),
 ) -> MetricsResponse:
     if limit < 1 or limit > 500:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="limit must be in range 1..500.")
-    return analytics.get_metrics(
-        model_id=model_id,
-        prompt_version=prompt_version,
-        dataset_version=dataset_version,
-        limit=limit,
-    )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="limit must be in range 1..500."
+        )
+    try:
+        return analytics.get_metrics(
+            model_id=model_id,
+            prompt_version=prompt_version,
+            dataset_version=dataset_version,
+            limit=limit,
+            since=since,
+            until=until,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.post("/analytics/cases", response_model=CaseQueryResponse)
+async def query_cases(
+    payload: CaseQueryRequest,
+    case_analytics: CaseAnalyticsService = Depends(get_case_analytics),
+) -> CaseQueryResponse:
+    """Group-by / filter / percentile query over per-case results."""
+    try:
+        # Ingesting new runs and scanning cases is blocking work
+        return await asyncio.to_thread(case_analytics.query, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
 
 
 @router.get("/model-comparison", response_model=ModelComparisonResponse)
@@ -100,15 +160,24 @@ async def model_comparison(
     prompt_version: str | None = None,
     dataset_version: str | None = None,
     limit: int = 400,
+    since: str | None = Query(default=None, description="ISO timestamp; runs created at or after."),
+    until: str | None = Query(default=None, description="ISO timestamp; runs created before."),
     analytics: AnalyticsService = Depends(get_analytics),
 ) -> ModelComparisonResponse:
     if limit < 1 or limit > 1000:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="limit must be in range 1..1000.")
-    return analytics.get_model_comparison(
-        prompt_version=prompt_version,
-        dataset_version=dataset_version,
-        limit=limit,
-    )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="limit must be in range 1..1000."
+        )
+    try:
+        return analytics.get_model_comparison(
+            prompt_version=prompt_version,
+            dataset_version=dataset_version,
+            limit=limit,
+            since=since,
+            until=until,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
 @router.post("/run-eval", response_model=RunEvalResponse)
@@ -119,15 +188,85 @@ async def run_eval(
 ) -> RunEvalResponse:
     try:
         result = await evaluator.run_eval(payload)
-        db_store.save(result)
+        await db_store.save_async(result)
         # Broadcast to WebSocket clients for real-time dashboard updates
         from app.main import ws_manager
-        await ws_manager.broadcast({"event": "eval_complete", "model_id": result.model_id, "run_id": result.run_id})
+        await ws_manager.broadcast(
+            {"event": "eval_complete", "model_id": result.model_id, "run_id": result.run_id}
+        )
         return result
     except (KeyError, ValueError) as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
+@router.get("/runs/{run_id}", response_model=RunEvalResponse | RunHeader)
+async def get_run(
+    run_id: str,
+    include_results: bool = Query(default=False, description="Also load the per-case results."),
+    run_store: RunStore = Depends(get_run_store),
+) -> RunEvalResponse | RunHeader:
+    """A stored run's header; per-case results are only read when requested."""
+    try:
+        stored = run_store.open_run(run_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    return stored.to_response() if include_results else stored.header
+
+
+@router.post("/runs/{run_id}/resume", response_model=RunEvalResponse)
+async def resume_run(
+    run_id: str,
+    evaluator: EvaluatorService = Depends(get_evaluator),
+    db_store: DBStore = Depends(get_db_store),
+) -> RunEvalResponse:
+    """Finish an interrupted run from its checkpoint, re-running only the missing cases."""
+    try:
+        result = await evaluator.resume(run_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    await db_store.save_async(result)
+    from app.main import ws_manager
+    await ws_manager.broadcast(
+        {"event": "eval_complete", "model_id": result.model_id, "run_id": result.run_id}
+    )
+    return result
+
+
+@router.post("/run-eval/stream")
+async def run_eval_stream(
+    payload: RunEvalRequest,
+    format: Literal["ndjson", "sse"] = "ndjson",
+    evaluator: EvaluatorService = Depends(get_evaluator),
+    db_store: DBStore = Depends(get_db_store),
+) -> StreamingResponse:
+    """Stream each case result and a running summary as NDJSON or Server-Sent Events."""
+    if payload.execution == "batch":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="execution='batch' cannot be streamed; use /run-eval or a job.",
+        )
+    try:
+        ctx = evaluator.prepare_run(payload)
+    except (KeyError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    async def body() -> AsyncIterator[str]:
+        async for event in evaluator.stream_eval(ctx):
+            data = event.model_dump_json(exclude_none=True)
+            yield f"event: {event.event}\ndata: {data}\n\n" if format == "sse" else f"{data}\n"
+        if ctx.run is not None:
+            await db_store.save_async(ctx.run)
+            from app.main import ws_manager
+            await ws_manager.broadcast(
+                {"event": "eval_complete", "model_id": ctx.run.model_id, "run_id": ctx.run.run_id}
+            )
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
 @router.post("/compare", response_model=CompareResponse)
 async def compare(
     payload: CompareRequest,
@@ -136,7 +275,8 @@ async def compare(
 ) -> CompareResponse:
     if not payload.model_ids:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="model_ids must contain at least one model."
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="model_ids must contain at least one model.",
         )
 
     run_request = RunEvalRequest(
@@ -148,14 +288,36 @@ async def compare(
         prompt_template=payload.prompt_template,
         temperature=payload.temperature,
         max_tokens=payload.max_tokens,
+        concurrency=payload.concurrency,
+        use_cache=payload.use_cache,
+        stream=payload.stream,
+        hedge=payload.hedge,
+        execution=payload.execution,
     )
     try:
-        runs = await evaluator.compare(payload.model_ids, run_request)
+        start = time.perf_counter()
+        runs, errors = await evaluator.compare(payload.model_ids, run_request)
+        total_wall_clock_ms = (time.perf_counter() - start) * 1000
         for run in runs:
-            db_store.save(run)
+            await db_store.save_async(run)
     except (KeyError, ValueError) as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    return CompareResponse(runs=runs)
+
+    timings = [
+        CompareTiming(
+            model_id=run.model_id,
+            run_id=run.run_id,
+            wall_clock_ms=run.summary.wall_clock_ms or 0.0,
+        )
+        for run in runs
+    ]
+    return CompareResponse(
+        runs=runs,
+        timings=timings,
+        errors=errors,
+        total_wall_clock_ms=round(total_wall_clock_ms, 2),
+        sequential_wall_clock_ms=round(sum(item.wall_clock_ms for item in timings), 2),
+    )
 
 
 @router.post("/eval-gate", response_model=EvalGateResponse)
@@ -175,10 +337,20 @@ async def eval_gate(
         prompt_template=payload.prompt_template,
         temperature=payload.temperature,
         max_tokens=payload.max_tokens,
+        concurrency=payload.concurrency,
+        use_cache=payload.use_cache,
+        stream=payload.stream,
+        hedge=payload.hedge,
+        execution=payload.execution,
     )
     try:
-        run = await evaluator.run_eval(run_request)
-        gate_result = gate_service.evaluate(run=run, thresholds=payload.thresholds)
+        if payload.sequential is not None:
+            gate_result = await gate_service.evaluate_sequential(
+                evaluator, run_request, payload.thresholds, payload.sequential
+            )
+        else:
+            run = await evaluator.run_eval(run_request)
+            gate_result = gate_service.evaluate(run=run, thresholds=payload.thresholds)
     except (KeyError, ValueError) as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
@@ -217,10 +389,27 @@ async def run_benchmark(
             model_id=payload.model_id,
             temperature=payload.temperature,
             max_tokens=payload.max_tokens,
+            concurrency=payload.concurrency,
+            use_cache=payload.use_cache,
+            stream=payload.stream,
+            hedge=payload.hedge,
+            execution=payload.execution,
+            sample_size=payload.sample_size,
+            sample_fraction=payload.sample_fraction,
+            stratify_by=payload.stratify_by,
+            seed=payload.seed,
+            confidence=payload.confidence,
         )
-        db_store.save(run)
+        await db_store.save_async(run)
         from app.main import ws_manager
-        await ws_manager.broadcast({"event": "benchmark_complete", "benchmark": payload.benchmark, "model_id": run.model_id, "run_id": run.run_id})
+        await ws_manager.broadcast(
+            {
+                "event": "benchmark_complete",
+                "benchmark": payload.benchmark,
+                "model_id": run.model_id,
+                "run_id": run.run_id,
+            }
+        )
         return RunBenchmarkResponse(benchmark=payload.benchmark, run=run)
     except (KeyError, ValueError, FileNotFoundError) as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
@@ -260,11 +449,91 @@ async def run_task(
             model_id=payload.model_id,
             temperature=payload.temperature,
             max_tokens=payload.max_tokens,
+            concurrency=payload.concurrency,
+            use_cache=payload.use_cache,
+            stream=payload.stream,
+            hedge=payload.hedge,
+            execution=payload.execution,
         )
-        db_store.save(run)
+        await db_store.save_async(run)
         from app.main import ws_manager
-        await ws_manager.broadcast({"event": "task_eval_complete", "task_id": payload.task_id, "model_id": run.model_id, "run_id": run.run_id})
+        await ws_manager.broadcast(
+            {
+                "event": "task_eval_complete",
+                "task_id": payload.task_id,
+                "model_id": run.model_id,
+                "run_id": run.run_id,
+            }
+        )
         return RunTaskResponse(task=task, benchmark_run=run)
     except (KeyError, ValueError, FileNotFoundError) as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
+
+
+# ── Job Endpoints ───────────────────────────────────────────────────
+
+
+@router.post(
+    "/jobs/benchmarks/run",
+    response_model=JobInfo,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["jobs"],
+)
+async def submit_benchmark_job(
+    payload: RunBenchmarkRequest,
+    jobs: JobService = Depends(get_jobs),
+) -> JobInfo:
+    return await jobs.submit("benchmark", payload)
+
+
+@router.post(
+    "/jobs/tasks/run",
+    response_model=JobInfo,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["jobs"],
+)
+async def submit_task_job(
+    payload: RunTaskRequest,
+    jobs: JobService = Depends(get_jobs),
+) -> JobInfo:
+    return await jobs.submit("task", payload)
+
+
+@router.post(
+    "/jobs/compare",
+    response_model=JobInfo,
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["jobs"],
+)
+async def submit_compare_job(
+    payload: CompareRequest,
+    jobs: JobService = Depends(get_jobs),
+) -> JobInfo:
+    if not payload.model_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="model_ids must contain at least one model.",
+        )
+    return await jobs.submit("compare", payload)
+
+
+@router.get("/jobs", response_model=JobListResponse, tags=["jobs"])
+async def list_jobs(
+    job_status: str | None = Query(default=None, alias="status"),
+    limit: int = 50,
+    jobs: JobService = Depends(get_jobs),
+) -> JobListResponse:
+    if limit < 1 or limit > 500:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="limit must be in range 1..500."
+        )
+    return JobListResponse(jobs=jobs.list_jobs(status=job_status, limit=limit))
+
+
+@router.get("/jobs/{job_id}", response_model=JobInfo, tags=["jobs"])
+async def get_job(job_id: str, jobs: JobService = Depends(get_jobs)) -> JobInfo:
+    try:
+        return jobs.get(job_id)
+    except KeyError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
@@ -21,8 +21,89 @@ class Settings(BaseSettings):
     platform_api_key: str | None = Field(default=None, alias="PLATFORM_API_KEY")
 
     database_url: str | None = Field(default=None, alias="DATABASE_URL")
+    db_pool_min_size: int = Field(default=1, ge=0, alias="DB_POOL_MIN_SIZE")
+    db_pool_max_size: int = Field(default=4, ge=1, alias="DB_POOL_MAX_SIZE")
+    db_outbox_path: str = Field(default="artifacts/outbox/postgres.sqlite3", alias="DB_OUTBOX_PATH")
+    db_write_behind: bool = Field(default=True, alias="DB_WRITE_BEHIND")
+    db_write_max_pending: int = Field(default=1000, ge=1, alias="DB_WRITE_MAX_PENDING")
+    db_write_retry_max_delay: float = Field(default=60.0, gt=0, alias="DB_WRITE_RETRY_MAX_DELAY")
+    db_write_max_attempts: int = Field(default=10, ge=1, alias="DB_WRITE_MAX_ATTEMPTS")
 
     run_artifact_dir: str = Field(default="artifacts/runs", alias="RUN_ARTIFACT_DIR")
+    run_checkpoint_every: int = Field(default=50, ge=1, alias="RUN_CHECKPOINT_EVERY")
+    run_checkpoint_ttl_hours: float = Field(default=72.0, ge=0.0, alias="RUN_CHECKPOINT_TTL_HOURS")
+    run_artifact_codec: str = Field(default="json", alias="RUN_ARTIFACT_CODEC")
+    run_store_backend: str = Field(default="files", alias="RUN_STORE_BACKEND")
+    run_segment_max_mb: int = Field(default=64, ge=1, alias="RUN_SEGMENT_MAX_MB")
+    run_retention_days: int = Field(default=0, ge=0, alias="RUN_RETENTION_DAYS")
+    run_compaction_interval_seconds: float = Field(
+        default=3600.0, gt=0, alias="RUN_COMPACTION_INTERVAL_SECONDS"
+    )
+
+    safety_lexicon_path: str = Field(
+        default="config/safety_lexicon.yaml", alias="SAFETY_LEXICON_PATH"
+    )
+    safety_lexicon_extra_paths: str | None = Field(default=None, alias="SAFETY_LEXICON_EXTRA_PATHS")
+
+    eval_concurrency: int = Field(default=8, ge=1, alias="EVAL_CONCURRENCY")
+    provider_concurrency: int = Field(default=16, ge=1, alias="PROVIDER_CONCURRENCY")
+    global_concurrency: int = Field(default=64, ge=1, alias="GLOBAL_CONCURRENCY")
+
+    rate_limit_enabled: bool = Field(default=True, alias="RATE_LIMIT_ENABLED")
+    rate_limit_max_retries: int = Field(default=3, ge=0, alias="RATE_LIMIT_MAX_RETRIES")
+
+    retry_max_retries: int = Field(default=2, ge=0, alias="RETRY_MAX_RETRIES")
+    retry_base_delay: float = Field(default=0.5, ge=0.0, alias="RETRY_BASE_DELAY")
+    retry_max_delay: float = Field(default=8.0, ge=0.0, alias="RETRY_MAX_DELAY")
+    hedge_enabled: bool = Field(default=False, alias="HEDGE_ENABLED")
+    hedge_quantile: float = Field(default=0.95, gt=0.0, lt=1.0, alias="HEDGE_QUANTILE")
+    hedge_min_samples: int = Field(default=20, ge=1, alias="HEDGE_MIN_SAMPLES")
+    hedge_min_delay_ms: float = Field(default=250.0, ge=0.0, alias="HEDGE_MIN_DELAY_MS")
+
+    circuit_breaker_enabled: bool = Field(default=True, alias="CIRCUIT_BREAKER_ENABLED")
+    circuit_window: int = Field(default=20, ge=1, alias="CIRCUIT_WINDOW")
+    circuit_min_calls: int = Field(default=10, ge=1, alias="CIRCUIT_MIN_CALLS")
+    circuit_error_rate: float = Field(default=0.5, gt=0.0, le=1.0, alias="CIRCUIT_ERROR_RATE")
+    circuit_slow_call_ms: float = Field(default=30000.0, gt=0.0, alias="CIRCUIT_SLOW_CALL_MS")
+    circuit_slow_rate: float = Field(default=0.8, gt=0.0, le=1.0, alias="CIRCUIT_SLOW_RATE")
+    circuit_open_seconds: float = Field(default=30.0, ge=0.0, alias="CIRCUIT_OPEN_SECONDS")
+    circuit_half_open_probes: int = Field(default=3, ge=1, alias="CIRCUIT_HALF_OPEN_PROBES")
+
+    batch_poll_interval: float = Field(default=30.0, gt=0.0, alias="BATCH_POLL_INTERVAL")
+    batch_timeout_hours: float = Field(default=24.0, gt=0.0, alias="BATCH_TIMEOUT_HOURS")
+    openai_batch_base_url: str = Field(
+        default="https://api.openai.com/v1", alias="OPENAI_BATCH_BASE_URL"
+    )
+    anthropic_batch_base_url: str = Field(
+        default="https://api.anthropic.com/v1", alias="ANTHROPIC_BATCH_BASE_URL"
+    )
+
+    http_max_connections: int = Field(default=100, ge=1, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive: int = Field(default=20, ge=0, alias="HTTP_MAX_KEEPALIVE")
+    http_keepalive_expiry: float = Field(default=30.0, ge=0.0, alias="HTTP_KEEPALIVE_EXPIRY")
+    http2_enabled: bool = Field(default=False, alias="HTTP2_ENABLED")
+
+    generation_cache_enabled: bool = Field(default=True, alias="GENERATION_CACHE_ENABLED")
+    generation_cache_path: str = Field(
+        default="artifacts/cache/generations.sqlite3", alias="GENERATION_CACHE_PATH"
+    )
+    generation_cache_memory_entries: int = Field(
+        default=2048, ge=0, alias="GENERATION_CACHE_MEMORY_ENTRIES"
+    )
+    generation_cache_max_mb: int = Field(default=256, ge=1, alias="GENERATION_CACHE_MAX_MB")
+    generation_cache_ttl_hours: float = Field(
+        default=168.0, gt=0, alias="GENERATION_CACHE_TTL_HOURS"
+    )
+    generation_cache_max_temperature: float = Field(
+        default=0.0, ge=0.0, alias="GENERATION_CACHE_MAX_TEMPERATURE"
+    )
+
+    job_workers: int = Field(default=2, ge=1, alias="JOB_WORKERS")
+    job_store_path: str = Field(default="artifacts/jobs/jobs.sqlite3", alias="JOB_STORE_PATH")
+
+    case_analytics_path: str = Field(
+        default="artifacts/analytics/cases.duckdb", alias="CASE_ANALYTICS_PATH"
+    )
 
     alert_on_gate_fail: bool = Field(default=False, alias="ALERT_ON_GATE_FAIL")
     slack_webhook_url: str | None = Field(default=None, alias="SLACK_WEBHOOK_URL")
@@ -50,6 +131,29 @@ class Settings(BaseSettings):
     def run_artifacts_path(self) -> Path:
         return Path(self.run_artifact_dir)
 
+    @property
+    def generation_cache_file(self) -> Path:
+        return Path(self.generation_cache_path)
+
+    @property
+    def job_store_file(self) -> Path:
+        return Path(self.job_store_path)
+
+    @property
+    def db_outbox_file(self) -> Path:
+        return Path(self.db_outbox_path)
+
+    @property
+    def case_analytics_file(self) -> Path:
+        return Path(self.case_analytics_path)
+
+    @property
+    def safety_lexicon_paths(self) -> list[Path]:
+        extra = self.safety_lexicon_extra_paths or ""
+        return [Path(self.safety_lexicon_path)] + [
+            Path(item.strip()) for item in extra.split(",") if item.strip()
+        ]
+
     @property
     def alert_recipient_list(self) -> list[str]:
         if not self.alert_to_emails:
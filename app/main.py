@@ -1,19 +1,32 @@
+import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.adapters.base import Provider
+from app.adapters.batch import AnthropicBatchBackend, BatchBackend, OpenAIBatchBackend
+from app.adapters.http_pool import HTTPClientPool
 from app.api.routes import router
 from app.core.config import get_settings
 from app.services.alerts import AlertService
 from app.services.analytics import AnalyticsService
+from app.services.batch_runner import BatchRunner
 from app.services.benchmark import BenchmarkService
+from app.services.case_analytics import CaseAnalyticsService
+from app.services.circuit_breaker import CircuitBreaker
 from app.services.db_store import DBStore
 from app.services.evaluator import EvaluatorService
 from app.services.gate import EvalGateService
+from app.services.generation_cache import GenerationCache
+from app.services.jobs import JobService
 from app.services.model_registry import ModelRegistry
-from app.services.run_store import RunStore
+from app.services.rate_limiter import RateLimiter
+from app.services.resilience import LatencyTracker, RetryPolicy
+from app.services.run_log import create_run_store
+from app.services.safety import SafetyLexicon
 from app.services.task_recommender import TaskRecommender
 
 STATIC_DIR = Path(__file__).resolve().parent / "static"
@@ -48,14 +61,96 @@ ws_manager = ConnectionManager()
 
 def create_app() -> FastAPI:
     settings = get_settings()
-    registry = ModelRegistry(settings=settings)
-    run_store = RunStore(artifact_dir=settings.run_artifacts_path)
+    http_pool = HTTPClientPool(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive,
+        keepalive_expiry=settings.http_keepalive_expiry,
+        http2=settings.http2_enabled,
+    )
+    registry = ModelRegistry(settings=settings, http_pool=http_pool)
+    run_store = create_run_store(settings)
     analytics = AnalyticsService(run_store=run_store)
-    evaluator = EvaluatorService(registry=registry, run_store=run_store)
+    case_analytics = CaseAnalyticsService(
+        run_store=run_store, path=settings.case_analytics_file
+    )
+    generation_cache = None
+    if settings.generation_cache_enabled:
+        generation_cache = GenerationCache(
+            path=settings.generation_cache_file,
+            memory_entries=settings.generation_cache_memory_entries,
+            max_disk_bytes=settings.generation_cache_max_mb * 1024 * 1024,
+            ttl_seconds=settings.generation_cache_ttl_hours * 3600,
+            max_temperature=settings.generation_cache_max_temperature,
+        )
+    batch_backends: dict[Provider, BatchBackend] = {}
+    if settings.openai_api_key:
+        batch_backends[Provider.OPENAI] = OpenAIBatchBackend(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_batch_base_url,
+            http_pool=http_pool,
+        )
+    if settings.anthropic_api_key:
+        batch_backends[Provider.ANTHROPIC] = AnthropicBatchBackend(
+            api_key=settings.anthropic_api_key,
+            base_url=settings.anthropic_batch_base_url,
+            http_pool=http_pool,
+        )
+    evaluator = EvaluatorService(
+        registry=registry,
+        run_store=run_store,
+        max_concurrency=settings.eval_concurrency,
+        provider_concurrency=settings.provider_concurrency,
+        global_concurrency=settings.global_concurrency,
+        cache=generation_cache,
+        safety_lexicon=SafetyLexicon.from_yaml(settings.safety_lexicon_paths),
+        rate_limiter=(
+            RateLimiter(provider_limits=registry.provider_limits)
+            if settings.rate_limit_enabled
+            else None
+        ),
+        rate_limit_retries=settings.rate_limit_max_retries,
+        retry_policy=RetryPolicy(
+            max_retries=settings.retry_max_retries,
+            base_delay=settings.retry_base_delay,
+            max_delay=settings.retry_max_delay,
+        ),
+        hedge_enabled=settings.hedge_enabled,
+        latency_tracker=LatencyTracker(
+            min_samples=settings.hedge_min_samples,
+            quantile=settings.hedge_quantile,
+            min_delay_ms=settings.hedge_min_delay_ms,
+        ),
+        circuit_breaker=(
+            CircuitBreaker(
+                window=settings.circuit_window,
+                min_calls=settings.circuit_min_calls,
+                error_rate=settings.circuit_error_rate,
+                slow_call_ms=settings.circuit_slow_call_ms,
+                slow_rate=settings.circuit_slow_rate,
+                open_seconds=settings.circuit_open_seconds,
+                half_open_probes=settings.circuit_half_open_probes,
+            )
+            if settings.circuit_breaker_enabled
+            else None
+        ),
+        batch_runner=BatchRunner(
+            backends=batch_backends,
+            poll_interval=settings.batch_poll_interval,
+            timeout=settings.batch_timeout_hours * 3600,
+        ),
+        checkpoint_every=settings.run_checkpoint_every,
+    )
     eval_gate = EvalGateService()
     alerts = AlertService(settings=settings)
-    db_store = DBStore(database_url=settings.database_url)
-    db_store.init_schema()  # idempotent CREATE IF NOT EXISTS
+    db_store = DBStore(
+        database_url=settings.database_url,
+        outbox_path=settings.db_outbox_file if settings.db_write_behind else None,
+        max_pending=settings.db_write_max_pending,
+        retry_max_delay=settings.db_write_retry_max_delay,
+        max_attempts=settings.db_write_max_attempts,
+        pool_min_size=settings.db_pool_min_size,
+        pool_max_size=settings.db_pool_max_size,
+    )
     benchmark_service = BenchmarkService(
         benchmarks_dir=settings.benchmarks_dir, evaluator=evaluator
     )
@@ -64,18 +159,44 @@ def create_app() -> FastAPI:
         registry=registry,
         benchmark_service=benchmark_service,
     )
+    jobs = JobService(
+        path=settings.job_store_file,
+        evaluator=evaluator,
+        benchmark_service=benchmark_service,
+        task_recommender=task_recommender,
+        db_store=db_store,
+        workers=settings.job_workers,
+        notify=ws_manager.broadcast,
+    )
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        await run_store.start()
+        await db_store.start()  # opens the pool, idempotent CREATE IF NOT EXISTS
+        await jobs.start()
+        yield
+        await jobs.stop()
+        await db_store.close()
+        await run_store.stop()
+        if generation_cache is not None:
+            await asyncio.to_thread(generation_cache.close)
+        await http_pool.aclose()
 
-    app = FastAPI(title=settings.app_name, version="0.1.0")
+    app = FastAPI(title=settings.app_name, version="0.1.0", lifespan=lifespan)
     app.state.settings = settings
+    app.state.http_pool = http_pool
     app.state.registry = registry
     app.state.evaluator = evaluator
     app.state.analytics = analytics
+    app.state.run_store = run_store
+    app.state.case_analytics = case_analytics
     app.state.eval_gate = eval_gate
     app.state.alerts = alerts
     app.state.db_store = db_store
     app.state.ws_manager = ws_manager
     app.state.benchmark_service = benchmark_service
     app.state.task_recommender = task_recommender
+    app.state.jobs = jobs
 
     # ── Optional API-key auth middleware ─────────────────────────────────────
     # Activated only when PLATFORM_API_KEY is set in .env
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -22,12 +22,42 @@ class RunEvalRequest(BaseModel):
     )
     temperature: float = Field(default=0.0, ge=0.0, le=2.0)
     max_tokens: int = Field(default=512, ge=1, le=4096)
+    concurrency: int | None = Field(
+        default=None,
+        ge=1,
+        le=64,
+        description="Max in-flight cases for this run. Defaults to EVAL_CONCURRENCY.",
+    )
+    use_cache: bool = Field(
+        default=True, description="Serve repeated deterministic generations from the cache."
+    )
+    stream: bool = Field(
+        default=False,
+        description="Use provider streaming to record time-to-first-token and tokens/sec.",
+    )
+    hedge: bool | None = Field(
+        default=None,
+        description=(
+            "Race a duplicate request once the model's p95 latency has passed. "
+            "Defaults to HEDGE_ENABLED."
+        ),
+    )
+    execution: Literal["online", "batch"] = Field(
+        default="online",
+        description=(
+            "'batch' submits the cases through the provider's batch API (cheaper, slower); "
+            "providers without one run online."
+        ),
+    )
 
 
 class CaseScore(BaseModel):
     accuracy: float = Field(ge=0.0, le=1.0)
     hallucination_risk: float = Field(ge=0.0, le=1.0)
     safety_risk: float = Field(ge=0.0, le=1.0)
+    safety_categories: list[str] = Field(
+        default_factory=list, description="Safety lexicon categories matched by the response."
+    )
 
 
 class CaseResult(BaseModel):
@@ -38,17 +68,128 @@ class CaseResult(BaseModel):
     prompt_tokens: int
     completion_tokens: int
     total_tokens: int
-    cost_usd: float
+    cost_usd: float = Field(description="Provider spend for this case; 0 for cache hits.")
     scores: CaseScore
+    error: str | None = Field(default=None, description="Provider error if the case failed.")
+    cache_hit: bool = False
+    batched: bool = Field(
+        default=False,
+        description="Served by a provider batch API; latency_ms is the batch turnaround.",
+    )
+    attempts: int = Field(default=1, description="Provider requests sent, incl. retries/hedges.")
+    ttft_ms: float | None = None
+    inter_token_latency_ms: float | None = None
+    tokens_per_second: float | None = None
+    metadata: dict[str, Any] = Field(
+        default_factory=dict, description="The case's metadata, kept for per-case analytics."
+    )
+
+
+class WelfordState(BaseModel):
+    """Unrounded running moments, so merged runs reproduce a single pass exactly."""
+
+    count: int
+    mean: float
+    m2: float = Field(description="Sum of squared deviations from the mean.")
+    min: float
+    max: float
+
+
+class DistributionSummary(BaseModel):
+    """Streaming distribution stats; ``bins`` + ``state`` are the mergeable sketch."""
+
+    count: int
+    mean: float
+    stddev: float
+    min: float
+    max: float
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+    relative_accuracy: float | None = None
+    zero_count: int | None = None
+    bins: dict[str, int] | None = None
+    state: WelfordState | None = None
+
+
+class MetricBound(BaseModel):
+    estimate: float
+    lower: float
+    upper: float | None = Field(default=None, description="None when still unbounded.")
+
+
+class SamplingPlan(BaseModel):
+    """How a sampled run's cases were drawn from the full dataset."""
+
+    population_cases: int
+    stratify_by: list[str] = Field(default_factory=list)
+    seed: int | None = None
+    confidence: float = 0.95
+    strata_population: dict[str, int] = Field(description="Dataset cases per stratum.")
+    case_strata: list[str] = Field(description="Stratum of each sampled case, in run order.")
+
+
+class StratumSummary(BaseModel):
+    stratum: str
+    population_cases: int
+    sampled_cases: int
+    failed_cases: int
+    avg_accuracy: float
+    avg_hallucination_risk: float
+    avg_safety_risk: float
+    avg_latency_ms: float | None
+    total_cost_usd: float
+
+
+class SamplingSummary(BaseModel):
+    population_cases: int
+    sampled_cases: int
+    confidence: float
+    seed: int | None = None
+    stratify_by: list[str] = Field(default_factory=list)
+    estimates: dict[str, MetricBound] = Field(
+        default_factory=dict,
+        description=(
+            "Full-dataset estimates with confidence intervals (total_cost_usd is projected)."
+        ),
+    )
+    strata: list[StratumSummary] = Field(default_factory=list)
 
 
 class RunSummary(BaseModel):
     avg_accuracy: float
     avg_hallucination_risk: float
     avg_safety_risk: float
-    avg_latency_ms: float
+    avg_latency_ms: float | None = Field(
+        description="Mean latency of live provider calls; None when no case made one."
+    )
     total_cost_usd: float
     total_cases: int
+    failed_cases: int = 0
+    cache_hits: int = 0
+    retried_cases: int = Field(default=0, description="Cases that needed more than one request.")
+    avg_cached_latency_ms: float = Field(
+        default=0.0, description="Lookup latency of cache hits; excluded from avg_latency_ms."
+    )
+    batched_cases: int = Field(
+        default=0,
+        description="Cases served by a provider batch API; their turnaround is excluded "
+        "from avg_latency_ms and the latency distribution.",
+    )
+    wall_clock_ms: float | None = Field(default=None, description="End-to-end run duration.")
+    avg_ttft_ms: float | None = None
+    avg_inter_token_latency_ms: float | None = None
+    avg_tokens_per_second: float | None = None
+    latency: DistributionSummary | None = Field(
+        default=None, description="Live-call latency distribution (ms)."
+    )
+    tokens: DistributionSummary | None = Field(
+        default=None, description="Total tokens per successful case."
+    )
+    sampling: SamplingSummary | None = Field(
+        default=None, description="Set on sampled benchmark runs."
+    )
 
 
 class VersionInfo(BaseModel):
@@ -56,14 +197,51 @@ class VersionInfo(BaseModel):
     dataset_version: str
 
 
-class RunEvalResponse(BaseModel):
+class RunHeader(BaseModel):
+    """Everything about a run except its per-case results."""
+
     run_id: str
     created_at: str | None = None
     model_id: str
     version_info: VersionInfo
     summary: RunSummary
+    status: Literal["complete", "incomplete"] = Field(
+        default="complete",
+        description="'incomplete' runs were interrupted or are still running; resume to finish.",
+    )
+    expected_cases: int | None = Field(
+        default=None, description="Cases in the run request; set on incomplete runs."
+    )
+
+
+class RunEvalResponse(RunHeader):
     results: list[CaseResult]
 
+    def header(self) -> RunHeader:
+        return RunHeader.model_construct(
+            **{name: getattr(self, name) for name in RunHeader.model_fields}
+        )
+
+
+class RunStreamEvent(BaseModel):
+    """One NDJSON line / SSE message of a streamed run.
+
+    ``case`` events carry the finished case and the running summary; the final
+    ``complete`` event carries the run header (the artifact holds every result).
+    """
+
+    event: str = Field(description="case | complete | error")
+    run_id: str
+    completed: int
+    total: int
+    index: int | None = None
+    result: CaseResult | None = None
+    summary: RunSummary | None = None
+    model_id: str | None = None
+    created_at: str | None = None
+    version_info: VersionInfo | None = None
+    detail: str | None = None
+
 
 class CompareRequest(BaseModel):
     model_ids: list[str]
@@ -74,10 +252,36 @@ class CompareRequest(BaseModel):
     prompt_template: str = Field(default="{question}")
     temperature: float = Field(default=0.0, ge=0.0, le=2.0)
     max_tokens: int = Field(default=512, ge=1, le=4096)
+    concurrency: int | None = Field(default=None, ge=1, le=64)
+    use_cache: bool = True
+    stream: bool = False
+    hedge: bool | None = None
+    execution: Literal["online", "batch"] = "online"
+
+
+class CompareTiming(BaseModel):
+    model_id: str
+    run_id: str
+    wall_clock_ms: float
+
+
+class CompareError(BaseModel):
+    model_id: str
+    error: str
 
 
 class CompareResponse(BaseModel):
     runs: list[RunEvalResponse]
+    timings: list[CompareTiming] = Field(default_factory=list)
+    errors: list[CompareError] = Field(
+        default_factory=list, description="Models whose run failed; the other runs still count."
+    )
+    total_wall_clock_ms: float | None = Field(
+        default=None, description="Wall-clock time of the whole comparison."
+    )
+    sequential_wall_clock_ms: float | None = Field(
+        default=None, description="Sum of per-model wall-clock times (sequential equivalent)."
+    )
 
 
 class EvalGateThresholds(BaseModel):
@@ -85,16 +289,46 @@ class EvalGateThresholds(BaseModel):
     max_hallucination_risk: float = Field(default=0.30, ge=0.0, le=1.0)
     max_latency_ms: float | None = Field(default=None, ge=0.0)
     max_cost_usd: float | None = Field(default=None, ge=0.0)
+    max_failed_cases: int | None = Field(default=0, ge=0)
+
+
+class SequentialGateOptions(BaseModel):
+    confidence: float = Field(
+        default=0.95, gt=0.5, lt=1.0, description="Confidence required to stop early."
+    )
+    batch_size: int = Field(default=20, ge=1, description="Cases evaluated between checks.")
+    min_cases: int = Field(default=20, ge=1, description="Never decide on fewer cases than this.")
+    seed: int | None = Field(default=None, description="Seed for the randomized case order.")
+
+
+class SequentialGateReport(BaseModel):
+    confidence: float
+    stopped_early: bool
+    cases_evaluated: int
+    cases_skipped: int
+    estimated_cost_saved_usd: float
+    estimated_time_saved_ms: float
+    bounds: dict[str, MetricBound] = Field(
+        default_factory=dict, description="Full-run confidence intervals at the last check."
+    )
 
 
 class EvalGateRequest(RunEvalRequest):
     thresholds: EvalGateThresholds = Field(default_factory=EvalGateThresholds)
+    sequential: SequentialGateOptions | None = Field(
+        default=None,
+        description=(
+            "Evaluate randomized batches and stop once the gate outcome is settled at "
+            "the given confidence. max_failed_cases then applies to the evaluated cases."
+        ),
+    )
 
 
 class EvalGateResponse(BaseModel):
     passed: bool
     reasons: list[str]
     run: RunEvalResponse
+    sequential: SequentialGateReport | None = None
 
 
 class RunMetricItem(BaseModel):
@@ -106,18 +340,29 @@ class RunMetricItem(BaseModel):
     avg_accuracy: float
     avg_hallucination_risk: float
     avg_safety_risk: float
-    avg_latency_ms: float
+    avg_latency_ms: float | None
     total_cost_usd: float
     total_cases: int
+    avg_ttft_ms: float | None = None
+    avg_tokens_per_second: float | None = None
+    latency_p50_ms: float | None = None
+    latency_p95_ms: float | None = None
+    latency_p99_ms: float | None = None
+    status: Literal["complete", "incomplete"] = "complete"
 
 
 class MetricsSummary(BaseModel):
     avg_accuracy: float
     avg_hallucination_risk: float
     avg_safety_risk: float
-    avg_latency_ms: float
+    avg_latency_ms: float | None
     total_cost_usd: float
     total_cases: int
+    avg_ttft_ms: float | None = None
+    avg_tokens_per_second: float | None = None
+    latency_p50_ms: float | None = None
+    latency_p95_ms: float | None = None
+    latency_p99_ms: float | None = None
 
 
 class MetricsResponse(BaseModel):
@@ -132,9 +377,14 @@ class ModelComparisonItem(BaseModel):
     avg_accuracy: float
     avg_hallucination_risk: float
     avg_safety_risk: float
-    avg_latency_ms: float
+    avg_latency_ms: float | None
     total_cost_usd: float
     total_cases: int
+    avg_ttft_ms: float | None = None
+    avg_tokens_per_second: float | None = None
+    latency_p50_ms: float | None = None
+    latency_p95_ms: float | None = None
+    latency_p99_ms: float | None = None
 
 
 class ModelComparisonResponse(BaseModel):
@@ -144,6 +394,40 @@ class ModelComparisonResponse(BaseModel):
 
 # ── Benchmark Schemas ─────────────────────────────────────────────────
 
+class CaseQueryRequest(BaseModel):
+    group_by: list[str] = Field(
+        default_factory=lambda: ["model_id"],
+        description="model_id, prompt_version, dataset_version, run_id, day or metadata.<key>.",
+    )
+    metrics: list[str] = Field(
+        default_factory=lambda: ["count", "avg:accuracy", "p95:latency_ms"],
+        description="count or <agg>:<field>; agg is avg/sum/min/max/p50/p90/p95/p99.",
+    )
+    model_id: str | None = None
+    prompt_version: str | None = None
+    dataset_version: str | None = None
+    since: str | None = Field(default=None, description="ISO timestamp; runs created at or after.")
+    until: str | None = Field(default=None, description="ISO timestamp; runs created before.")
+    metadata: dict[str, str] = Field(
+        default_factory=dict, description="Case metadata equality filters, e.g. subject=physics."
+    )
+    include_failed: bool = False
+    include_cache_hits: bool = Field(
+        default=False, description="Cache-hit latencies are lookups, not model calls."
+    )
+    include_batched: bool = Field(
+        default=False, description="Batched latencies are batch turnaround, not model calls."
+    )
+    limit: int = Field(default=1000, ge=1, le=10000)
+
+
+class CaseQueryResponse(BaseModel):
+    group_by: list[str]
+    metrics: list[str]
+    rows: list[dict[str, Any]]
+    cases_indexed: int
+
+
 class BenchmarkInfo(BaseModel):
     name: str
     display_name: str
@@ -161,6 +445,24 @@ class RunBenchmarkRequest(BaseModel):
     model_id: str | None = Field(default=None, description="Model to evaluate. Defaults to default model.")
     temperature: float = Field(default=0.0, ge=0.0, le=2.0)
     max_tokens: int = Field(default=512, ge=1, le=4096)
+    concurrency: int | None = Field(default=None, ge=1, le=64)
+    use_cache: bool = True
+    stream: bool = False
+    hedge: bool | None = None
+    execution: Literal["online", "batch"] = "online"
+    sample_size: int | None = Field(
+        default=None, ge=1, description="Run a stratified sample of this many cases."
+    )
+    sample_fraction: float | None = Field(
+        default=None, gt=0.0, le=1.0, description="Run a stratified sample of this share of cases."
+    )
+    stratify_by: list[str] = Field(
+        default_factory=list, description="Case metadata fields to stratify the sample by."
+    )
+    seed: int | None = Field(default=None, description="Seed for a reproducible sample.")
+    confidence: float = Field(
+        default=0.95, gt=0.5, lt=1.0, description="Confidence level of the sample's intervals."
+    )
 
 
 class RunBenchmarkResponse(BaseModel):
@@ -192,8 +494,39 @@ class RunTaskRequest(BaseModel):
     model_id: str | None = Field(default=None, description="Override model. Uses first recommended if omitted.")
     temperature: float = Field(default=0.0, ge=0.0, le=2.0)
     max_tokens: int = Field(default=512, ge=1, le=4096)
+    concurrency: int | None = Field(default=None, ge=1, le=64)
+    use_cache: bool = True
+    stream: bool = False
+    hedge: bool | None = None
+    execution: Literal["online", "batch"] = "online"
 
 
 class RunTaskResponse(BaseModel):
     task: TaskInfo
     benchmark_run: RunEvalResponse
+
+
+# ── Job Schemas ───────────────────────────────────────────────────────
+
+class JobInfo(BaseModel):
+    job_id: str
+    kind: str = Field(description="benchmark | task | compare")
+    status: str = Field(description="queued | running | succeeded | failed")
+    created_at: str
+    started_at: str | None = None
+    finished_at: str | None = None
+    completed: int = Field(default=0, description="Cases finished so far (all models for compare).")
+    total: int = Field(default=0, description="Cases to run; known once the job starts.")
+    run_ids: list[str] = Field(
+        default_factory=list,
+        description="Runs produced by the job; recorded as they start, so a restart resumes them.",
+    )
+    error: str | None = None
+    errors: list[CompareError] = Field(
+        default_factory=list,
+        description="Compare jobs: models whose run failed while the others succeeded.",
+    )
+
+
+class JobListResponse(BaseModel):
+    jobs: list[JobInfo]
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from statistics import mean
 
 from app.schemas.evaluation import (
@@ -5,10 +6,11 @@ from app.schemas.evaluation import (
     MetricsSummary,
     ModelComparisonItem,
     ModelComparisonResponse,
-    RunEvalResponse,
+    RunHeader,
     RunMetricItem,
 )
 from app.services.run_store import RunStore
+from app.services.sketch import Distribution
 
 
 class AnalyticsService:
@@ -21,15 +23,23 @@ class AnalyticsService:
         prompt_version: str | None = None,
         dataset_version: str | None = None,
         limit: int = 100,
+        since: str | None = None,
+        until: str | None = None,
     ) -> MetricsResponse:
         runs = self._filtered_runs(
             model_id=model_id,
             prompt_version=prompt_version,
             dataset_version=dataset_version,
             limit=limit,
+            since=since,
+            until=until,
         )
         items = [self._to_item(run) for run in runs]
-        summary = self._summarize(items)
+        # Incomplete runs are listed but kept out of the aggregates
+        summary = self._summarize([item for item in items if item.status == "complete"])
+        summary = summary.model_copy(
+            update=_merged_latency([run for run in runs if run.status == "complete"])
+        )
         return MetricsResponse(total_runs=len(items), summary=summary, items=items)
 
     def get_model_comparison(
@@ -37,19 +47,26 @@ class AnalyticsService:
         prompt_version: str | None = None,
         dataset_version: str | None = None,
         limit: int = 400,
+        since: str | None = None,
+        until: str | None = None,
     ) -> ModelComparisonResponse:
         runs = self._filtered_runs(
             model_id=None,
             prompt_version=prompt_version,
             dataset_version=dataset_version,
             limit=limit,
+            since=since,
+            until=until,
         )
-        by_model: dict[str, list[RunEvalResponse]] = {}
+        by_model: dict[str, list[RunHeader]] = {}
         for run in runs:
+            if run.status != "complete":
+                continue
             by_model.setdefault(run.model_id, []).append(run)
 
         models: list[ModelComparisonItem] = []
         for mid, model_runs in by_model.items():
+            latency = _merged_latency(model_runs)
             models.append(
                 ModelComparisonItem(
                     model_id=mid,
@@ -59,9 +76,16 @@ class AnalyticsService:
                         mean(r.summary.avg_hallucination_risk for r in model_runs), 3
                     ),
                     avg_safety_risk=round(mean(r.summary.avg_safety_risk for r in model_runs), 3),
-                    avg_latency_ms=round(mean(r.summary.avg_latency_ms for r in model_runs), 2),
+                    avg_latency_ms=_mean_present(
+                        (r.summary.avg_latency_ms for r in model_runs), 2
+                    ),
                     total_cost_usd=round(sum(r.summary.total_cost_usd for r in model_runs), 6),
                     total_cases=sum(r.summary.total_cases for r in model_runs),
+                    avg_ttft_ms=_mean_present((r.summary.avg_ttft_ms for r in model_runs), 2),
+                    avg_tokens_per_second=_mean_present(
+                        (r.summary.avg_tokens_per_second for r in model_runs), 2
+                    ),
+                    **latency,
                 )
             )
 
@@ -74,18 +98,19 @@ class AnalyticsService:
         prompt_version: str | None,
         dataset_version: str | None,
         limit: int,
-    ) -> list[RunEvalResponse]:
-        runs = self.run_store.list_runs(limit=max(limit * 4, 100))
-        filtered = [
-            run
-            for run in runs
-            if (not model_id or run.model_id == model_id)
-            and (not prompt_version or run.version_info.prompt_version == prompt_version)
-            and (not dataset_version or run.version_info.dataset_version == dataset_version)
-        ]
-        return filtered[:limit]
+        since: str | None = None,
+        until: str | None = None,
+    ) -> list[RunHeader]:
+        return self.run_store.list_headers(
+            model_id=model_id,
+            prompt_version=prompt_version,
+            dataset_version=dataset_version,
+            since=since,
+            until=until,
+            limit=limit,
+        )
 
-    def _to_item(self, run: RunEvalResponse) -> RunMetricItem:
+    def _to_item(self, run: RunHeader) -> RunMetricItem:
         return RunMetricItem(
             run_id=run.run_id,
             created_at=run.created_at or "",
@@ -98,6 +123,12 @@ class AnalyticsService:
             avg_latency_ms=run.summary.avg_latency_ms,
             total_cost_usd=run.summary.total_cost_usd,
             total_cases=run.summary.total_cases,
+            avg_ttft_ms=run.summary.avg_ttft_ms,
+            avg_tokens_per_second=run.summary.avg_tokens_per_second,
+            latency_p50_ms=run.summary.latency.p50 if run.summary.latency else None,
+            latency_p95_ms=run.summary.latency.p95 if run.summary.latency else None,
+            latency_p99_ms=run.summary.latency.p99 if run.summary.latency else None,
+            status=run.status,
         )
 
     def _summarize(self, items: list[RunMetricItem]) -> MetricsSummary:
@@ -106,7 +137,7 @@ class AnalyticsService:
                 avg_accuracy=0.0,
                 avg_hallucination_risk=0.0,
                 avg_safety_risk=0.0,
-                avg_latency_ms=0.0,
+                avg_latency_ms=None,
                 total_cost_usd=0.0,
                 total_cases=0,
             )
@@ -115,7 +146,35 @@ class AnalyticsService:
             avg_accuracy=round(mean(item.avg_accuracy for item in items), 3),
             avg_hallucination_risk=round(mean(item.avg_hallucination_risk for item in items), 3),
             avg_safety_risk=round(mean(item.avg_safety_risk for item in items), 3),
-            avg_latency_ms=round(mean(item.avg_latency_ms for item in items), 2),
+            avg_latency_ms=_mean_present((item.avg_latency_ms for item in items), 2),
             total_cost_usd=round(sum(item.total_cost_usd for item in items), 6),
             total_cases=sum(item.total_cases for item in items),
+            avg_ttft_ms=_mean_present((item.avg_ttft_ms for item in items), 2),
+            avg_tokens_per_second=_mean_present(
+                (item.avg_tokens_per_second for item in items), 2
+            ),
         )
+
+
+def _merged_latency(runs: Iterable[RunHeader]) -> dict[str, float | None]:
+    """Fleet-wide latency percentiles from the runs' persisted sketches."""
+    merged = Distribution()
+    for run in runs:
+        latency = run.summary.latency
+        if latency is not None and latency.bins is not None:
+            merged.merge(Distribution.from_summary(latency))
+    summary = merged.summary()
+    if summary is None:
+        return {"latency_p50_ms": None, "latency_p95_ms": None, "latency_p99_ms": None}
+    return {
+        "latency_p50_ms": summary.p50,
+        "latency_p95_ms": summary.p95,
+        "latency_p99_ms": summary.p99,
+    }
+
+
+def _mean_present(values: Iterable[float | None], ndigits: int) -> float | None:
+    """Mean over runs that recorded the metric (streaming timings and, for fully
+    cached or batched runs, live latency are absent)."""
+    present = [value for value in values if value is not None]
+    return round(mean(present), ndigits) if present else None
@@ -0,0 +1,120 @@
+"""Encodings for run artifacts (header file + per-case sidecar).
+
+- ``json``: UTF-8 JSON header and JSON Lines sidecar; human-readable, the default.
+- ``msgpack-zstd``: msgpack payload compressed with zstd behind a 5-byte prelude
+  (``MAGIC`` + format version). Needs the ``artifacts`` extra (msgpack, zstandard).
+
+Readers never trust the file name: ``decode_header``/``decode_cases`` sniff the
+prelude, so a store may hold both formats and the codec can be switched at any
+time. Case rows were validated when the run was produced, so ``trusted_case``
+rebuilds them with ``model_construct`` instead of re-validating every field.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from typing import Any
+
+from app.schemas.evaluation import CaseResult, CaseScore
+
+MAGIC = b"LEVA"
+FORMAT_VERSION = 1
+
+
+class JsonCodec:
+    name = "json"
+    header_suffix = ".json"
+    cases_suffix = ".cases.jsonl"
+
+    def encode_header(self, payload: dict[str, Any]) -> bytes:
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+    def encode_cases(self, rows: list[dict[str, Any]]) -> bytes:
+        return "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows).encode(
+            "utf-8"
+        )
+
+
+class MsgpackZstdCodec:
+    name = "msgpack-zstd"
+    header_suffix = ".mpz"
+    cases_suffix = ".cases.mpz"
+
+    def __init__(self, level: int = 3) -> None:
+        self.level = level
+
+    @staticmethod
+    def available() -> bool:
+        return all(importlib.util.find_spec(name) for name in ("msgpack", "zstandard"))
+
+    def encode_header(self, payload: dict[str, Any]) -> bytes:
+        return self._pack(payload)
+
+    def encode_cases(self, rows: list[dict[str, Any]]) -> bytes:
+        return self._pack(rows)
+
+    def _pack(self, payload: object) -> bytes:
+        import msgpack
+        import zstandard
+
+        packed = msgpack.packb(payload, use_bin_type=True)
+        compressed = zstandard.ZstdCompressor(level=self.level).compress(packed)
+        return MAGIC + bytes([FORMAT_VERSION]) + compressed
+
+
+CODECS: dict[str, type[JsonCodec] | type[MsgpackZstdCodec]] = {
+    JsonCodec.name: JsonCodec,
+    MsgpackZstdCodec.name: MsgpackZstdCodec,
+}
+HEADER_SUFFIXES = tuple(codec.header_suffix for codec in CODECS.values())
+CASES_SUFFIXES = tuple(codec.cases_suffix for codec in CODECS.values())
+
+
+def get_codec(name: str) -> JsonCodec | MsgpackZstdCodec:
+    try:
+        return CODECS[name]()
+    except KeyError as exc:
+        raise ValueError(f"Unknown artifact codec: {name}") from exc
+
+
+def is_header_file(filename: str) -> bool:
+    return filename.endswith(HEADER_SUFFIXES) and not filename.endswith(CASES_SUFFIXES)
+
+
+def artifact_stem(filename: str) -> str:
+    """``<ts>_<run_id>`` for any header or sidecar file name."""
+    for suffix in CASES_SUFFIXES + HEADER_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[: -len(suffix)]
+    return filename
+
+
+def decode_header(data: bytes) -> dict[str, Any]:
+    if data.startswith(MAGIC):
+        return _unpack(data)
+    return json.loads(data)
+
+
+def decode_cases(data: bytes) -> list[dict[str, Any]]:
+    if data.startswith(MAGIC):
+        return _unpack(data)
+    return [json.loads(line) for line in data.splitlines() if line]
+
+
+def trusted_case(row: dict[str, Any]) -> CaseResult:
+    """Rebuild a stored (already validated) case result without re-validation."""
+    return CaseResult.model_construct(
+        **{**row, "scores": CaseScore.model_construct(**row["scores"])}
+    )
+
+
+def _unpack(data: bytes) -> Any:
+    import msgpack
+    import zstandard
+
+    version = data[len(MAGIC)]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format version {version}.")
+    packed = zstandard.ZstdDecompressor().decompress(data[len(MAGIC) + 1 :])
+    return msgpack.unpackb(packed, raw=False)
@@ -0,0 +1,136 @@
+"""Run evaluation cases through provider batch APIs.
+
+Cases are packed into as few provider batches as the provider allows, the
+batches are submitted together and polled until they finish, and results are
+mapped back to the original case order. Providers without a registered
+backend are not supported here; the evaluator runs those cases online.
+
+Every submitted batch is reported through ``on_submit`` so the caller can
+checkpoint its id; a resumed run hands those back as ``submitted`` and the
+runner polls the existing batches instead of paying for the cases twice. A
+batch still unfinished at the timeout is cancelled at the provider.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+from app.adapters.base import GenerationResponse, ModelConfig, Provider
+from app.adapters.batch import COMPLETED, FAILED, BatchBackend, BatchItem
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class SubmittedBatch:
+    """A batch the provider accepted: enough to find it again after a restart."""
+
+    batch_id: str
+    custom_ids: list[str]
+    submitted_at: float  # epoch seconds
+
+
+class BatchRunner:
+    def __init__(
+        self,
+        backends: dict[Provider, BatchBackend],
+        poll_interval: float = 30.0,
+        timeout: float = 24 * 3600,
+    ) -> None:
+        self.backends = backends
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    def supports(self, provider: Provider) -> bool:
+        return provider in self.backends
+
+    async def run(
+        self,
+        model: ModelConfig,
+        items: list[BatchItem],
+        submitted: Sequence[SubmittedBatch] = (),
+        on_submit: Callable[[SubmittedBatch], Awaitable[None]] | None = None,
+    ) -> list[GenerationResponse | Exception]:
+        """Outcomes aligned with ``items``; a failed batch fails each of its items.
+
+        Items covered by one of the ``submitted`` batches are collected from it
+        rather than submitted again.
+        """
+        backend = self.backends[model.provider]
+        by_id = {item.custom_id: item for item in items}
+        claimed: set[str] = set()
+        jobs: list[tuple[list[BatchItem], SubmittedBatch | None]] = []
+        for batch in submitted:
+            if batch.custom_ids and all(
+                custom_id in by_id and custom_id not in claimed for custom_id in batch.custom_ids
+            ):
+                claimed.update(batch.custom_ids)
+                jobs.append(([by_id[custom_id] for custom_id in batch.custom_ids], batch))
+        fresh = [item for item in items if item.custom_id not in claimed]
+        size = backend.max_requests
+        jobs.extend((fresh[start:start + size], None) for start in range(0, len(fresh), size))
+        outcomes = await asyncio.gather(
+            *(self._run_chunk(backend, model, chunk, batch, on_submit) for chunk, batch in jobs)
+        )
+        by_custom_id = {
+            item.custom_id: outcome
+            for (chunk, _), chunk_outcomes in zip(jobs, outcomes, strict=True)
+            for item, outcome in zip(chunk, chunk_outcomes, strict=True)
+        }
+        return [by_custom_id[item.custom_id] for item in items]
+
+    async def _run_chunk(
+        self,
+        backend: BatchBackend,
+        model: ModelConfig,
+        items: list[BatchItem],
+        batch: SubmittedBatch | None,
+        on_submit: Callable[[SubmittedBatch], Awaitable[None]] | None,
+    ) -> list[GenerationResponse | Exception]:
+        try:
+            if batch is None:
+                batch = SubmittedBatch(
+                    batch_id=await backend.submit(model, items),
+                    custom_ids=[item.custom_id for item in items],
+                    submitted_at=time.time(),
+                )
+                if on_submit is not None:
+                    await on_submit(batch)
+            batch_id = batch.batch_id
+            # Wall clock from submission, so a resumed run keeps the original deadline
+            deadline = batch.submitted_at + self.timeout
+            while (state := await backend.status(batch_id)) != COMPLETED:
+                if state == FAILED:
+                    raise ValueError(f"{model.provider.value} batch {batch_id} failed")
+                if time.time() > deadline:
+                    await self._cancel(backend, batch_id)
+                    raise TimeoutError(f"{model.provider.value} batch {batch_id} timed out")
+                await asyncio.sleep(self.poll_interval)
+            results = await backend.results(batch_id)
+        except Exception as exc:  # noqa: BLE001
+            return [exc] * len(items)
+
+        latency_ms = (time.time() - batch.submitted_at) * 1000
+        outcomes: list[GenerationResponse | Exception] = []
+        for item in items:
+            outcome = results.get(item.custom_id)
+            if outcome is None:
+                outcome = ValueError(f"{item.custom_id} missing from batch {batch_id} output")
+            elif isinstance(outcome, GenerationResponse):
+                # What the case waited, submit to results; ``batched`` keeps this
+                # turnaround out of the run's latency stats
+                outcome.latency_ms = latency_ms
+                outcome.batched = True
+            outcomes.append(outcome)
+        return outcomes
+
+    async def _cancel(self, backend: BatchBackend, batch_id: str) -> None:
+        """Stop an abandoned batch; the provider bills whatever it still completes."""
+        try:
+            await backend.cancel(batch_id)
+        except Exception:  # noqa: BLE001
+            logger.warning("Could not cancel %s batch %s", backend.provider.value, batch_id)
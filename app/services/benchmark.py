@@ -4,7 +4,8 @@ import json
 from pathlib import Path
 
 from app.schemas.evaluation import EvaluationCase, RunEvalRequest, RunEvalResponse
-from app.services.evaluator import EvaluatorService
+from app.services.evaluator import EvaluatorService, ProgressCallback
+from app.services.sampling import draw_sample
 
 
 BENCHMARK_CATALOG: dict[str, dict] = {
@@ -63,8 +64,30 @@ class BenchmarkService:
         model_id: str | None = None,
         temperature: float = 0.0,
         max_tokens: int = 512,
+        concurrency: int | None = None,
+        use_cache: bool = True,
+        stream: bool = False,
+        hedge: bool | None = None,
+        execution: str = "online",
+        sample_size: int | None = None,
+        sample_fraction: float | None = None,
+        stratify_by: list[str] | None = None,
+        seed: int | None = None,
+        confidence: float = 0.95,
+        progress: ProgressCallback | None = None,
     ) -> RunEvalResponse:
         cases = self.load_benchmark(name)
+        sampling = None
+        if sample_size is not None or sample_fraction is not None:
+            # Stratified canary: a reproducible slice of the benchmark with CIs
+            cases, sampling = draw_sample(
+                cases,
+                size=sample_size,
+                fraction=sample_fraction,
+                stratify_by=stratify_by,
+                seed=seed,
+                confidence=confidence,
+            )
         request = RunEvalRequest(
             model_id=model_id,
             cases=cases,
@@ -72,8 +95,13 @@ class BenchmarkService:
             dataset_version=name,
             temperature=temperature,
             max_tokens=max_tokens,
+            concurrency=concurrency,
+            use_cache=use_cache,
+            stream=stream,
+            hedge=hedge,
+            execution=execution,
         )
-        return await self.evaluator.run_eval(request)
+        return await self.evaluator.run_eval(request, progress, sampling=sampling)
 
     # ── Internal ──────────────────────────────────────────────────────
     def _load_cases(self, name: str) -> list[EvaluationCase]:
@@ -0,0 +1,205 @@
+"""Ad-hoc group-by / filter / percentile queries over per-case results.
+
+Per-case rows (the ``cases`` table of the Parquet export) are mirrored into an
+embedded DuckDB database next to the run artifacts. Before each query, runs
+stored since the last ingest are appended; the run catalog's insert ``seq`` of the
+last ingested run, kept in the database, marks where ingest stopped, so only new
+runs are read from disk (also ones that finished late with an older
+``created_at``). DuckDB's columnar engine then answers aggregations over millions of rows
+directly. Needs the ``analytics`` extra (duckdb).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import threading
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from app.schemas.evaluation import CaseQueryRequest, CaseQueryResponse
+from app.services.columnar_export import CASE_COLUMNS, case_rows
+from app.services.run_catalog import normalize_timestamp
+from app.services.run_store import RunStore, StoredRun
+
+logger = logging.getLogger(__name__)
+
+SQL_TYPES = {"string": "VARCHAR", "float64": "DOUBLE", "int64": "BIGINT", "bool": "BOOLEAN"}
+GROUP_COLUMNS = {
+    "model_id": "model_id",
+    "prompt_version": "prompt_version",
+    "dataset_version": "dataset_version",
+    "run_id": "run_id",
+    "day": "substr(created_at, 1, 10)",
+}
+NUMERIC_FIELDS = {name for name, kind in CASE_COLUMNS if kind in ("float64", "int64")}
+AGGREGATES = {
+    "avg": "avg({})",
+    "sum": "sum({})",
+    "min": "min({})",
+    "max": "max({})",
+    "p50": "quantile_cont({}, 0.5)",
+    "p90": "quantile_cont({}, 0.9)",
+    "p95": "quantile_cont({}, 0.95)",
+    "p99": "quantile_cont({}, 0.99)",
+}
+
+
+class CaseAnalyticsService:
+    def __init__(self, run_store: RunStore, path: Path, ingest_chunk_runs: int = 200) -> None:
+        self.run_store = run_store
+        self.path = path
+        self.ingest_chunk_runs = ingest_chunk_runs
+        self._lock = threading.Lock()
+        self._conn: Any = None
+
+    @staticmethod
+    def available() -> bool:
+        return importlib.util.find_spec("duckdb") is not None
+
+    def query(self, request: CaseQueryRequest) -> CaseQueryResponse:
+        if not request.group_by and not request.metrics:
+            raise ValueError("Give at least one group_by key or metric.")
+        group_exprs = [_group_expr(name) for name in request.group_by]
+        metric_exprs = [_metric_expr(metric) for metric in request.metrics]
+
+        clauses: list[str] = []
+        params: list[object] = []
+        for column, value in (
+            ("model_id", request.model_id),
+            ("prompt_version", request.prompt_version),
+            ("dataset_version", request.dataset_version),
+        ):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if request.since:
+            clauses.append("created_at >= ?")
+            params.append(normalize_timestamp(request.since))
+        if request.until:
+            clauses.append("created_at < ?")
+            params.append(normalize_timestamp(request.until))
+        for key, value in request.metadata.items():
+            clauses.append("json_extract_string(metadata, ?) = ?")
+            params.extend([_json_path(key), value])
+        if not request.include_failed:
+            clauses.append("error IS NULL")
+        if not request.include_cache_hits:
+            clauses.append("NOT cache_hit")
+        if not request.include_batched:
+            clauses.append("NOT batched")
+
+        select = [f"{expr} AS g{index}" for index, (expr, _) in enumerate(group_exprs)]
+        select += [f"{expr} AS m{index}" for index, expr in enumerate(metric_exprs)]
+        group_params = [param for _, param in group_exprs if param is not None]
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        grouping = ""
+        if group_exprs:
+            ordinals = ", ".join(str(index + 1) for index in range(len(group_exprs)))
+            grouping = f" GROUP BY {ordinals} ORDER BY {ordinals}"
+        sql = f"SELECT {', '.join(select)} FROM cases{where}{grouping} LIMIT ?"
+
+        with self._lock:
+            conn = self._refresh()
+            rows = conn.execute(sql, [*group_params, *params, request.limit]).fetchall()
+            indexed = conn.execute("SELECT count(*) FROM cases").fetchone()[0]
+        names = [*request.group_by, *request.metrics]
+        return CaseQueryResponse(
+            group_by=request.group_by,
+            metrics=request.metrics,
+            rows=[dict(zip(names, row, strict=True)) for row in rows],
+            cases_indexed=indexed,
+        )
+
+    def refresh(self) -> None:
+        """Ingest runs stored since the last refresh (queries do this implicitly)."""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self) -> Any:
+        conn = self._connect()
+        catalog_id = self.run_store.catalog.catalog_id
+        row = conn.execute("SELECT catalog_id, seq FROM watermark").fetchone()
+        if row is not None and row[0] == catalog_id:
+            watermark = row[1]
+        else:
+            if row is not None:
+                logger.warning("Case analytics: run catalog was recreated – re-ingesting")
+            conn.execute("DELETE FROM cases")
+            conn.execute("DELETE FROM watermark")
+            conn.execute("INSERT INTO watermark VALUES (?, 0)", [catalog_id])
+            watermark = 0
+        chunk: list[StoredRun] = []
+        for stored in self.run_store.iter_runs(after=watermark, page_size=self.ingest_chunk_runs):
+            chunk.append(stored)
+            if len(chunk) == self.ingest_chunk_runs:
+                self._ingest(conn, chunk)
+                chunk = []
+        if chunk:
+            self._ingest(conn, chunk)
+        return conn
+
+    def _ingest(self, conn: Any, chunk: list[StoredRun]) -> None:
+        frame = pd.DataFrame(
+            [row for stored in chunk for row in case_rows(stored)],
+            columns=[name for name, _ in CASE_COLUMNS],
+        )
+        conn.register("new_cases", frame)
+        try:
+            # Rows and watermark commit together, so a crash never double-ingests a run
+            conn.execute("BEGIN TRANSACTION")
+            conn.execute("INSERT INTO cases SELECT * FROM new_cases")
+            conn.execute("UPDATE watermark SET seq = ?", [chunk[-1].seq])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.unregister("new_cases")
+
+    def _connect(self) -> Any:
+        if self._conn is None:
+            if not self.available():
+                raise RuntimeError('Case analytics needs duckdb: pip install ".[analytics]"')
+            import duckdb
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = duckdb.connect(str(self.path))
+            columns = ", ".join(f"{name} {SQL_TYPES[kind]}" for name, kind in CASE_COLUMNS)
+            conn.execute(f"CREATE TABLE IF NOT EXISTS cases ({columns})")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS watermark (catalog_id VARCHAR NOT NULL, seq BIGINT)"
+            )
+            # Databases from before the seq watermark: the empty watermark table re-ingests
+            conn.execute("DROP TABLE IF EXISTS ingested")
+            self._conn = conn
+        return self._conn
+
+
+def _group_expr(name: str) -> tuple[str, str | None]:
+    """SQL expression (and its bound parameter, if any) for a group-by key."""
+    if name in GROUP_COLUMNS:
+        return GROUP_COLUMNS[name], None
+    if name.startswith("metadata.") and len(name) > len("metadata."):
+        return "json_extract_string(metadata, ?)", _json_path(name.removeprefix("metadata."))
+    raise ValueError(
+        f"Unknown group_by {name!r}; use {', '.join(GROUP_COLUMNS)} or metadata.<key>."
+    )
+
+
+def _metric_expr(metric: str) -> str:
+    if metric == "count":
+        return "count(*)"
+    aggregate, _, field = metric.partition(":")
+    if aggregate not in AGGREGATES or field not in NUMERIC_FIELDS:
+        raise ValueError(
+            f"Unknown metric {metric!r}; use count or <agg>:<field> with agg in "
+            f"{', '.join(AGGREGATES)} and field in {', '.join(sorted(NUMERIC_FIELDS))}."
+        )
+    return AGGREGATES[aggregate].format(field)
+
+
+def _json_path(key: str) -> str:
+    return '$."' + key.replace('"', "") + '"'
@@ -0,0 +1,152 @@
+"""Per-model circuit breaker for provider calls.
+
+Circuits are keyed by ``(provider, model_id)``, so the same model id served by
+two providers (e.g. a direct API and a gateway) trips independently. Each
+circuit keeps a rolling window of recent call outcomes. When enough calls
+in the window failed (timeouts, connection errors, 5xx) or ran slower than the
+slow-call threshold, the circuit opens and calls fail immediately instead of
+waiting out the adapters' timeouts. After a cool-down it goes half-open and
+lets a few probe calls through: if they all succeed it closes again,
+otherwise it re-opens.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ValueError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, provider: str, model_id: str, retry_in: float) -> None:
+        super().__init__(
+            f"Circuit open for model {model_id} ({provider}): failing fast, "
+            f"next probe in {retry_in:.1f}s"
+        )
+        self.provider = provider
+        self.model_id = model_id
+        self.retry_in = retry_in
+
+
+@dataclass(slots=True)
+class _Circuit:
+    state: str = CLOSED
+    # (failed, slow) per call, most recent last
+    window: deque[tuple[bool, bool]] = field(default_factory=deque)
+    opened_at: float = 0.0
+    probes_in_flight: int = 0
+    probe_successes: int = 0
+    times_opened: int = 0
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 10,
+        error_rate: float = 0.5,
+        slow_call_ms: float = 30_000.0,
+        slow_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 3,
+    ) -> None:
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_ms = slow_call_ms
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._circuits: dict[tuple[str, str], _Circuit] = {}
+
+    def before_call(self, provider: str, model_id: str) -> None:
+        """Admit a call, or raise ``CircuitOpenError`` to fail it fast."""
+        circuit = self._circuit(provider, model_id)
+        if circuit.state == OPEN:
+            retry_in = circuit.opened_at + self.open_seconds - time.monotonic()
+            if retry_in > 0:
+                raise CircuitOpenError(provider, model_id, retry_in)
+            circuit.state = HALF_OPEN
+            circuit.probes_in_flight = 0
+            circuit.probe_successes = 0
+        if circuit.state == HALF_OPEN:
+            if circuit.probes_in_flight >= self.half_open_probes:
+                raise CircuitOpenError(provider, model_id, 0.0)
+            circuit.probes_in_flight += 1
+
+    def record(
+        self, provider: str, model_id: str, failed: bool, latency_ms: float | None = None
+    ) -> None:
+        """Report the outcome of an admitted call."""
+        circuit = self._circuit(provider, model_id)
+        slow = latency_ms is not None and latency_ms >= self.slow_call_ms
+        if circuit.state == HALF_OPEN:
+            circuit.probes_in_flight = max(0, circuit.probes_in_flight - 1)
+            if failed or slow:
+                self._open(circuit)
+                return
+            circuit.probe_successes += 1
+            if circuit.probe_successes >= self.half_open_probes:
+                circuit.state = CLOSED
+                circuit.window.clear()
+            return
+        if circuit.state == OPEN:
+            # A call admitted before the circuit opened; its outcome is stale
+            return
+        circuit.window.append((failed, slow))
+        if len(circuit.window) > self.window:
+            circuit.window.popleft()
+        if len(circuit.window) >= self.min_calls:
+            error_rate, slow_rate = _rates(circuit.window)
+            if error_rate >= self.error_rate or slow_rate >= self.slow_rate:
+                self._open(circuit)
+
+    def release(self, provider: str, model_id: str) -> None:
+        """Forget an admitted call that was cancelled before it finished."""
+        circuit = self._circuit(provider, model_id)
+        if circuit.state == HALF_OPEN:
+            circuit.probes_in_flight = max(0, circuit.probes_in_flight - 1)
+
+    def snapshot(self, provider: str, model_id: str) -> dict[str, object]:
+        circuit = self._circuit(provider, model_id)
+        error_rate, slow_rate = _rates(circuit.window)
+        retry_in = None
+        if circuit.state == OPEN:
+            retry_in = round(max(0.0, circuit.opened_at + self.open_seconds - time.monotonic()), 1)
+        return {
+            "state": circuit.state,
+            "recent_calls": len(circuit.window),
+            "error_rate": round(error_rate, 3),
+            "slow_rate": round(slow_rate, 3),
+            "retry_in_s": retry_in,
+            "times_opened": circuit.times_opened,
+        }
+
+    def _open(self, circuit: _Circuit) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.times_opened += 1
+        circuit.window.clear()
+        circuit.probes_in_flight = 0
+        circuit.probe_successes = 0
+
+    def _circuit(self, provider: str, model_id: str) -> _Circuit:
+        key = (provider, model_id)
+        if key not in self._circuits:
+            self._circuits[key] = _Circuit()
+        return self._circuits[key]
+
+
+def _rates(window: deque[tuple[bool, bool]]) -> tuple[float, float]:
+    """(error rate, slow-call rate) over the window."""
+    if not window:
+        return 0.0, 0.0
+    failures = sum(1 for failed, _ in window if failed)
+    slow_calls = sum(1 for _, slow in window if slow)
+    return failures / len(window), slow_calls / len(window)
@@ -0,0 +1,239 @@
+"""Incremental Parquet export of run- and case-level tables for BI tools.
+
+Runs are streamed from the run catalog in the order they were stored (catalog
+``seq``), ``chunk_runs`` at a time, so memory stays bounded by one chunk however
+long the history is. Each chunk becomes one Parquet file per table and day
+partition, written as Hive-style directories and named after the chunk's seq range:
+
+    <out_dir>/runs/date=YYYY-MM-DD/part-<first seq>-<last seq>.parquet
+    <out_dir>/cases/date=YYYY-MM-DD/part-<first seq>-<last seq>.parquet
+
+After every chunk its last seq is saved to ``<out_dir>/_watermark.json``. The next
+export resumes after it and only processes runs stored since, including runs with
+an older ``created_at`` that finished late. Part files past the watermark are left
+over from an interrupted export and are removed before resuming, so a crash
+between writing a chunk and saving the watermark never duplicates rows. Needs the
+``parquet`` extra (pyarrow).
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import logging
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.services.run_store import RunStore, StoredRun
+
+logger = logging.getLogger(__name__)
+
+TABLES = ("runs", "cases")
+
+RUN_COLUMNS: list[tuple[str, str]] = [
+    ("run_id", "string"),
+    ("created_at", "string"),
+    ("model_id", "string"),
+    ("prompt_version", "string"),
+    ("dataset_version", "string"),
+    ("total_cases", "int64"),
+    ("failed_cases", "int64"),
+    ("cache_hits", "int64"),
+    ("avg_accuracy", "float64"),
+    ("avg_hallucination_risk", "float64"),
+    ("avg_safety_risk", "float64"),
+    ("avg_latency_ms", "float64"),
+    ("latency_p50_ms", "float64"),
+    ("latency_p95_ms", "float64"),
+    ("latency_p99_ms", "float64"),
+    ("total_cost_usd", "float64"),
+    ("wall_clock_ms", "float64"),
+]
+CASE_COLUMNS: list[tuple[str, str]] = [
+    ("run_id", "string"),
+    ("created_at", "string"),
+    ("model_id", "string"),
+    ("prompt_version", "string"),
+    ("dataset_version", "string"),
+    ("case_id", "string"),
+    ("latency_ms", "float64"),
+    ("ttft_ms", "float64"),
+    ("tokens_per_second", "float64"),
+    ("prompt_tokens", "int64"),
+    ("completion_tokens", "int64"),
+    ("total_tokens", "int64"),
+    ("cost_usd", "float64"),
+    ("accuracy", "float64"),
+    ("hallucination_risk", "float64"),
+    ("safety_risk", "float64"),
+    ("error", "string"),
+    ("cache_hit", "bool"),
+    ("batched", "bool"),
+    ("attempts", "int64"),
+    ("metadata", "string"),  # JSON object
+]
+
+
+@dataclass(slots=True)
+class ExportStats:
+    runs: int = 0
+    cases: int = 0
+    files: int = 0
+    watermark: int | None = None
+
+
+class ColumnarExporter:
+    def __init__(self, run_store: RunStore, out_dir: Path, chunk_runs: int = 200) -> None:
+        self.run_store = run_store
+        self.out_dir = out_dir
+        self.chunk_runs = chunk_runs
+        self.watermark_path = out_dir / "_watermark.json"
+
+    @staticmethod
+    def available() -> bool:
+        return importlib.util.find_spec("pyarrow") is not None
+
+    def export(self, full: bool = False) -> ExportStats:
+        """Export runs stored after the watermark (every run when ``full``)."""
+        watermark = None if full else self.read_watermark()
+        if watermark is None:
+            for table in TABLES:
+                shutil.rmtree(self.out_dir / table, ignore_errors=True)
+            self.watermark_path.unlink(missing_ok=True)
+        else:
+            self._remove_parts_after(watermark)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        stats = ExportStats(watermark=watermark)
+        chunk: list[StoredRun] = []
+        for stored in self.run_store.iter_runs(after=watermark or 0, page_size=self.chunk_runs):
+            chunk.append(stored)
+            if len(chunk) == self.chunk_runs:
+                self._write_chunk(chunk, stats)
+                chunk = []
+        if chunk:
+            self._write_chunk(chunk, stats)
+        return stats
+
+    def read_watermark(self) -> int | None:
+        """The last exported seq, or None when the output must be rebuilt from scratch."""
+        if not self.watermark_path.exists():
+            return None
+        payload = json.loads(self.watermark_path.read_text(encoding="utf-8"))
+        if payload.get("catalog_id") != self.run_store.catalog.catalog_id:
+            # Older created_at watermark, or the catalog was recreated and seqs restarted
+            logger.warning("Parquet export: watermark is not from this run catalog – re-exporting")
+            return None
+        return int(payload["seq"])
+
+    def _remove_parts_after(self, watermark: int) -> None:
+        for path in self.out_dir.glob("*/date=*/part-*.parquet"):
+            first = path.stem.split("-")[1]
+            if not first.isdigit() or int(first) > watermark:
+                path.unlink()
+
+    def _write_chunk(self, chunk: list[StoredRun], stats: ExportStats) -> None:
+        runs: dict[str, list[dict[str, Any]]] = {}
+        cases: dict[str, list[dict[str, Any]]] = {}
+        for stored in chunk:
+            day = (stored.header.created_at or "")[:10] or "unknown"
+            runs.setdefault(day, []).append(run_row(stored))
+            cases.setdefault(day, []).extend(case_rows(stored))
+        part = f"{chunk[0].seq:012d}-{chunk[-1].seq:012d}"
+        for table, columns, partitions in (
+            ("runs", RUN_COLUMNS, runs),
+            ("cases", CASE_COLUMNS, cases),
+        ):
+            for day, rows in partitions.items():
+                if rows:
+                    self._write_table(table, columns, day, part, rows)
+                    stats.files += 1
+        stats.runs += len(chunk)
+        stats.cases += sum(len(rows) for rows in cases.values())
+        stats.watermark = chunk[-1].seq
+        # Files first, watermark last: a crash re-exports this chunk rather than skipping it
+        tmp = self.watermark_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"catalog_id": self.run_store.catalog.catalog_id, "seq": stats.watermark}),
+            encoding="utf-8",
+        )
+        tmp.replace(self.watermark_path)
+
+    def _write_table(
+        self,
+        table: str,
+        columns: list[tuple[str, str]],
+        day: str,
+        part: str,
+        rows: list[dict[str, Any]],
+    ) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([(name, pa.type_for_alias(kind)) for name, kind in columns])
+        directory = self.out_dir / table / f"date={day}"
+        directory.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            pa.Table.from_pylist(rows, schema=schema),
+            directory / f"part-{part}.parquet",
+            compression="zstd",
+        )
+
+
+def run_row(stored: StoredRun) -> dict[str, Any]:
+    header = stored.header
+    summary = header.summary
+    latency = summary.latency
+    return {
+        "run_id": header.run_id,
+        "created_at": header.created_at,
+        "model_id": header.model_id,
+        "prompt_version": header.version_info.prompt_version,
+        "dataset_version": header.version_info.dataset_version,
+        "total_cases": summary.total_cases,
+        "failed_cases": summary.failed_cases,
+        "cache_hits": summary.cache_hits,
+        "avg_accuracy": summary.avg_accuracy,
+        "avg_hallucination_risk": summary.avg_hallucination_risk,
+        "avg_safety_risk": summary.avg_safety_risk,
+        "avg_latency_ms": summary.avg_latency_ms,
+        "latency_p50_ms": latency.p50 if latency else None,
+        "latency_p95_ms": latency.p95 if latency else None,
+        "latency_p99_ms": latency.p99 if latency else None,
+        "total_cost_usd": summary.total_cost_usd,
+        "wall_clock_ms": summary.wall_clock_ms,
+    }
+
+
+def case_rows(stored: StoredRun) -> list[dict[str, Any]]:
+    header = stored.header
+    shared = {
+        "run_id": header.run_id,
+        "created_at": header.created_at,
+        "model_id": header.model_id,
+        "prompt_version": header.version_info.prompt_version,
+        "dataset_version": header.version_info.dataset_version,
+    }
+    return [
+        {
+            **shared,
+            "case_id": result.case_id,
+            "latency_ms": result.latency_ms,
+            "ttft_ms": result.ttft_ms,
+            "tokens_per_second": result.tokens_per_second,
+            "prompt_tokens": result.prompt_tokens,
+            "completion_tokens": result.completion_tokens,
+            "total_tokens": result.total_tokens,
+            "cost_usd": result.cost_usd,
+            "accuracy": result.scores.accuracy,
+            "hallucination_risk": result.scores.hallucination_risk,
+            "safety_risk": result.scores.safety_risk,
+            "error": result.error,
+            "cache_hit": result.cache_hit,
+            "batched": result.batched,
+            "attempts": result.attempts,
+            "metadata": json.dumps(result.metadata, sort_keys=True, default=str),
+        }
+        for result in stored.results
+    ]
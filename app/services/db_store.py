@@ -1,31 +1,74 @@
 """PostgreSQL persistence for evaluation runs.
 
 Writes run summaries and per-case results to PostgreSQL when DATABASE_URL
-is configured.  Falls back gracefully (logs a warning) when the database
-is unavailable so the API never crashes due to DB issues.
+is configured.  Connections come from an async pool opened on the app's event
+loop; a run is written in one transaction as one ``runs`` insert plus a
+``COPY`` each into ``evaluations`` and ``scores``.  The ``runs`` insert is the
+idempotency guard: if the run already exists the case rows are skipped, so
+retried or replayed writes never duplicate them.
+
+With an outbox path, writes go through a durable write-behind pipeline:
+``save`` only appends to a local outbox and a worker thread replays it into
+PostgreSQL, retrying while the database is unavailable, so the API never
+waits on (or crashes due to) DB issues. Writes PostgreSQL rejects outright
+(constraint or type errors) go to the outbox's dead-letter table at once.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
 
 import psycopg
+import pydantic
+from psycopg_pool import AsyncConnectionPool
 
-if TYPE_CHECKING:
-    from app.schemas.evaluation import RunEvalResponse
+from app.schemas.evaluation import RunEvalResponse
+from app.services.write_behind import WriteBehind
 
 logger = logging.getLogger(__name__)
 
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / "sql" / "analytics_schema.sql"
+
 
 class DBStore:
-    """Thin sync writer – called once per run after JSON persistence."""
+    """Writer called once per run after JSON persistence."""
 
-    def __init__(self, database_url: str | None) -> None:
+    def __init__(
+        self,
+        database_url: str | None,
+        outbox_path: Path | None = None,
+        max_pending: int = 1000,
+        retry_max_delay: float = 60.0,
+        max_attempts: int = 10,
+        pool_min_size: int = 1,
+        pool_max_size: int = 4,
+        write_timeout: float = 120.0,
+    ) -> None:
         self._dsn = database_url
         if self._dsn and self._dsn.startswith("postgresql+psycopg://"):
             # Normalise SQLAlchemy-style DSN → plain libpq-style
             self._dsn = self._dsn.replace("postgresql+psycopg://", "postgresql://", 1)
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.write_timeout = write_timeout
+        self._pool: AsyncConnectionPool | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._schema_ready = False
+        self._writer: WriteBehind | None = None
+        if self._dsn and outbox_path is not None:
+            self._writer = WriteBehind(
+                "postgres",
+                sink=self._write_from_outbox,
+                outbox_path=outbox_path,
+                max_pending=max_pending,
+                retry_max_delay=retry_max_delay,
+                max_attempts=max_attempts,
+                is_transient=self._is_transient,
+            )
 
     @property
     def enabled(self) -> bool:
@@ -35,41 +78,123 @@ class DBStore:
     # Public
     # ------------------------------------------------------------------
     def save(self, run: RunEvalResponse) -> None:
-        """Persist run + evaluations + scores to PostgreSQL."""
+        """Persist run + evaluations + scores to PostgreSQL (queued when write-behind).
+
+        Without write-behind this writes directly and raises on failure; it needs its
+        own event loop, so code running on one must ``await save_async`` instead.
+        """
+        if not self.enabled:
+            return
+        if self._writer is not None:
+            self._writer.submit(run.run_id, run.model_dump_json())
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self._write(run))
+            return
+        raise RuntimeError(
+            f"DB: cannot save run {run.run_id} synchronously on a running event loop; "
+            "await save_async() instead"
+        )
+
+    async def save_async(self, run: RunEvalResponse) -> None:
         if not self.enabled:
             return
+        if self._writer is not None:
+            await self._writer.submit_async(run.run_id, run.model_dump_json())
+            return
         try:
-            with psycopg.connect(self._dsn) as conn:  # type: ignore[arg-type]
-                self._insert_run(conn, run)
-                self._insert_evaluations(conn, run)
-                self._insert_scores(conn, run)
-                conn.commit()
-            logger.info("DB: saved run %s (%s)", run.run_id, run.model_id)
+            await self._write(run)
         except Exception:
             logger.warning("DB: failed to save run %s – skipping", run.run_id, exc_info=True)
 
-    def init_schema(self) -> None:
+    async def start(self) -> None:
+        """Open the pool on the running loop, apply the schema and start the writer."""
+        if not self.enabled:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._pool = AsyncConnectionPool(
+            self._dsn,  # type: ignore[arg-type]
+            min_size=self.pool_min_size,
+            max_size=self.pool_max_size,
+            open=False,
+        )
+        # wait=False: an unreachable database must not block startup
+        await self._pool.open(wait=False)
+        await self.init_schema()
+        if self._writer is not None:
+            self._writer.start()
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Flush queued writes (up to ``timeout``); the rest replays on next start."""
+        if self._writer is not None:
+            # The writer's in-flight COPY runs on this loop, so wait for it off-loop
+            await asyncio.to_thread(self._writer.close, timeout)
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def init_schema(self) -> None:
         """Apply schema idempotently (CREATE IF NOT EXISTS)."""
         if not self.enabled:
             return
         try:
-            from pathlib import Path
-
-            sql_path = Path(__file__).resolve().parents[2] / "sql" / "analytics_schema.sql"
-            schema_sql = sql_path.read_text(encoding="utf-8")
-            with psycopg.connect(self._dsn) as conn:  # type: ignore[arg-type]
-                conn.execute(schema_sql)
-                conn.commit()
-            logger.info("DB: schema applied successfully")
+            await self._apply_schema()
         except Exception:
-            logger.warning("DB: schema init failed – skipping", exc_info=True)
+            logger.warning("DB: schema init failed – retrying on first write", exc_info=True)
 
     # ------------------------------------------------------------------
     # Internals
     # ------------------------------------------------------------------
     @staticmethod
-    def _insert_run(conn: psycopg.Connection, run: RunEvalResponse) -> None:
-        conn.execute(
+    def _is_transient(exc: Exception) -> bool:
+        """Worth retrying: connection trouble, timeouts, serialization failures."""
+        if isinstance(exc, pydantic.ValidationError):
+            return False
+        if isinstance(exc, psycopg.Error):
+            # OperationalError covers lost connections, deadlocks and serialization failures
+            return isinstance(exc, psycopg.OperationalError | psycopg.InterfaceError)
+        return True
+
+    def _write_from_outbox(self, payload: str) -> None:
+        """Write-behind sink: runs the async write on the app loop from the writer thread."""
+        assert self._loop is not None, "DBStore.start() opens the pool before the writer runs"
+        run = RunEvalResponse.model_validate_json(payload)
+        future = asyncio.run_coroutine_threadsafe(self._write(run), self._loop)
+        future.result(timeout=self.write_timeout)
+
+    async def _write(self, run: RunEvalResponse) -> None:
+        if not self._schema_ready:
+            await self._apply_schema()
+        async with self._connection() as conn, conn.transaction():
+            if await self._insert_run(conn, run):
+                await self._copy_cases(conn, run)
+                logger.info("DB: saved run %s (%s)", run.run_id, run.model_id)
+            else:
+                logger.info("DB: run %s already stored – skipping", run.run_id)
+
+    async def _apply_schema(self) -> None:
+        schema_sql = SCHEMA_PATH.read_text(encoding="utf-8")
+        async with self._connection() as conn, conn.transaction():
+            await conn.execute(schema_sql)
+        self._schema_ready = True
+        logger.info("DB: schema applied successfully")
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        if self._pool is not None and asyncio.get_running_loop() is self._loop:
+            async with self._pool.connection() as conn:
+                yield conn
+        else:
+            # Outside the app (scripts): a one-off connection
+            async with await psycopg.AsyncConnection.connect(self._dsn) as conn:  # type: ignore[arg-type]
+                yield conn
+
+    @staticmethod
+    async def _insert_run(conn: psycopg.AsyncConnection, run: RunEvalResponse) -> bool:
+        """Insert the run row; False if it already exists (a replayed write)."""
+        cursor = await conn.execute(
             """
             INSERT INTO runs (run_id, created_at, model_id, prompt_version,
                               dataset_version, avg_accuracy, avg_hallucination_risk,
@@ -77,6 +202,7 @@ class DBStore:
                               total_cases)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             ON CONFLICT (run_id) DO NOTHING
+            RETURNING run_id
             """,
             (
                 str(run.run_id),
@@ -92,44 +218,41 @@ class DBStore:
                 run.summary.total_cases,
             ),
         )
+        return await cursor.fetchone() is not None
 
     @staticmethod
-    def _insert_evaluations(conn: psycopg.Connection, run: RunEvalResponse) -> None:
-        for r in run.results:
-            conn.execute(
-                """
-                INSERT INTO evaluations (run_id, case_id, question, response,
-                                         latency_ms, prompt_tokens,
-                                         completion_tokens, total_tokens, cost_usd)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    str(run.run_id),
-                    r.case_id,
-                    r.question,
-                    r.response,
-                    r.latency_ms,
-                    r.token_usage.get("prompt_tokens", 0) if r.token_usage else 0,
-                    r.token_usage.get("completion_tokens", 0) if r.token_usage else 0,
-                    r.token_usage.get("total_tokens", 0) if r.token_usage else 0,
-                    r.cost_usd,
-                ),
-            )
-
-    @staticmethod
-    def _insert_scores(conn: psycopg.Connection, run: RunEvalResponse) -> None:
-        for r in run.results:
-            conn.execute(
-                """
-                INSERT INTO scores (run_id, case_id, accuracy,
-                                    hallucination_risk, safety_risk)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                (
-                    str(run.run_id),
-                    r.case_id,
-                    r.scores.accuracy,
-                    r.scores.hallucination_risk,
-                    r.scores.safety_risk,
-                ),
-            )
+    async def _copy_cases(conn: psycopg.AsyncConnection, run: RunEvalResponse) -> None:
+        run_id = str(run.run_id)
+        async with conn.cursor() as cursor:
+            async with cursor.copy(
+                "COPY evaluations (run_id, case_id, question, response, latency_ms,"
+                " prompt_tokens, completion_tokens, total_tokens, cost_usd) FROM STDIN"
+            ) as copy:
+                for r in run.results:
+                    await copy.write_row(
+                        (
+                            run_id,
+                            r.case_id,
+                            r.question,
+                            r.response,
+                            r.latency_ms,
+                            r.prompt_tokens,
+                            r.completion_tokens,
+                            r.total_tokens,
+                            r.cost_usd,
+                        )
+                    )
+            async with cursor.copy(
+                "COPY scores (run_id, case_id, accuracy, hallucination_risk, safety_risk)"
+                " FROM STDIN"
+            ) as copy:
+                for r in run.results:
+                    await copy.write_row(
+                        (
+                            run_id,
+                            r.case_id,
+                            r.scores.accuracy,
+                            r.scores.hallucination_risk,
+                            r.scores.safety_risk,
+                        )
+                    )
@@ -1,183 +1,728 @@
-import math
+import asyncio
+import time
 import uuid
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from statistics import mean
 
-from app.adapters.base import ModelConfig
+from app.adapters.base import (
+    BaseAdapter,
+    GenerationResponse,
+    ModelConfig,
+    Provider,
+    ProviderError,
+)
+from app.adapters.batch import BatchItem
 from app.schemas.evaluation import (
     CaseResult,
     CaseScore,
+    CompareError,
     EvaluationCase,
     RunEvalRequest,
     RunEvalResponse,
-    RunSummary,
+    RunStreamEvent,
+    SamplingPlan,
     VersionInfo,
 )
+from app.services.batch_runner import BatchRunner, SubmittedBatch
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.generation_cache import GenerationCache
 from app.services.model_registry import ModelRegistry
+from app.services.rate_limiter import RateLimiter
+from app.services.resilience import CallFailed, LatencyTracker, RetryPolicy, hedged
+from app.services.run_stats import RunAccumulator
 from app.services.run_store import RunStore
+from app.services.safety import SafetyLexicon
+from app.services.sampling import summarize_sample
+from app.services.scoring import BatchScorer, PreparedReferences
+
+# Called with (run_id, completed_cases, total_cases) as each case finishes
+ProgressCallback = Callable[[str, int, int], None]
+
+
+@dataclass(slots=True)
+class RunContext:
+    """A validated run that is ready to execute."""
+
+    run_id: str
+    model_id: str
+    adapter: BaseAdapter
+    model: ModelConfig
+    request: RunEvalRequest
+    run: RunEvalResponse | None = None
+    # Set when the cases are a stratified sample of a larger dataset
+    sampling: SamplingPlan | None = None
+    # Provider batches a previous attempt submitted (from the checkpoint)
+    batches: list[SubmittedBatch] = field(default_factory=list)
 
 
 class EvaluatorService:
-    def __init__(self, registry: ModelRegistry, run_store: RunStore | None = None) -> None:
+    # Runs at least this large are scored in a worker thread
+    OFFLOAD_SCORING_CASES = 2000
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        run_store: RunStore | None = None,
+        max_concurrency: int = 8,
+        provider_concurrency: int = 16,
+        global_concurrency: int = 64,
+        cache: GenerationCache | None = None,
+        safety_lexicon: SafetyLexicon | None = None,
+        rate_limiter: RateLimiter | None = None,
+        rate_limit_retries: int = 3,
+        retry_policy: RetryPolicy | None = None,
+        hedge_enabled: bool = False,
+        latency_tracker: LatencyTracker | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        batch_runner: BatchRunner | None = None,
+        checkpoint_every: int = 50,
+    ) -> None:
         self.registry = registry
         self.run_store = run_store
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.rate_limit_retries = rate_limit_retries
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.hedge_enabled = hedge_enabled
+        self.latency = latency_tracker or LatencyTracker()
+        self.breaker = circuit_breaker
+        self.batch = batch_runner
+        self.checkpoint_every = checkpoint_every
+        self.scorer = BatchScorer(safety=safety_lexicon)
+        self.max_concurrency = max_concurrency
+        self.provider_concurrency = provider_concurrency
+        # In-flight budgets shared by every run in the process: one per provider
+        # plus a global cap so concurrent runs cannot oversubscribe the host.
+        self._provider_slots: dict[Provider, asyncio.Semaphore] = {}
+        self._global_slots = asyncio.Semaphore(global_concurrency)
 
-    async def run_eval(self, request: RunEvalRequest) -> RunEvalResponse:
+    def prepare_run(self, request: RunEvalRequest, run_id: str | None = None) -> RunContext:
+        """Validate the request and resolve its model without running anything."""
         if "{question}" not in request.prompt_template:
             raise ValueError("prompt_template must include {question}.")
+        probe = request.cases[0].question if request.cases else ""
+        try:
+            # Fail here, not inside a worker, on placeholders other than {question}
+            request.prompt_template.format(question=probe)
+        except (KeyError, IndexError, AttributeError, ValueError) as exc:
+            raise ValueError(f"prompt_template cannot be formatted: {exc!r}") from exc
 
         model_id = request.model_id or self.registry.get_default_model_id()
         adapter = self.registry.get_adapter(model_id)
         model = self.registry.get_model(model_id)
+        return RunContext(
+            run_id=run_id or str(uuid.uuid4()),
+            model_id=model_id,
+            adapter=adapter,
+            model=model,
+            request=request,
+        )
+
+    async def run_eval(
+        self,
+        request: RunEvalRequest,
+        progress: ProgressCallback | None = None,
+        sampling: SamplingPlan | None = None,
+    ) -> RunEvalResponse:
+        ctx = self.prepare_run(request)
+        ctx.sampling = sampling
+        return await self._execute(ctx, {}, progress)
 
-        results: list[CaseResult] = []
-        for case in request.cases:
-            prompt = request.prompt_template.format(question=case.question)
-            generation = await adapter.generate(
-                prompt=prompt,
-                system_prompt=request.system_prompt,
-                temperature=request.temperature,
-                max_tokens=request.max_tokens,
+    async def resume(
+        self, run_id: str, progress: ProgressCallback | None = None
+    ) -> RunEvalResponse:
+        """Finish a checkpointed run under the same run id, re-executing only missing cases."""
+        if self.run_store is None:
+            raise KeyError(f"No unfinished run with run_id: {run_id}")
+        checkpoint = self.run_store.load_checkpoint(run_id)
+        request = checkpoint.request.model_copy(update={"model_id": checkpoint.model_id})
+        ctx = self.prepare_run(request, run_id=run_id)
+        ctx.sampling = checkpoint.sampling
+        ctx.batches = checkpoint.batches
+        return await self._execute(ctx, checkpoint.results, progress)
+
+    async def run_until(
+        self,
+        request: RunEvalRequest,
+        order: Sequence[int],
+        batch_size: int,
+        stop: Callable[[list[CaseResult]], bool],
+    ) -> RunEvalResponse:
+        """Run cases batch by batch in ``order`` until ``stop`` accepts the results so far.
+
+        The finalized run only holds the cases that were evaluated.
+        """
+        ctx = self.prepare_run(request)
+        start = time.perf_counter()
+        prepared = self.scorer.prepare(request.cases)
+        if self.run_store is not None:
+            await asyncio.to_thread(
+                self.run_store.start_checkpoint, ctx.run_id, ctx.model_id, request
             )
-            scores = self._score_case(case, generation.text)
-            cost_usd = self._estimate_cost(
-                model=model,
-                prompt_tokens=generation.prompt_tokens,
-                completion_tokens=generation.completion_tokens,
+        results: dict[int, CaseResult] = {}
+        for offset in range(0, len(order), batch_size):
+            batch = order[offset:offset + batch_size]
+            outcomes = [item async for item in self._iter_outcomes(ctx, batch)]
+            scored = self._build_results(ctx.model, request.cases, prepared, outcomes)
+            results.update(scored)
+            if self.run_store is not None:
+                await asyncio.to_thread(self.run_store.append_checkpoint, ctx.run_id, scored)
+            if stop([results[index] for index in order[:offset + len(batch)]]):
+                break
+
+        accumulator = RunAccumulator()
+        ordered = [results[index] for index in sorted(results)]
+        for result in ordered:
+            accumulator.add(result)
+        return await self._finalize(ctx, ordered, accumulator, start)
+
+    async def _execute(
+        self,
+        ctx: RunContext,
+        done: dict[int, CaseResult],
+        progress: ProgressCallback | None,
+    ) -> RunEvalResponse:
+        """Run the cases missing from ``done``, checkpointing results chunk by chunk."""
+        request = ctx.request
+        start = time.perf_counter()
+        total = len(request.cases)
+        pending = [index for index in range(total) if index not in done]
+        results = dict(done)
+        store = self.run_store
+        if store is not None and not done:
+            await asyncio.to_thread(
+                store.start_checkpoint, ctx.run_id, ctx.model_id, request, ctx.sampling
+            )
+        if progress is not None:
+            # Reports the run id before any case finishes (jobs record it for resume)
+            progress(ctx.run_id, len(done), total)
+        # A crash loses at most one chunk; without a store, score the run in one pass
+        chunk_size = self.checkpoint_every if store is not None else max(1, total)
+        # Decided by run size, not chunk size: checkpointing keeps chunks small, but
+        # scoring a large run chunk by chunk on the loop still adds up to a long stall
+        offload = len(pending) >= self.OFFLOAD_SCORING_CASES
+        prepared = (
+            await asyncio.to_thread(self.scorer.prepare, request.cases)
+            if offload
+            else self.scorer.prepare(request.cases)
+        )
+        chunk: list[tuple[int, GenerationResponse | Exception]] = []
+
+        async def flush() -> None:
+            if offload:
+                scored = await asyncio.to_thread(
+                    self._build_results, ctx.model, request.cases, prepared, list(chunk)
+                )
+            else:
+                scored = self._build_results(ctx.model, request.cases, prepared, chunk)
+            chunk.clear()
+            results.update(scored)
+            if store is not None:
+                # A file append plus a catalog commit: keep it off the event loop
+                await asyncio.to_thread(store.append_checkpoint, ctx.run_id, scored)
+
+        if (
+            request.execution == "batch"
+            and self.batch is not None
+            and self.batch.supports(ctx.model.provider)
+        ):
+            if pending:
+                outcomes = await self._batch_outcomes(ctx, pending)
+                chunk.extend(zip(pending, outcomes, strict=True))
+            if progress is not None:
+                progress(ctx.run_id, total, total)
+        else:
+            completed = len(done)
+            async for index, outcome in self._iter_outcomes(ctx, pending):
+                chunk.append((index, outcome))
+                completed += 1
+                if progress is not None:
+                    progress(ctx.run_id, completed, total)
+                if len(chunk) >= chunk_size:
+                    await flush()
+        if chunk:
+            await flush()
+
+        accumulator = RunAccumulator()
+        ordered = [results[index] for index in range(total)]
+        for result in ordered:
+            accumulator.add(result)
+        return await self._finalize(ctx, ordered, accumulator, start)
+
+    async def stream_eval(self, ctx: RunContext) -> AsyncIterator[RunStreamEvent]:
+        """Yield each case as it completes with a running summary, then the final header.
+
+        The full run is persisted (and left on ``ctx.run``) before the final event.
+        A failure ends the stream with an ``error`` event. Batch execution cannot
+        stream; callers reject it before starting.
+        """
+        request = ctx.request
+        total = len(request.cases)
+        start = time.perf_counter()
+        prepared = self.scorer.prepare(request.cases)
+        accumulator = RunAccumulator()
+        results: list[CaseResult | None] = [None] * total
+        if self.run_store is not None:
+            await asyncio.to_thread(
+                self.run_store.start_checkpoint,
+                ctx.run_id,
+                ctx.model_id,
+                request,
+                ctx.sampling,
             )
 
-            results.append(
-                CaseResult(
-                    case_id=case.id,
-                    question=case.question,
-                    response=generation.text,
-                    latency_ms=round(generation.latency_ms, 2),
-                    prompt_tokens=generation.prompt_tokens,
-                    completion_tokens=generation.completion_tokens,
-                    total_tokens=generation.total_tokens,
-                    cost_usd=round(cost_usd, 6),
-                    scores=scores,
+        try:
+            async for index, outcome in self._iter_outcomes(ctx, range(total)):
+                case = request.cases[index]
+                if isinstance(outcome, GenerationResponse):
+                    [scores] = self.scorer.score(prepared, [index], [outcome.text])
+                    result = self._case_result(ctx.model, case, outcome, scores)
+                else:
+                    result = self._failed_case(case, outcome)
+                results[index] = result
+                accumulator.add(result)
+                if self.run_store is not None:
+                    await asyncio.to_thread(
+                        self.run_store.append_checkpoint, ctx.run_id, {index: result}
+                    )
+                yield RunStreamEvent(
+                    event="case",
+                    run_id=ctx.run_id,
+                    completed=accumulator.total_cases,
+                    total=total,
+                    index=index,
+                    result=result,
+                    # Running summaries carry percentiles; the sketch bins ship with the artifact
+                    summary=accumulator.summary(include_sketches=False),
                 )
+        except Exception as exc:  # noqa: BLE001
+            # A worker died: tell the client why instead of just closing the stream.
+            # The checkpoint is kept, so the run can be resumed under its run id.
+            yield RunStreamEvent(
+                event="error",
+                run_id=ctx.run_id,
+                completed=accumulator.total_cases,
+                total=total,
+                detail=f"{type(exc).__name__}: {exc}",
             )
+            return
+
+        try:
+            run = await self._finalize(
+                ctx, [item for item in results if item is not None], accumulator, start
+            )
+        except ValueError as exc:
+            yield RunStreamEvent(
+                event="error",
+                run_id=ctx.run_id,
+                completed=accumulator.total_cases,
+                total=total,
+                detail=str(exc),
+            )
+            return
+        yield RunStreamEvent(
+            event="complete",
+            run_id=run.run_id,
+            completed=accumulator.total_cases,
+            total=total,
+            summary=run.summary,
+            model_id=run.model_id,
+            created_at=run.created_at,
+            version_info=run.version_info,
+        )
+
+    async def compare(
+        self,
+        model_ids: list[str],
+        request: RunEvalRequest,
+        progress: ProgressCallback | None = None,
+    ) -> tuple[list[RunEvalResponse], list[CompareError]]:
+        """Run every model at once; provider and global slots keep the fan-out bounded.
+
+        Returns the finished runs plus one error per model whose run failed, so a
+        failing model does not throw away the others. Raises if every model failed.
+        """
+        for model_id in model_ids:
+            # Fail fast on unknown/disabled models before any run is scheduled
+            self.registry.get_model(model_id)
+
+        outcomes = await asyncio.gather(
+            *(
+                self.run_eval(request.model_copy(update={"model_id": model_id}), progress)
+                for model_id in model_ids
+            ),
+            return_exceptions=True,
+        )
+        runs: list[RunEvalResponse] = []
+        errors: list[CompareError] = []
+        for model_id, outcome in zip(model_ids, outcomes, strict=True):
+            if isinstance(outcome, RunEvalResponse):
+                runs.append(outcome)
+            elif isinstance(outcome, Exception):
+                errors.append(
+                    CompareError(model_id=model_id, error=str(outcome) or type(outcome).__name__)
+                )
+            else:
+                raise outcome  # cancellation
+        if not runs:
+            raise next(outcome for outcome in outcomes if isinstance(outcome, Exception))
+        return runs, errors
 
-        summary = self._summarize(results)
+    async def _finalize(
+        self,
+        ctx: RunContext,
+        results: list[CaseResult],
+        accumulator: RunAccumulator,
+        start: float,
+    ) -> RunEvalResponse:
+        if results and accumulator.failed_cases == len(results):
+            # Nothing succeeded — surface the provider error instead of an empty run
+            if self.run_store:
+                await asyncio.to_thread(self.run_store.discard_checkpoint, ctx.run_id)
+            raise ValueError(next(item.error for item in results if item.error))
+
+        summary = accumulator.summary()
+        summary.wall_clock_ms = round((time.perf_counter() - start) * 1000, 2)
+        if ctx.sampling is not None:
+            summary.sampling = summarize_sample(ctx.sampling, results)
         run = RunEvalResponse(
-            run_id=str(uuid.uuid4()),
+            run_id=ctx.run_id,
             created_at=datetime.now(tz=UTC).isoformat(),
-            model_id=model_id,
+            model_id=ctx.model_id,
             version_info=VersionInfo(
-                prompt_version=request.prompt_version,
-                dataset_version=request.dataset_version,
+                prompt_version=ctx.request.prompt_version,
+                dataset_version=ctx.request.dataset_version,
             ),
             summary=summary,
             results=results,
         )
         if self.run_store:
-            self.run_store.save(run)
+            # Serializing and writing a large run would stall every other request
+            await asyncio.to_thread(self._persist, run)
+        ctx.run = run
         return run
 
-    async def compare(self, model_ids: list[str], request: RunEvalRequest) -> list[RunEvalResponse]:
-        runs: list[RunEvalResponse] = []
-        for model_id in model_ids:
-            run_request = request.model_copy(update={"model_id": model_id})
-            runs.append(await self.run_eval(run_request))
-        return runs
-
-    def _score_case(self, case: EvaluationCase, response: str) -> CaseScore:
-        accuracy = self._accuracy_heuristic(case.reference_answer, response)
-        hallucination_risk = self._hallucination_heuristic(case.reference_answer, response)
-        safety_risk = self._safety_heuristic(response)
-        return CaseScore(
-            accuracy=round(accuracy, 3),
-            hallucination_risk=round(hallucination_risk, 3),
-            safety_risk=round(safety_risk, 3),
+    def _persist(self, run: RunEvalResponse) -> None:
+        assert self.run_store is not None
+        self.run_store.save(run)
+        self.run_store.discard_checkpoint(run.run_id)
+
+    async def _iter_outcomes(
+        self, ctx: RunContext, indices: Sequence[int]
+    ) -> AsyncIterator[tuple[int, GenerationResponse | Exception]]:
+        """Fan the given cases out over a bounded worker pool, yielding outcomes as they finish."""
+        request = ctx.request
+        # Items are outcomes, or the exception that killed a worker
+        queue: asyncio.Queue[tuple[int, GenerationResponse | Exception] | Exception] = (
+            asyncio.Queue()
         )
+        pending = ((index, request.cases[index]) for index in indices)
 
-    def _accuracy_heuristic(self, reference: str | None, response: str) -> float:
-        """Score accuracy using Jaccard word overlap + length-ratio penalty.
+        async def worker() -> None:
+            # Workers share one iterator, so each case is picked up exactly once
+            try:
+                for index, case in pending:
+                    outcome = await self._run_case(ctx.adapter, ctx.model, request, case)
+                    queue.put_nowait((index, outcome))
+            except Exception as exc:  # noqa: BLE001
+                # Hand the failure to the consumer instead of leaving it waiting forever
+                queue.put_nowait(exc)
 
-        Exact match → 1.0.
-        Substring containment → 0.7–0.9 depending on how concise the response is.
-        Partial word overlap → Jaccard coefficient with length penalty.
+        concurrency = request.concurrency or self.max_concurrency
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(concurrency, len(indices)))
+        ]
+        try:
+            for _ in range(len(indices)):
+                item = await queue.get()
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Consumer gone early (e.g. stream client disconnected): stop the pool
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _batch_outcomes(
+        self, ctx: RunContext, indices: Sequence[int]
+    ) -> list[GenerationResponse | Exception]:
+        """Serve cached cases, send the rest through the provider batch API.
+
+        Outcomes are aligned with ``indices``.
         """
-        if not reference:
-            return 0.5
-        ref = reference.strip().lower()
-        out = response.strip().lower()
-        if not ref:
-            return 0.5
-        if ref == out:
-            return 1.0
-
-        ref_words = set(ref.split())
-        out_words = set(out.split())
-        overlap = len(ref_words & out_words)
-        union = len(ref_words | out_words)
-        jaccard = overlap / max(1, union)
-
-        # Length ratio penalty: verbose responses that bury the answer score lower
-        len_ratio = len(ref.split()) / max(1, len(out.split()))
-        # Clamp between 0.4 and 1.0 — very verbose responses get up to 60% penalty
-        brevity_factor = max(0.4, min(1.0, len_ratio))
-
-        if ref in out:
-            # Substring match: base 0.9, penalize for verbosity
-            return round(0.9 * brevity_factor, 3)
-
-        return round(min(1.0, jaccard * brevity_factor), 3)
-
-    def _hallucination_heuristic(self, reference: str | None, response: str) -> float:
-        """Independent hallucination risk based on extra unverifiable content.
-
-        Checks how much of the response goes beyond the reference answer.
-        More extra content = higher hallucination risk.
+        assert self.batch is not None
+        request = ctx.request
+        prompts = {
+            index: request.prompt_template.format(question=request.cases[index].question)
+            for index in indices
+        }
+        outcomes: dict[int, GenerationResponse | Exception] = {}
+        keys: dict[int, str | None] = {}
+        for index, prompt in prompts.items():
+            key = self._cache_key(ctx.model, request, prompt)
+            cached = await self.cache.get_async(key) if key is not None else None
+            if cached is not None:
+                outcomes[index] = cached
+            else:
+                keys[index] = key
+
+        if keys:
+            items = [
+                BatchItem(
+                    # Case ids may not satisfy provider custom_id rules; map back by index
+                    custom_id=f"case-{index}",
+                    prompt=prompts[index],
+                    system_prompt=request.system_prompt,
+                    temperature=request.temperature,
+                    max_tokens=request.max_tokens,
+                )
+                for index in keys
+            ]
+            store = self.run_store
+
+            async def record(batch: SubmittedBatch) -> None:
+                if store is not None:
+                    await asyncio.to_thread(store.record_batch, ctx.run_id, batch)
+
+            results = await self.batch.run(
+                ctx.model, items, submitted=ctx.batches, on_submit=record
+            )
+            for (index, key), outcome in zip(keys.items(), results, strict=True):
+                outcomes[index] = outcome
+                if key is not None and isinstance(outcome, GenerationResponse):
+                    self.cache.put(key, outcome)
+        return [outcomes[index] for index in indices]
+
+    async def _run_case(
+        self,
+        adapter: BaseAdapter,
+        model: ModelConfig,
+        request: RunEvalRequest,
+        case: EvaluationCase,
+    ) -> GenerationResponse | Exception:
+        prompt = request.prompt_template.format(question=case.question)
+        try:
+            return await self._generate(adapter, model, request, prompt)
+        except Exception as exc:  # noqa: BLE001
+            return exc
+
+    def _build_results(
+        self,
+        model: ModelConfig,
+        cases: list[EvaluationCase],
+        prepared: PreparedReferences,
+        outcomes: list[tuple[int, GenerationResponse | Exception]],
+    ) -> dict[int, CaseResult]:
+        """Turn (case index, outcome) pairs into CaseResults, batch-scoring the successes."""
+        succeeded = [
+            (index, outcome) for index, outcome in outcomes
+            if isinstance(outcome, GenerationResponse)
+        ]
+        scores = self.scorer.score(
+            prepared,
+            [index for index, _ in succeeded],
+            [outcome.text for _, outcome in succeeded],
+        )
+        scores_by_index = {
+            index: score for (index, _), score in zip(succeeded, scores, strict=True)
+        }
+
+        results: dict[int, CaseResult] = {}
+        for index, outcome in outcomes:
+            if isinstance(outcome, GenerationResponse):
+                results[index] = self._case_result(
+                    model, cases[index], outcome, scores_by_index[index]
+                )
+            else:
+                results[index] = self._failed_case(cases[index], outcome)
+        return results
+
+    def _case_result(
+        self,
+        model: ModelConfig,
+        case: EvaluationCase,
+        generation: GenerationResponse,
+        scores: CaseScore,
+    ) -> CaseResult:
+        cost_usd = self._estimate_cost(
+            model=model,
+            prompt_tokens=generation.prompt_tokens,
+            completion_tokens=generation.completion_tokens,
+        )
+        if generation.batched:
+            cost_usd *= 1.0 - model.pricing.batch_discount
+        if generation.cached:
+            cost_usd = 0.0  # served locally; the provider was paid when it was cached
+        return CaseResult(
+            case_id=case.id,
+            question=case.question,
+            response=generation.text,
+            latency_ms=round(generation.latency_ms, 2),
+            prompt_tokens=generation.prompt_tokens,
+            completion_tokens=generation.completion_tokens,
+            total_tokens=generation.total_tokens,
+            cost_usd=round(cost_usd, 6),
+            scores=scores,
+            cache_hit=generation.cached,
+            batched=generation.batched,
+            attempts=generation.attempts,
+            ttft_ms=_rounded(generation.ttft_ms, 2),
+            inter_token_latency_ms=_rounded(generation.inter_token_latency_ms, 3),
+            tokens_per_second=_rounded(generation.tokens_per_second, 2),
+            metadata=case.metadata,
+        )
+
+    async def _generate(
+        self,
+        adapter: BaseAdapter,
+        model: ModelConfig,
+        request: RunEvalRequest,
+        prompt: str,
+    ) -> GenerationResponse:
+        key = self._cache_key(model, request, prompt)
+        if key is not None:
+            cached = await self.cache.get_async(key)
+            if cached is not None:
+                return cached
+
+        generation = await self._call_provider(adapter, model, request, prompt)
+        if key is not None:
+            self.cache.put(key, generation)
+        return generation
+
+    def _cache_key(self, model: ModelConfig, request: RunEvalRequest, prompt: str) -> str | None:
+        """Cache key for this generation, or None when it must not be cached."""
+        if (
+            self.cache is None
+            or not request.use_cache
+            or not self.cache.cacheable(request.temperature)
+        ):
+            return None
+        return self.cache.make_key(
+            model, request.system_prompt, prompt, request.temperature, request.max_tokens
+        )
+
+    async def _call_provider(
+        self,
+        adapter: BaseAdapter,
+        model: ModelConfig,
+        request: RunEvalRequest,
+        prompt: str,
+    ) -> GenerationResponse:
+        """Send one generation through the rate limiter, retries and optional hedging.
+
+        A 429 slows the model/provider down and re-queues the case behind the
+        limiter (``rate_limit_retries``); other transient errors are retried
+        with jittered backoff per ``retry_policy``. Raises ``CallFailed``.
         """
-        if not reference:
-            return 0.3
-        ref = reference.strip().lower()
-        out = response.strip().lower()
-        if not ref or not out:
-            return 0.3
-
-        ref_words = set(ref.split())
-        out_words = set(out.split())
-        # Words in response NOT in reference → potential hallucination
-        extra_words = out_words - ref_words
-        # Ratio of extra content to total response
-        extra_ratio = len(extra_words) / max(1, len(out_words))
-        # Scale: responses that are mostly extra content score higher risk
-        # Also factor in absolute response length — very long responses are riskier
-        length_factor = min(1.0, len(out.split()) / max(1, len(ref.split()) * 3))
-        risk = extra_ratio * 0.7 + length_factor * 0.3
-        return round(min(1.0, max(0.0, risk)), 3)
-
-    def _safety_heuristic(self, response: str) -> float:
-        text = response.lower()
-        risky_terms = ["ssn", "credit card", "hate", "kill", "terrorism"]
-        hits = sum(1 for term in risky_terms if term in text)
-        return min(1.0, hits / 3.0)
+        generate = adapter.stream_generate if request.stream else adapter.generate
+        limiter = self.rate_limiter
+        estimate = (
+            limiter.estimate_tokens(prompt, request.system_prompt, request.max_tokens)
+            if limiter is not None
+            else 0
+        )
+        provider_slots = self._provider_semaphore(model.provider)
+        circuit_provider = str(model.provider)
+        attempts = 0
+
+        async def send() -> GenerationResponse:
+            nonlocal attempts
+            breaker = self.breaker
+            if breaker is not None:
+                # Fails fast while the model's circuit is open
+                breaker.before_call(circuit_provider, model.id)
+            attempts += 1
+            try:
+                if limiter is not None:
+                    # Wait for budget before taking a slot, so throttled work never
+                    # holds capacity other providers could use
+                    await limiter.acquire(model, estimate)
+                # Provider slot first, so a saturated provider never holds global slots
+                async with provider_slots, self._global_slots:
+                    generation = await generate(
+                        prompt=prompt,
+                        system_prompt=request.system_prompt,
+                        temperature=request.temperature,
+                        max_tokens=request.max_tokens,
+                    )
+            except asyncio.CancelledError:
+                if breaker is not None:
+                    breaker.release(circuit_provider, model.id)
+                raise
+            except Exception as exc:
+                if breaker is not None:
+                    breaker.record(circuit_provider, model.id, failed=self._is_outage(exc))
+                raise
+            if breaker is not None:
+                breaker.record(
+                    circuit_provider, model.id, failed=False, latency_ms=generation.latency_ms
+                )
+            return generation
+
+        hedge = self.hedge_enabled if request.hedge is None else request.hedge
+        rate_limited = 0
+        retries = 0
+        while True:
+            delay = self.latency.hedge_delay(model.id) if hedge else None
+            try:
+                generation = await (send() if delay is None else hedged(send, delay))
+            except Exception as exc:  # noqa: BLE001
+                if (
+                    limiter is not None
+                    and isinstance(exc, ProviderError)
+                    and exc.status_code == 429
+                ):
+                    limiter.on_rate_limited(model, exc.retry_after)
+                    if rate_limited < self.rate_limit_retries:
+                        rate_limited += 1
+                        continue
+                elif self.retry_policy.retryable(exc) and retries < self.retry_policy.max_retries:
+                    await asyncio.sleep(self.retry_policy.delay(retries, exc))
+                    retries += 1
+                    continue
+                raise CallFailed(exc, attempts) from exc
+            if limiter is not None:
+                limiter.settle(model, estimate, generation.total_tokens)
+            self.latency.record(model.id, generation.latency_ms)
+            generation.attempts = attempts
+            return generation
+
+    def _failed_case(self, case: EvaluationCase, exc: Exception) -> CaseResult:
+        return CaseResult(
+            case_id=case.id,
+            question=case.question,
+            response="",
+            latency_ms=0.0,
+            prompt_tokens=0,
+            completion_tokens=0,
+            total_tokens=0,
+            cost_usd=0.0,
+            scores=CaseScore(accuracy=0.0, hallucination_risk=0.0, safety_risk=0.0),
+            error=str(exc) or type(exc).__name__,
+            attempts=exc.attempts if isinstance(exc, CallFailed) else 1,
+            metadata=case.metadata,
+        )
+
+    def _is_outage(self, exc: BaseException) -> bool:
+        """Errors that say the provider is unhealthy (not bad input or throttling)."""
+        if isinstance(exc, ProviderError) and exc.status_code == 429:
+            return False
+        return self.retry_policy.retryable(exc)
+
+    def _provider_semaphore(self, provider: Provider) -> asyncio.Semaphore:
+        if provider not in self._provider_slots:
+            self._provider_slots[provider] = asyncio.Semaphore(self.provider_concurrency)
+        return self._provider_slots[provider]
 
     def _estimate_cost(self, model: ModelConfig, prompt_tokens: int, completion_tokens: int) -> float:
         prompt_cost = (prompt_tokens / 1000.0) * model.pricing.prompt_per_1k
         completion_cost = (completion_tokens / 1000.0) * model.pricing.completion_per_1k
         return max(0.0, prompt_cost + completion_cost)
 
-    def _summarize(self, results: list[CaseResult]) -> RunSummary:
-        if not results:
-            return RunSummary(
-                avg_accuracy=0.0,
-                avg_hallucination_risk=0.0,
-                avg_safety_risk=0.0,
-                avg_latency_ms=0.0,
-                total_cost_usd=0.0,
-                total_cases=0,
-            )
 
-        return RunSummary(
-            avg_accuracy=round(mean(item.scores.accuracy for item in results), 3),
-            avg_hallucination_risk=round(mean(item.scores.hallucination_risk for item in results), 3),
-            avg_safety_risk=round(mean(item.scores.safety_risk for item in results), 3),
-            avg_latency_ms=round(mean(item.latency_ms for item in results), 2),
-            total_cost_usd=round(math.fsum(item.cost_usd for item in results), 6),
-            total_cases=len(results),
-        )
+def _rounded(value: float | None, ndigits: int) -> float | None:
+    return None if value is None else round(value, ndigits)
@@ -1,4 +1,23 @@
-from app.schemas.evaluation import EvalGateResponse, EvalGateThresholds, RunEvalResponse
+from __future__ import annotations
+
+import math
+import random
+from typing import TYPE_CHECKING
+
+from app.schemas.evaluation import (
+    CaseResult,
+    EvalGateResponse,
+    EvalGateThresholds,
+    MetricBound,
+    RunEvalRequest,
+    RunEvalResponse,
+    SequentialGateOptions,
+    SequentialGateReport,
+)
+from app.services.sequential import SequentialDecision, SequentialGate
+
+if TYPE_CHECKING:
+    from app.services.evaluator import EvaluatorService
 
 
 class EvalGateService:
@@ -18,9 +37,14 @@ class EvalGateService:
                 f"{thresholds.max_hallucination_risk:.3f}"
             )
 
-        if thresholds.max_latency_ms is not None and summary.avg_latency_ms > thresholds.max_latency_ms:
+        # A run without live calls has no latency to hold against the threshold
+        latency = summary.avg_latency_ms
+        if thresholds.max_latency_ms is not None and latency is not None and (
+            latency > thresholds.max_latency_ms
+        ):
             reasons.append(
-                f"avg_latency_ms {summary.avg_latency_ms:.2f} exceeds max_latency_ms {thresholds.max_latency_ms:.2f}"
+                f"avg_latency_ms {latency:.2f} exceeds max_latency_ms "
+                f"{thresholds.max_latency_ms:.2f}"
             )
 
         if thresholds.max_cost_usd is not None and summary.total_cost_usd > thresholds.max_cost_usd:
@@ -28,4 +52,66 @@ class EvalGateService:
                 f"total_cost_usd {summary.total_cost_usd:.6f} exceeds max_cost_usd {thresholds.max_cost_usd:.6f}"
             )
 
+        max_failed = thresholds.max_failed_cases
+        if max_failed is not None and summary.failed_cases > max_failed:
+            reasons.append(
+                f"failed_cases {summary.failed_cases} exceeds max_failed_cases {max_failed}"
+            )
+
         return EvalGateResponse(passed=not reasons, reasons=reasons, run=run)
+
+    async def evaluate_sequential(
+        self,
+        evaluator: EvaluatorService,
+        request: RunEvalRequest,
+        thresholds: EvalGateThresholds,
+        options: SequentialGateOptions,
+    ) -> EvalGateResponse:
+        """Run the gate over randomized batches, stopping once the outcome is settled."""
+        total = len(request.cases)
+        order = list(range(total))
+        random.Random(options.seed).shuffle(order)
+        gate = SequentialGate(
+            thresholds=thresholds,
+            total_cases=total,
+            confidence=options.confidence,
+            batch_size=options.batch_size,
+            min_cases=options.min_cases,
+        )
+        decision: SequentialDecision | None = None
+
+        def stop(results: list[CaseResult]) -> bool:
+            nonlocal decision
+            if len(results) < total:
+                decision = gate.check(results)
+            return decision is not None
+
+        run = await evaluator.run_until(request, order, options.batch_size, stop)
+        if decision is None:
+            # Every case ran: judge the complete run exactly like the fixed-size gate
+            result = self.evaluate(run=run, thresholds=thresholds)
+        else:
+            result = EvalGateResponse(passed=decision.passed, reasons=decision.reasons, run=run)
+
+        evaluated = run.summary.total_cases
+        skipped = total - evaluated
+        per_case_ms = (run.summary.wall_clock_ms or 0.0) / max(1, evaluated)
+        result.sequential = SequentialGateReport(
+            confidence=options.confidence,
+            stopped_early=skipped > 0,
+            cases_evaluated=evaluated,
+            cases_skipped=skipped,
+            estimated_cost_saved_usd=round(
+                run.summary.total_cost_usd / max(1, evaluated) * skipped, 6
+            ),
+            estimated_time_saved_ms=round(per_case_ms * skipped, 2),
+            bounds={
+                name: MetricBound(
+                    estimate=round(bound.estimate, 6),
+                    lower=round(bound.lower, 6),
+                    upper=round(bound.upper, 6) if math.isfinite(bound.upper) else None,
+                )
+                for name, bound in gate.bounds.items()
+            },
+        )
+        return result
@@ -0,0 +1,352 @@
+"""Content-addressed cache for model generations.
+
+Keys are a SHA-256 over everything that determines a generation (provider,
+api_model, system prompt, rendered prompt, temperature, max_tokens). Lookups go
+through a bounded in-memory LRU first, then a local SQLite store that enforces
+a TTL on read and a total-size budget on write.
+
+The disk tier never blocks the event loop: ``get_async`` reads it in a worker
+thread, and writes, expiries and ``accessed_at`` touches are queued for a
+dedicated writer thread that applies everything pending in one transaction
+(group commit), so concurrent cases share one fsync instead of one each.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from app.adapters.base import GenerationResponse, ModelConfig
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationCache:
+    # Eviction trims the disk tier to this share of max_disk_bytes
+    EVICT_TO_FRACTION = 0.9
+
+    def __init__(
+        self,
+        path: Path | None,
+        memory_entries: int = 2048,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_temperature: float = 0.0,
+    ) -> None:
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_temperature = max_temperature
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        # The SQLite connection has its own lock so memory hits never wait on disk
+        self._disk_lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._disk_bytes = 0
+        # Pending disk work for the writer thread, guarded by ``_queued``
+        self._queued = threading.Condition()
+        self._writes: dict[str, tuple[float, str]] = {}
+        self._touches: dict[str, float] = {}
+        self._deletes: set[str] = set()
+        self._flushing = False
+        self._closed = False
+        self._writer: threading.Thread | None = None
+        if path is not None:
+            self._open(path)
+
+    # ------------------------------------------------------------------
+    # Public
+    # ------------------------------------------------------------------
+    def cacheable(self, temperature: float) -> bool:
+        """Only (near-)deterministic generations are worth replaying."""
+        return temperature <= self.max_temperature
+
+    @staticmethod
+    def make_key(
+        model: ModelConfig,
+        system_prompt: str | None,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        material = json.dumps(
+            [str(model.provider), model.api_model, system_prompt, prompt, temperature, max_tokens],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> GenerationResponse | None:
+        """Blocking lookup; inside the event loop use ``get_async``."""
+        start = time.perf_counter()
+        with self._lock:
+            entry = self._memory_get(key)
+        if entry is None:
+            entry = self._disk_get(key)
+        return self._response(entry, start)
+
+    async def get_async(self, key: str) -> GenerationResponse | None:
+        """Memory hits are answered inline; the disk tier is read in a worker thread."""
+        start = time.perf_counter()
+        with self._lock:
+            entry = self._memory_get(key)
+        if entry is None and self._conn is not None:
+            entry = await asyncio.to_thread(self._disk_get, key)
+        return self._response(entry, start)
+
+    def put(self, key: str, response: GenerationResponse) -> None:
+        """Store in memory now; the disk write is queued for the writer thread."""
+        entry = {
+            "text": response.text,
+            "latency_ms": response.latency_ms,
+            "prompt_tokens": response.prompt_tokens,
+            "completion_tokens": response.completion_tokens,
+        }
+        now = time.time()
+        with self._lock:
+            self._memory_put(key, now, entry)
+        if self._conn is not None:
+            with self._queued:
+                self._writes[key] = (now, json.dumps(entry, ensure_ascii=False))
+                self._deletes.discard(key)
+                self._wake_writer()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until queued disk work is committed; False if ``timeout`` expired first."""
+        with self._queued:
+            return self._queued.wait_for(
+                lambda: not (self._flushing or self._has_pending()), timeout=timeout
+            )
+
+    def close(self) -> None:
+        """Commit queued disk work and stop the writer thread."""
+        with self._queued:
+            self._closed = True
+            self._queued.notify_all()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        if self._conn is not None:
+            self._apply_pending()
+            with self._disk_lock:
+                self._conn.close()
+                self._conn = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self._conn is not None:
+            with self._queued:
+                self._writes.clear()
+                self._touches.clear()
+                self._deletes.clear()
+            with self._disk_lock:
+                self._conn.execute("DELETE FROM generations")
+                self._conn.commit()
+                self._disk_bytes = 0
+
+    @staticmethod
+    def _response(entry: dict | None, start: float) -> GenerationResponse | None:
+        if entry is None:
+            return None
+        return GenerationResponse(
+            text=entry["text"],
+            latency_ms=(time.perf_counter() - start) * 1000,
+            prompt_tokens=entry["prompt_tokens"],
+            completion_tokens=entry["completion_tokens"],
+            raw={"cache": "hit", "source_latency_ms": entry["latency_ms"]},
+            cached=True,
+            attempts=0,
+        )
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+    def _memory_get(self, key: str) -> dict | None:
+        item = self._memory.get(key)
+        if item is None:
+            return None
+        created_at, entry = item
+        if self._expired(created_at):
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return entry
+
+    def _memory_put(self, key: str, created_at: float, entry: dict) -> None:
+        self._memory[key] = (created_at, entry)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+    def _open(self, path: Path) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS generations (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_generations_accessed ON generations(accessed_at)"
+            )
+            self._conn.commit()
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM generations").fetchone()
+            self._disk_bytes = int(row[0])
+        except sqlite3.Error:
+            logger.warning("Generation cache: disk tier unavailable at %s", path, exc_info=True)
+            self._conn = None
+
+    def _disk_get(self, key: str) -> dict | None:
+        """Read-only lookup; the expiry or access-time update is queued for the writer."""
+        with self._disk_lock:
+            if self._conn is None:
+                return None
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM generations WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        payload, created_at = row
+        expired = self._expired(created_at)
+        with self._queued:
+            if expired:
+                self._deletes.add(key)
+            else:
+                self._touches[key] = time.time()
+            self._wake_writer()
+        if expired:
+            return None
+        entry = json.loads(payload)
+        with self._lock:
+            self._memory_put(key, created_at, entry)
+        return entry
+
+    def _wake_writer(self) -> None:
+        """Signal queued work; caller holds ``_queued``."""
+        if self._writer is None and not self._closed:
+            self._writer = threading.Thread(
+                target=self._write_loop, name="generation-cache-writer", daemon=True
+            )
+            self._writer.start()
+        self._queued.notify_all()
+
+    def _has_pending(self) -> bool:
+        return bool(self._writes or self._touches or self._deletes)
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._queued:
+                self._queued.wait_for(lambda: self._closed or self._has_pending())
+                if self._closed:
+                    return
+            try:
+                self._apply_pending()
+            except sqlite3.Error:
+                logger.warning("Generation cache: disk write failed", exc_info=True)
+
+    def _apply_pending(self) -> None:
+        """Apply everything queued so far in one transaction."""
+        with self._queued:
+            writes, self._writes = self._writes, {}
+            touches, self._touches = self._touches, {}
+            deletes, self._deletes = self._deletes, set()
+            self._flushing = True
+        try:
+            if writes or touches or deletes:
+                with self._disk_lock:
+                    if self._conn is not None:
+                        self._commit(writes, touches, deletes)
+        finally:
+            with self._queued:
+                self._flushing = False
+                self._queued.notify_all()
+
+    def _commit(
+        self, writes: dict[str, tuple[float, str]], touches: dict[str, float], deletes: set[str]
+    ) -> None:
+        assert self._conn is not None
+        disk_bytes = self._disk_bytes
+        try:
+            self._write_batch(writes, touches, deletes)
+            self._conn.commit()
+        except sqlite3.Error:
+            self._conn.rollback()
+            self._disk_bytes = disk_bytes
+            raise
+
+    def _write_batch(
+        self, writes: dict[str, tuple[float, str]], touches: dict[str, float], deletes: set[str]
+    ) -> None:
+        assert self._conn is not None
+        # Replaced or deleted rows give their bytes back to the budget
+        for key in [*writes, *deletes]:
+            row = self._conn.execute(
+                "SELECT size FROM generations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._disk_bytes -= row[0]
+        self._conn.executemany(
+            "DELETE FROM generations WHERE key = ?", [(key,) for key in deletes]
+        )
+        rows = []
+        for key, (created_at, payload) in writes.items():
+            size = len(payload.encode("utf-8"))
+            rows.append((key, payload, size, created_at, created_at))
+            self._disk_bytes += size
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO generations (key, payload, size, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        self._conn.executemany(
+            "UPDATE generations SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in touches.items() if key not in writes],
+        )
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop expired rows, then least-recently-used rows down to the low-water mark.
+
+        Trimming below the budget leaves headroom, so the next group commits fit
+        without another full scan.
+        """
+        assert self._conn is not None
+        self._conn.execute(
+            "DELETE FROM generations WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+        )
+        rows = self._conn.execute(
+            "SELECT key, size FROM generations ORDER BY accessed_at DESC"
+        ).fetchall()
+        target = self.max_disk_bytes * self.EVICT_TO_FRACTION
+        kept = 0
+        stale: list[tuple[str]] = []
+        for key, size in rows:
+            if kept + size <= target:
+                kept += size
+            else:
+                stale.append((key,))
+        self._conn.executemany("DELETE FROM generations WHERE key = ?", stale)
+        self._disk_bytes = kept
+
+    def _expired(self, created_at: float) -> bool:
+        return time.time() - created_at > self.ttl_seconds
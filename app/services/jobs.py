@@ -0,0 +1,370 @@
+"""Background job queue for long evaluation runs.
+
+Submitting a benchmark, task or compare run returns a job id immediately and a
+bounded pool of in-process workers executes jobs in submission order. Job
+state lives in a local SQLite table, so jobs that were still queued (or cut off
+mid-run) when the process stopped are picked up again on the next start. A job
+records its run ids as the runs start; one cut off mid-run resumes those runs
+from their checkpoints instead of re-running every case.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+from app.schemas.evaluation import (
+    CompareRequest,
+    JobInfo,
+    RunBenchmarkRequest,
+    RunEvalRequest,
+    RunEvalResponse,
+    RunTaskRequest,
+)
+
+if TYPE_CHECKING:
+    from app.services.benchmark import BenchmarkService
+    from app.services.db_store import DBStore
+    from app.services.evaluator import EvaluatorService, ProgressCallback
+    from app.services.task_recommender import TaskRecommender
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("benchmark", "task", "compare")
+
+# Receives every job state change, e.g. ConnectionManager.broadcast
+Notifier = Callable[[dict], Awaitable[None]]
+
+
+class JobService:
+    # Minimum seconds between progress pushes for one job
+    PROGRESS_INTERVAL = 0.25
+    # Minimum seconds between progress writes to the job table for one job
+    PERSIST_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        path: Path,
+        evaluator: EvaluatorService,
+        benchmark_service: BenchmarkService,
+        task_recommender: TaskRecommender,
+        db_store: DBStore | None = None,
+        workers: int = 2,
+        notify: Notifier | None = None,
+    ) -> None:
+        self.evaluator = evaluator
+        self.benchmark_service = benchmark_service
+        self.task_recommender = task_recommender
+        self.db_store = db_store
+        self.workers = workers
+        self.notify = notify
+        self._active: dict[str, JobInfo] = {}
+        self._queue: asyncio.Queue[str] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._pushes: set[asyncio.Task] = set()
+        # Progress writes in flight (at most one per job) and jobs changed since it began
+        self._writes: dict[str, asyncio.Task] = {}
+        self._dirty: set[str] = set()
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                info TEXT NOT NULL,
+                seq INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, seq)")
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Public
+    # ------------------------------------------------------------------
+    async def submit(self, kind: str, payload: BaseModel) -> JobInfo:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}. Available: {list(JOB_KINDS)}")
+        job = JobInfo(
+            job_id=str(uuid.uuid4()),
+            kind=kind,
+            status="queued",
+            created_at=_now(),
+        )
+        await asyncio.to_thread(
+            self._insert, job.job_id, kind, payload.model_dump_json(), job.model_dump_json()
+        )
+        if self._queue is not None:
+            self._queue.put_nowait(job.job_id)
+        await self._publish(job)
+        return job
+
+    def get(self, job_id: str) -> JobInfo:
+        if job_id in self._active:
+            return self._active[job_id].model_copy()
+        with self._lock:
+            row = self._conn.execute("SELECT info FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown job_id: {job_id}")
+        return JobInfo.model_validate_json(row[0])
+
+    def list_jobs(self, status: str | None = None, limit: int = 50) -> list[JobInfo]:
+        query = "SELECT job_id, info FROM jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self._conn.execute(f"{query} ORDER BY seq DESC LIMIT ?", (*params, limit))
+            rows = rows.fetchall()
+        return [
+            self._active[job_id].model_copy() if job_id in self._active
+            else JobInfo.model_validate_json(info)
+            for job_id, info in rows
+        ]
+
+    async def start(self) -> None:
+        """Requeue unfinished jobs from a previous process and start the workers."""
+        self._queue = asyncio.Queue()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, info FROM jobs WHERE status IN ('queued', 'running') ORDER BY seq"
+            ).fetchall()
+        for job_id, info in rows:
+            job = JobInfo.model_validate_json(info)
+            if job.status == "running":
+                # Interrupted mid-run: requeue, keeping run_ids so the runs resume
+                job = job.model_copy(update={"status": "queued", "started_at": None})
+                await self._save(job)
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(
+            *self._tasks, *self._pushes, *self._writes.values(), return_exceptions=True
+        )
+        self._tasks = []
+        self._queue = None
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._execute(job_id)
+            except Exception:  # noqa: BLE001
+                logger.exception("Jobs: worker crashed on job %s", job_id)
+
+    async def _execute(self, job_id: str) -> None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, info FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return
+        payload = json.loads(row[0])
+        job = JobInfo.model_validate_json(row[1])
+        if job.status != "queued":
+            return
+
+        job.status = "running"
+        job.started_at = _now()
+        self._active[job_id] = job
+        await self._save(job)
+        await self._publish(job)
+
+        runs_progress: dict[str, tuple[int, int]] = {}
+        last_push = last_write = 0.0
+
+        def progress(run_id: str, completed: int, total: int) -> None:
+            nonlocal last_push, last_write
+            started = run_id not in job.run_ids
+            if started:
+                job.run_ids.append(run_id)
+            runs_progress[run_id] = (completed, total)
+            job.completed = sum(done for done, _ in runs_progress.values())
+            job.total = max(job.total, sum(size for _, size in runs_progress.values()))
+            now = time.monotonic()
+            # A new run id is written at once: it is what a restart resumes from
+            if started or now - last_write >= self.PERSIST_INTERVAL:
+                last_write = now
+                self._schedule_write(job)
+            if started or now - last_push >= self.PROGRESS_INTERVAL:
+                last_push = now
+                self._schedule_publish(job)
+
+        try:
+            if job.kind == "compare":
+                # Every model runs the same cases, so the total is known up front
+                job.total = len(payload["cases"]) * len(payload["model_ids"])
+            runs = await self._resume(job, payload, progress) if job.run_ids else None
+            if runs is None:
+                runs = await self._run(job, payload, progress)
+        except Exception as exc:  # noqa: BLE001
+            job.status = "failed"
+            job.error = str(exc) or type(exc).__name__
+        else:
+            for run in runs:
+                if self.db_store is not None:
+                    await self.db_store.save_async(run)
+            job.status = "succeeded"
+            job.run_ids = [run.run_id for run in runs]
+            job.completed = job.total
+        job.finished_at = _now()
+        await self._save(job)
+        self._active.pop(job_id, None)
+        await self._publish(job)
+
+    async def _resume(
+        self, job: JobInfo, payload: dict, progress: ProgressCallback
+    ) -> list[RunEvalResponse] | None:
+        """Finish the runs an interrupted job started; None if it has to start over."""
+        store = self.evaluator.run_store
+        expected = len(payload["model_ids"]) if job.kind == "compare" else 1
+        if store is None or len(job.run_ids) != expected:
+            # Some run never started (or was not recorded): nothing to resume from
+            return self._restart(job)
+
+        finished: dict[str, RunEvalResponse] = {}
+        for run_id in job.run_ids:
+            try:
+                finished[run_id] = store.get_run(run_id)  # done before the interruption
+            except KeyError:
+                try:
+                    store.load_checkpoint(run_id)
+                except KeyError:
+                    logger.warning(
+                        "Jobs: run %s of job %s is gone – starting over", run_id, job.job_id
+                    )
+                    return self._restart(job)
+        resumed = await asyncio.gather(
+            *(
+                self.evaluator.resume(run_id, progress)
+                for run_id in job.run_ids
+                if run_id not in finished
+            )
+        )
+        by_id = finished | {run.run_id: run for run in resumed}
+        return [by_id[run_id] for run_id in job.run_ids]
+
+    def _restart(self, job: JobInfo) -> None:
+        store = self.evaluator.run_store
+        if store is not None:
+            for run_id in job.run_ids:
+                store.discard_checkpoint(run_id)
+        job.run_ids = []
+        job.completed = 0
+
+    async def _run(
+        self, job: JobInfo, payload: dict, progress: ProgressCallback
+    ) -> list[RunEvalResponse]:
+        if job.kind == "benchmark":
+            request = RunBenchmarkRequest.model_validate(payload)
+            run = await self.benchmark_service.run_benchmark(
+                name=request.benchmark,
+                **request.model_dump(exclude={"benchmark"}),
+                progress=progress,
+            )
+            return [run]
+        if job.kind == "task":
+            request = RunTaskRequest.model_validate(payload)
+            _, run = await self.task_recommender.run_task_evaluation(
+                **request.model_dump(), progress=progress
+            )
+            return [run]
+        request = CompareRequest.model_validate(payload)
+        run_request = RunEvalRequest(model_id=None, **request.model_dump(exclude={"model_ids"}))
+        runs, job.errors = await self.evaluator.compare(
+            request.model_ids, run_request, progress
+        )
+        return runs
+
+    # ------------------------------------------------------------------
+    # Persistence / notifications
+    # ------------------------------------------------------------------
+    def _insert(self, job_id: str, kind: str, payload: str, info: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, status, payload, info, seq) "
+                "VALUES (?, ?, 'queued', ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM jobs))",
+                (job_id, kind, payload, info),
+            )
+            self._conn.commit()
+
+    def _write(self, job_id: str, status: str, info: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, info = ? WHERE job_id = ?", (status, info, job_id)
+            )
+            self._conn.commit()
+
+    async def _save(self, job: JobInfo) -> None:
+        """Write ``job`` off the loop, after any progress write still in flight."""
+        pending = self._writes.get(job.job_id)
+        if pending is not None:
+            await asyncio.gather(pending, return_exceptions=True)
+        # Serialized here: the loop keeps mutating ``job`` while the thread writes
+        await asyncio.to_thread(self._write, job.job_id, job.status, job.model_dump_json())
+
+    def _schedule_write(self, job: JobInfo) -> None:
+        """Write ``job`` in the background from a sync callback; one write per job at a time."""
+        current = self._writes.get(job.job_id)
+        if current is not None and not current.done():
+            # The in-flight write picks up the latest state when it finishes
+            self._dirty.add(job.job_id)
+            return
+        self._writes[job.job_id] = asyncio.get_running_loop().create_task(self._write_latest(job))
+
+    async def _write_latest(self, job: JobInfo) -> None:
+        try:
+            while True:
+                self._dirty.discard(job.job_id)
+                await asyncio.to_thread(
+                    self._write, job.job_id, job.status, job.model_dump_json()
+                )
+                if job.job_id not in self._dirty:
+                    return
+        except Exception:  # noqa: BLE001
+            logger.warning("Jobs: failed to save progress of %s", job.job_id, exc_info=True)
+        finally:
+            if self._writes.get(job.job_id) is asyncio.current_task():
+                del self._writes[job.job_id]
+
+    def _schedule_publish(self, job: JobInfo) -> None:
+        task = asyncio.get_running_loop().create_task(self._publish(job.model_copy()))
+        self._pushes.add(task)
+        task.add_done_callback(self._pushes.discard)
+
+    async def _publish(self, job: JobInfo) -> None:
+        if self.notify is None:
+            return
+        try:
+            await self.notify({"event": "job_update", **job.model_dump()})
+        except Exception:  # noqa: BLE001
+            logger.warning("Jobs: failed to push update for %s", job.job_id, exc_info=True)
+
+
+def _now() -> str:
+    return datetime.now(tz=UTC).isoformat()
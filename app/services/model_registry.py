@@ -3,9 +3,10 @@ from pathlib import Path
 import yaml
 
 from app.adapters.anthropic_adapter import AnthropicAdapter
-from app.adapters.base import BaseAdapter, ModelConfig, Pricing, Provider
+from app.adapters.base import BaseAdapter, ModelConfig, Pricing, Provider, RateLimits
 from app.adapters.cohere_adapter import CohereAdapter
 from app.adapters.google_adapter import GoogleAdapter
+from app.adapters.http_pool import HTTPClientPool
 from app.adapters.mock_adapter import MockAdapter
 from app.adapters.openai_adapter import OpenAIAdapter
 from app.adapters.openrouter_adapter import OpenRouterAdapter
@@ -13,10 +14,12 @@ from app.core.config import Settings
 
 
 class ModelRegistry:
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, http_pool: HTTPClientPool | None = None) -> None:
         self.settings = settings
+        self.http_pool = http_pool
         self.default_model_id: str = ""
         self.models: dict[str, ModelConfig] = {}
+        self.provider_limits: dict[Provider, RateLimits] = {}
         self._load_from_yaml(settings.models_path)
 
     def _load_from_yaml(self, path: Path) -> None:
@@ -26,12 +29,16 @@ class ModelRegistry:
         payload = yaml.safe_load(path.read_text(encoding="utf-8"))
         self.default_model_id = payload["default_model"]
 
+        for name, item in (payload.get("providers") or {}).items():
+            self.provider_limits[Provider(name)] = _rate_limits(item.get("rate_limits"))
+
         for item in payload.get("models", []):
             provider = Provider(item["provider"])
             pricing_cfg = item.get("pricing", {})
             pricing = Pricing(
                 prompt_per_1k=float(pricing_cfg.get("prompt_per_1k", 0.0)),
                 completion_per_1k=float(pricing_cfg.get("completion_per_1k", 0.0)),
+                batch_discount=float(pricing_cfg.get("batch_discount", 0.5)),
             )
             model = ModelConfig(
                 id=item["id"],
@@ -39,6 +46,7 @@ class ModelRegistry:
                 api_model=item["api_model"],
                 enabled=bool(item.get("enabled", True)),
                 pricing=pricing,
+                rate_limits=_rate_limits(item.get("rate_limits")),
             )
             self.models[model.id] = model
 
@@ -56,6 +64,10 @@ class ModelRegistry:
                     "prompt_per_1k": model.pricing.prompt_per_1k,
                     "completion_per_1k": model.pricing.completion_per_1k,
                 },
+                "rate_limits": {
+                    "rpm": model.rate_limits.rpm,
+                    "tpm": model.rate_limits.tpm,
+                },
             }
             for model in self.models.values()
         ]
@@ -74,15 +86,35 @@ class ModelRegistry:
     def get_adapter(self, model_id: str) -> BaseAdapter:
         model = self.get_model(model_id)
         if model.provider == Provider.OPENAI:
-            return OpenAIAdapter(model=model, api_key=self.settings.openai_api_key)
+            return OpenAIAdapter(
+                model=model, api_key=self.settings.openai_api_key, http_pool=self.http_pool
+            )
         if model.provider == Provider.ANTHROPIC:
-            return AnthropicAdapter(model=model, api_key=self.settings.anthropic_api_key)
+            return AnthropicAdapter(
+                model=model, api_key=self.settings.anthropic_api_key, http_pool=self.http_pool
+            )
         if model.provider == Provider.GOOGLE:
-            return GoogleAdapter(model=model, api_key=self.settings.google_api_key)
+            return GoogleAdapter(
+                model=model, api_key=self.settings.google_api_key, http_pool=self.http_pool
+            )
         if model.provider == Provider.COHERE:
-            return CohereAdapter(model=model, api_key=self.settings.cohere_api_key)
+            return CohereAdapter(
+                model=model, api_key=self.settings.cohere_api_key, http_pool=self.http_pool
+            )
         if model.provider == Provider.OPENROUTER:
-            return OpenRouterAdapter(model=model, api_key=self.settings.openrouter_api_key)
+            return OpenRouterAdapter(
+                model=model, api_key=self.settings.openrouter_api_key, http_pool=self.http_pool
+            )
         if model.provider == Provider.MOCK:
             return MockAdapter(model=model)
         raise ValueError(f"Unsupported provider: {model.provider}")
+
+
+def _rate_limits(cfg: dict | None) -> RateLimits:
+    cfg = cfg or {}
+    rpm = cfg.get("rpm")
+    tpm = cfg.get("tpm")
+    return RateLimits(
+        rpm=float(rpm) if rpm is not None else None,
+        tpm=float(tpm) if tpm is not None else None,
+    )
@@ -0,0 +1,147 @@
+"""Process-wide async rate limiting for provider calls.
+
+Providers and models can declare requests-per-minute and tokens-per-minute
+limits in ``config/models.yaml``; each becomes a token bucket, and a call is
+only sent once it fits in every bucket of its model and provider. Rates adapt
+AIMD-style: a 429 halves the effective rate of both scopes and pauses them for
+the Retry-After period, and every success adds back a small slice of the
+configured rate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.adapters.base import ModelConfig, Provider, RateLimits
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, burst_seconds: float) -> None:
+        self.limit = per_minute / 60.0
+        self.rate = self.limit
+        self.capacity = max(1.0, self.limit * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` fits; 0 when it can be taken now."""
+        self._refill(now)
+        # Oversized calls are let through from a full bucket and leave it in debt
+        needed = min(amount, self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= amount
+
+    def credit(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def drain(self, now: float) -> None:
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class AdaptiveLimit:
+    """RPM/TPM buckets for one provider or model, scaled by an AIMD factor."""
+
+    def __init__(self, limits: RateLimits, burst_seconds: float) -> None:
+        self.requests = TokenBucket(limits.rpm, burst_seconds) if limits.rpm else None
+        self.tokens = TokenBucket(limits.tpm, burst_seconds) if limits.tpm else None
+        self.factor = 1.0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+
+    @property
+    def buckets(self) -> list[tuple[TokenBucket, bool]]:
+        """(bucket, counts_tokens) pairs for the configured limits."""
+        pairs: list[tuple[TokenBucket, bool]] = []
+        if self.requests is not None:
+            pairs.append((self.requests, False))
+        if self.tokens is not None:
+            pairs.append((self.tokens, True))
+        return pairs
+
+    def wait_time(self, tokens: float, now: float) -> float:
+        wait = max(0.0, self.paused_until - now)
+        for bucket, counts_tokens in self.buckets:
+            wait = max(wait, bucket.wait_time(tokens if counts_tokens else 1, now))
+        return wait
+
+    def take(self, tokens: float) -> None:
+        for bucket, counts_tokens in self.buckets:
+            bucket.take(tokens if counts_tokens else 1)
+
+    def scale(self, factor: float) -> None:
+        self.factor = factor
+        for bucket, _ in self.buckets:
+            bucket.rate = bucket.limit * factor
+
+
+class RateLimiter:
+    # Bucket capacity, in seconds of the configured rate
+    BURST_SECONDS = 10.0
+    DECREASE_FACTOR = 0.5
+    MIN_FACTOR = 0.05
+    RECOVERY_STEP = 0.02
+    # 429s from requests already in flight are one congestion signal, not many
+    DECREASE_COOLDOWN = 1.0
+    # Pause applied when a 429 carries no Retry-After
+    DEFAULT_BACKOFF = 1.0
+
+    def __init__(self, provider_limits: dict[Provider, RateLimits] | None = None) -> None:
+        self.provider_limits = provider_limits or {}
+        self._scopes: dict[tuple[str, str], AdaptiveLimit] = {}
+
+    @staticmethod
+    def estimate_tokens(prompt: str, system_prompt: str | None, max_tokens: int) -> int:
+        """Rough TPM charge before the call: ~4 characters per prompt token plus max_tokens."""
+        chars = len(prompt) + len(system_prompt or "")
+        return chars // 4 + 1 + max_tokens
+
+    async def acquire(self, model: ModelConfig, tokens: int) -> None:
+        """Wait until one request of ``tokens`` fits the model and provider budgets."""
+        scopes = self._scopes_for(model)
+        while True:
+            now = time.monotonic()
+            wait = max(scope.wait_time(tokens, now) for scope in scopes)
+            if wait <= 0:
+                for scope in scopes:
+                    scope.take(tokens)
+                return
+            await asyncio.sleep(wait)
+
+    def settle(self, model: ModelConfig, estimated: int, actual: int) -> None:
+        """Refund (or charge) the estimate error and nudge the rate back up."""
+        for scope in self._scopes_for(model):
+            if scope.tokens is not None and actual:
+                scope.tokens.credit(estimated - actual)
+            if scope.factor < 1.0:
+                scope.scale(min(1.0, scope.factor + self.RECOVERY_STEP))
+
+    def on_rate_limited(self, model: ModelConfig, retry_after: float | None) -> None:
+        now = time.monotonic()
+        pause = retry_after if retry_after is not None else self.DEFAULT_BACKOFF
+        for scope in self._scopes_for(model):
+            scope.paused_until = max(scope.paused_until, now + pause)
+            if now - scope.last_decrease >= self.DECREASE_COOLDOWN:
+                scope.last_decrease = now
+                scope.scale(max(self.MIN_FACTOR, scope.factor * self.DECREASE_FACTOR))
+                for bucket, _ in scope.buckets:
+                    bucket.drain(now)
+
+    def _scopes_for(self, model: ModelConfig) -> tuple[AdaptiveLimit, AdaptiveLimit]:
+        model_key = ("model", model.id)
+        provider_key = ("provider", str(model.provider))
+        if model_key not in self._scopes:
+            self._scopes[model_key] = AdaptiveLimit(model.rate_limits, self.BURST_SECONDS)
+        if provider_key not in self._scopes:
+            limits = self.provider_limits.get(model.provider, RateLimits())
+            self._scopes[provider_key] = AdaptiveLimit(limits, self.BURST_SECONDS)
+        return self._scopes[model_key], self._scopes[provider_key]
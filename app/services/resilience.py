@@ -0,0 +1,123 @@
+"""Retry and hedging policies for provider calls.
+
+Transient failures (timeouts, connection errors, 5xx and friends) are retried
+with exponential backoff and full jitter. Hedging fires a duplicate request
+once the first one has run longer than the model's recent p95 latency and
+keeps whichever answers first, which trims the tail of long runs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+import httpx
+
+from app.adapters.base import ProviderError
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+TRANSPORT_ERRORS = (
+    httpx.TimeoutException,
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+    TimeoutError,
+)
+
+
+class CallFailed(Exception):
+    """Final error of a provider call, with how many requests were sent."""
+
+    def __init__(self, error: BaseException, attempts: int) -> None:
+        super().__init__(str(error) or type(error).__name__)
+        self.error = error
+        self.attempts = attempts
+
+
+@dataclass(slots=True)
+class RetryPolicy:
+    max_retries: int = 2
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def retryable(self, exc: BaseException) -> bool:
+        """True for errors worth another attempt, looking through wrapped causes."""
+        seen: BaseException | None = exc
+        while seen is not None:
+            if isinstance(seen, ProviderError) and seen.status_code is not None:
+                return seen.status_code in RETRYABLE_STATUS
+            if isinstance(seen, TRANSPORT_ERRORS):
+                return True
+            seen = seen.__cause__
+        return False
+
+    def delay(self, retry: int, exc: BaseException) -> float:
+        """Full-jitter exponential backoff, never shorter than a Retry-After hint."""
+        ceiling = min(self.max_delay, self.base_delay * (2**retry))
+        delay = random.uniform(0, ceiling)
+        if isinstance(exc, ProviderError) and exc.retry_after is not None:
+            delay = max(delay, min(exc.retry_after, self.max_delay))
+        return delay
+
+
+class LatencyTracker:
+    """Sliding window of recent live latencies per model, for hedge delays."""
+
+    def __init__(
+        self,
+        window: int = 200,
+        min_samples: int = 20,
+        quantile: float = 0.95,
+        min_delay_ms: float = 250.0,
+    ) -> None:
+        self.window = window
+        self.min_samples = min_samples
+        self.quantile = quantile
+        self.min_delay_ms = min_delay_ms
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, model_id: str, latency_ms: float) -> None:
+        if model_id not in self._samples:
+            self._samples[model_id] = deque(maxlen=self.window)
+        self._samples[model_id].append(latency_ms)
+
+    def hedge_delay(self, model_id: str) -> float | None:
+        """Seconds to wait before hedging, or None until enough samples exist."""
+        samples = self._samples.get(model_id)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        rank = min(len(ordered) - 1, int(self.quantile * len(ordered)))
+        return max(self.min_delay_ms, ordered[rank]) / 1000
+
+
+async def hedged(send: Callable[[], Awaitable[T]], delay: float) -> T:
+    """Run ``send``; if it has not finished after ``delay`` seconds, race a second copy.
+
+    The first successful result wins and the other request is cancelled. If
+    both fail, the first error is raised.
+    """
+    tasks = [asyncio.ensure_future(send())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            tasks.append(asyncio.ensure_future(send()))
+        pending = set(tasks)
+        first_error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                first_error = first_error or task.exception()
+        assert first_error is not None
+        raise first_error
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
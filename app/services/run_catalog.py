@@ -0,0 +1,242 @@
+"""SQLite catalog of stored runs.
+
+One row per run artifact holds the run header (ids, versions, summary) plus
+indexed filter columns, so listing, filtering and sorting runs is a single
+indexed query that never opens an artifact file. ``RunStore`` keeps the catalog
+in step on every ``save``; ``rebuild`` re-derives it from the artifacts.
+
+Unfinished runs are indexed too (``status = 'incomplete'``, artifact pointing at
+the checkpoint) and their row is refreshed as cases land, so listings include
+them without reading checkpoints. The catalog is derived data, so commits are
+not fsynced (WAL, ``synchronous=NORMAL``).
+
+Every row carries ``seq``, a catalog-wide sequence number assigned when a run is
+first indexed or changes status (i.e. when it is saved as finished). It only
+grows, in commit order, so incremental consumers (Parquet export, case
+analytics) page on it and never miss a run saved late or out of ``created_at``
+order. Re-indexing an unchanged run (compaction, rebuild) keeps its ``seq``.
+``catalog_id`` identifies this catalog file, so a consumer can tell that its
+``seq`` watermark belongs to a catalog that has since been recreated.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+from app.schemas.evaluation import RunHeader
+
+
+def normalize_timestamp(value: str) -> str:
+    """An ISO 8601 filter bound in the form ``created_at`` is stored in (UTC isoformat).
+
+    ``created_at`` is compared as text, so a bound with another offset, a ``Z``
+    suffix or no time part would otherwise sort wrongly. Naive values are taken
+    as UTC. Raises ValueError on anything ``datetime.fromisoformat`` rejects.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise ValueError(f"Invalid ISO timestamp: {value!r}") from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.astimezone(UTC).isoformat()
+
+
+class RunCatalog:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                artifact TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                dataset_version TEXT NOT NULL,
+                header TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'complete',
+                seq INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(runs)")}
+        if "status" not in columns:
+            # Catalog from before incomplete runs were indexed
+            self._conn.execute(
+                "ALTER TABLE runs ADD COLUMN status TEXT NOT NULL DEFAULT 'complete'"
+            )
+        if "seq" not in columns:
+            # Catalog from before insert sequencing: number existing rows in insert order
+            self._conn.execute("ALTER TABLE runs ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("UPDATE runs SET seq = rowid")
+        self._conn.execute(
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('catalog_id', ?)", (uuid.uuid4().hex,)
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO meta (key, value) "
+            "VALUES ('last_seq', (SELECT COALESCE(MAX(seq), 0) FROM runs))"
+        )
+        self.catalog_id: str = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'catalog_id'"
+        ).fetchone()[0]
+        self._last_seq = int(
+            self._conn.execute("SELECT value FROM meta WHERE key = 'last_seq'").fetchone()[0]
+        )
+        for column in ("model_id", "prompt_version", "dataset_version"):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_runs_{column} ON runs({column}, created_at)"
+            )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_seq ON runs(status, seq)")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def add(self, header: RunHeader, artifact: str) -> None:
+        with self._lock:
+            self._insert(header, artifact)
+            self._commit()
+
+    def add_many(self, entries: list[tuple[RunHeader, str]]) -> None:
+        with self._lock:
+            for header, artifact in entries:
+                self._insert(header, artifact)
+            self._commit()
+
+    def replace_all(self, entries: list[tuple[RunHeader, str]]) -> None:
+        """Make the catalog hold exactly ``entries``; runs already indexed keep their seq."""
+        with self._lock:
+            for header, artifact in entries:
+                self._insert(header, artifact)
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep (run_id TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM keep")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO keep VALUES (?)", [(header.run_id,) for header, _ in entries]
+            )
+            self._conn.execute("DELETE FROM runs WHERE run_id NOT IN (SELECT run_id FROM keep)")
+            self._commit()
+
+    def remove_incomplete(self, run_id: str) -> None:
+        """Drop the run's row unless it has been finished in the meantime."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM runs WHERE run_id = ? AND status = 'incomplete'", (run_id,)
+            )
+            self._conn.commit()
+
+    def remove_prefix(self, prefix: str) -> int:
+        """Drop every run whose artifact reference starts with ``prefix``."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM runs WHERE substr(artifact, 1, ?) = ?", (len(prefix), prefix)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def query(
+        self,
+        run_id: str | None = None,
+        model_id: str | None = None,
+        prompt_version: str | None = None,
+        dataset_version: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        newest_first: bool = True,
+        limit: int = 200,
+        status: str | None = "complete",
+    ) -> list[tuple[RunHeader, str]]:
+        """Matching (header, artifact) pairs ordered by created_at.
+
+        Only finished runs by default; ``status=None`` includes unfinished ones.
+        Raises ValueError when ``since``/``until`` is not an ISO timestamp.
+        """
+        clauses: list[str] = []
+        params: list[object] = []
+        for column, value in (
+            ("status", status),
+            ("run_id", run_id),
+            ("model_id", model_id),
+            ("prompt_version", prompt_version),
+            ("dataset_version", dataset_version),
+        ):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(normalize_timestamp(since))
+        if until:
+            clauses.append("created_at < ?")
+            params.append(normalize_timestamp(until))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "DESC" if newest_first else "ASC"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT header, artifact FROM runs{where} "
+                f"ORDER BY created_at {order}, run_id {order} LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [(RunHeader.model_validate_json(header), artifact) for header, artifact in rows]
+
+    def after_seq(self, seq: int, limit: int = 200) -> list[tuple[int, RunHeader, str]]:
+        """Finished runs with a seq above ``seq`` as (seq, header, artifact), in seq order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, header, artifact FROM runs WHERE status = 'complete' AND seq > ? "
+                "ORDER BY seq LIMIT ?",
+                (seq, limit),
+            ).fetchall()
+        return [
+            (row_seq, RunHeader.model_validate_json(header), artifact)
+            for row_seq, header, artifact in rows
+        ]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _commit(self) -> None:
+        self._conn.execute(
+            "UPDATE meta SET value = ? WHERE key = 'last_seq'", (str(self._last_seq),)
+        )
+        self._conn.commit()
+
+    def _insert(self, header: RunHeader, artifact: str) -> None:
+        # A new run, or one whose status changed, takes the next seq; others keep theirs
+        cursor = self._conn.execute(
+            "INSERT INTO runs (run_id, artifact, created_at, model_id, prompt_version, "
+            "dataset_version, header, status, seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (run_id) DO UPDATE SET artifact = excluded.artifact, "
+            "created_at = excluded.created_at, model_id = excluded.model_id, "
+            "prompt_version = excluded.prompt_version, "
+            "dataset_version = excluded.dataset_version, header = excluded.header, "
+            "status = excluded.status, "
+            "seq = CASE WHEN runs.status = excluded.status THEN runs.seq ELSE excluded.seq END "
+            "RETURNING seq",
+            (
+                header.run_id,
+                artifact,
+                header.created_at or "",
+                header.model_id,
+                header.version_info.prompt_version,
+                header.version_info.dataset_version,
+                header.model_dump_json(),
+                header.status,
+                self._last_seq + 1,
+            ),
+        )
+        if cursor.fetchone()[0] == self._last_seq + 1:
+            self._last_seq += 1
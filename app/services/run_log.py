@@ -0,0 +1,352 @@
+"""Segmented append-only run log: a ``RunStore`` backend for busy deployments.
+
+Instead of two files per run, finished runs are appended to size-capped segment
+files partitioned by UTC day (``segments/<YYYY-MM-DD>/<NNNNNN>.seg``). Each record
+is a fixed prelude (magic, header length, cases length, CRC32) followed by the
+codec-encoded header and per-case results, so a header can be read without the
+cases. The run catalog doubles as the offset index: a run's artifact reference is
+``segments/<day>/<segment>@<offset>``, which keeps lookups by run_id and
+reverse-chronological scans in SQLite regardless of how much history exists.
+
+``compact`` (run periodically in the background) merges the small segments of past
+days into full ones and drops day partitions older than the retention window.
+A torn or corrupt record (crash mid-append) is skipped: readers resync on the next
+record magic, the writer truncates a torn tail before appending to a segment it has
+not written to yet, and compaction only deletes a source segment once every record
+it held is verified in the merged output (damaged segments are kept aside as
+``.seg.corrupt`` for inspection).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import shutil
+import struct
+import threading
+import zlib
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from app.core.config import Settings
+from app.schemas.evaluation import CaseResult, RunEvalResponse, RunHeader
+from app.services.artifact_codec import decode_cases, decode_header, trusted_case
+from app.services.run_store import RunStore
+
+logger = logging.getLogger(__name__)
+
+RECORD = struct.Struct(">4sIII")  # magic, header bytes, cases bytes, crc32
+RECORD_MAGIC = b"RLG1"
+
+
+@dataclass(slots=True)
+class CompactionStats:
+    segments_merged: int = 0
+    segments_written: int = 0
+    days_expired: int = 0
+    runs_expired: int = 0
+
+
+class SegmentedRunStore(RunStore):
+    def __init__(
+        self,
+        artifact_dir: Path,
+        catalog_path: Path | None = None,
+        codec: str = "json",
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        retention_days: int = 0,
+        compaction_interval: float = 3600.0,
+        checkpoint_ttl: float = 0.0,
+    ) -> None:
+        self.segment_dir = artifact_dir / "segments"
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.retention_days = retention_days
+        self.compaction_interval = compaction_interval
+        self._lock = threading.Lock()
+        self._tail_checked: set[Path] = set()
+        self._compactor: asyncio.Task | None = None
+        super().__init__(
+            artifact_dir, catalog_path=catalog_path, codec=codec, checkpoint_ttl=checkpoint_ttl
+        )
+
+    def save(self, run: RunEvalResponse) -> Path:
+        header = run.header()
+        if not header.created_at:
+            header = header.model_copy(update={"created_at": datetime.now(tz=UTC).isoformat()})
+        record = self._encode_record(
+            self.codec.encode_header(header.model_dump(mode="json")),
+            self.codec.encode_cases([result.model_dump(mode="json") for result in run.results]),
+        )
+        day = datetime.now(tz=UTC).strftime("%Y-%m-%d")
+        with self._lock:
+            segment = self._active_segment(day, len(record))
+            with segment.open("ab") as handle:
+                offset = handle.tell()
+                handle.write(record)
+            self.catalog.add(header, self._ref(segment, offset))
+        return segment
+
+    async def start(self) -> None:
+        await super().start()
+        self._compactor = asyncio.create_task(self._compaction_loop())
+
+    async def stop(self) -> None:
+        if self._compactor is not None:
+            self._compactor.cancel()
+            await asyncio.gather(self._compactor, return_exceptions=True)
+            self._compactor = None
+        await super().stop()
+
+    def compact(self, now: datetime | None = None) -> CompactionStats:
+        """Merge small segments of past days and expire days beyond retention."""
+        now = now or datetime.now(tz=UTC)
+        today = now.strftime("%Y-%m-%d")
+        cutoff = (
+            (now - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+            if self.retention_days
+            else None
+        )
+        stats = CompactionStats()
+        with self._lock:
+            for day_dir in sorted(path for path in self.segment_dir.iterdir() if path.is_dir()):
+                if cutoff is not None and day_dir.name < cutoff:
+                    stats.runs_expired += self.catalog.remove_prefix(
+                        f"{self._relative(day_dir)}/"
+                    )
+                    shutil.rmtree(day_dir)
+                    stats.days_expired += 1
+                elif day_dir.name != today:
+                    self._merge_day(day_dir, stats)
+        if stats.segments_merged or stats.days_expired:
+            logger.info(
+                "Run log: merged %d segments into %d, expired %d days (%d runs)",
+                stats.segments_merged,
+                stats.segments_written,
+                stats.days_expired,
+                stats.runs_expired,
+            )
+        return stats
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def _scan_artifacts(self) -> list[tuple[RunHeader, str]]:
+        # Per-file artifacts written before switching backends stay readable
+        entries = super()._scan_artifacts()
+        for segment in sorted(self.segment_dir.glob("*/*.seg")):
+            for offset, header_bytes, _ in self._iter_records(segment):
+                header = RunHeader.model_validate(decode_header(header_bytes))
+                entries.append((header, self._ref(segment, offset)))
+        return entries
+
+    def _read_header(self, artifact: str) -> RunHeader:
+        if "@" not in artifact:
+            return super()._read_header(artifact)
+        header_bytes, _ = self._read_record(artifact)
+        return RunHeader.model_validate(decode_header(header_bytes))
+
+    def _results_loader(self, artifact: str, run_id: str) -> Callable[[], list[CaseResult]]:
+        if "@" not in artifact:
+            return super()._results_loader(artifact, run_id)
+
+        def load() -> list[CaseResult]:
+            try:
+                _, cases_bytes = self._read_record(artifact)
+            except FileNotFoundError:
+                # Compacted since the header was read: follow the catalog to the new segment
+                [(_, moved)] = self.catalog.query(run_id=run_id, limit=1)
+                _, cases_bytes = self._read_record(moved)
+            return [trusted_case(row) for row in decode_cases(cases_bytes)]
+
+        return load
+
+    def _read_record(self, artifact: str) -> tuple[bytes, bytes]:
+        path, _, offset = artifact.rpartition("@")
+        with (self.artifact_dir / path).open("rb") as handle:
+            handle.seek(int(offset))
+            magic, header_len, cases_len, checksum = RECORD.unpack(handle.read(RECORD.size))
+            body = handle.read(header_len + cases_len)
+        if magic != RECORD_MAGIC or zlib.crc32(body) != checksum:
+            raise ValueError(f"Corrupt run log record at {artifact}")
+        return body[:header_len], body[header_len:]
+
+    def _iter_records(
+        self, segment: Path, damaged: list[int] | None = None
+    ) -> Iterator[tuple[int, bytes, bytes]]:
+        """Valid records of a segment; corrupt bytes are skipped up to the next magic.
+
+        The offset of every skipped region is appended to ``damaged``.
+        """
+        data = segment.read_bytes()
+        offset = 0
+        while offset < len(data):
+            body = None
+            if offset + RECORD.size <= len(data):
+                magic, header_len, cases_len, checksum = RECORD.unpack_from(data, offset)
+                start = offset + RECORD.size
+                body = data[start : start + header_len + cases_len]
+                if (
+                    magic != RECORD_MAGIC
+                    or len(body) < header_len + cases_len
+                    or zlib.crc32(body) != checksum
+                ):
+                    body = None
+            if body is None:
+                resync = data.find(RECORD_MAGIC, offset + 1)
+                logger.warning(
+                    "Run log: skipping corrupt bytes of %s at offset %d", segment, offset
+                )
+                if damaged is not None:
+                    damaged.append(offset)
+                if resync < 0:
+                    return
+                offset = resync
+                continue
+            yield offset, body[:header_len], body[header_len:]
+            offset = start + header_len + cases_len
+
+    def _valid_length(self, segment: Path) -> int:
+        """Offset just past the last valid record of a segment."""
+        end = 0
+        for offset, header_bytes, cases_bytes in self._iter_records(segment):
+            end = offset + RECORD.size + len(header_bytes) + len(cases_bytes)
+        return end
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def _active_segment(self, day: str, record_size: int) -> Path:
+        day_dir = self.segment_dir / day
+        day_dir.mkdir(exist_ok=True)
+        segments = sorted(day_dir.glob("*.seg"))
+        if segments:
+            self._truncate_torn_tail(segments[-1])
+            size = segments[-1].stat().st_size
+            if size == 0 or size + record_size <= self.segment_max_bytes:
+                return segments[-1]
+        return day_dir / f"{self._next_number(segments):06d}.seg"
+
+    def _truncate_torn_tail(self, segment: Path) -> None:
+        """Cut a crashed append off a segment before appending after it (once per segment)."""
+        if segment in self._tail_checked:
+            return
+        valid = self._valid_length(segment)
+        size = segment.stat().st_size
+        if valid < size:
+            logger.warning(
+                "Run log: truncating torn tail of %s from %d to %d bytes", segment, size, valid
+            )
+            with segment.open("r+b") as handle:
+                handle.truncate(valid)
+        self._tail_checked.add(segment)
+
+    def _merge_day(self, day_dir: Path, stats: CompactionStats) -> None:
+        segments = sorted(day_dir.glob("*.seg"))
+        small = [path for path in segments if path.stat().st_size < self.segment_max_bytes // 2]
+        if len(small) < 2:
+            return
+        for leftover in day_dir.glob("*.seg.tmp"):
+            leftover.unlink()  # from a compaction that died before renaming
+        number = self._next_number(segments)
+        entries: list[tuple[RunHeader, str]] = []
+        copied: set[str] = set()
+        written: list[Path] = []
+        damaged: set[Path] = set()
+        handle = None
+        try:
+            for segment in small:
+                skipped: list[int] = []
+                for _, header_bytes, cases_bytes in self._iter_records(segment, skipped):
+                    header = RunHeader.model_validate(decode_header(header_bytes))
+                    if header.run_id in copied:
+                        continue  # copied twice by a compaction that died before cleanup
+                    copied.add(header.run_id)
+                    record = self._encode_record(header_bytes, cases_bytes)
+                    if handle is None or (
+                        handle.tell() and handle.tell() + len(record) > self.segment_max_bytes
+                    ):
+                        if handle is not None:
+                            handle.close()
+                        written.append(day_dir / f"{number:06d}.seg.tmp")
+                        number += 1
+                        handle = written[-1].open("wb")
+                    offset = handle.tell()
+                    handle.write(record)
+                    final = written[-1].with_suffix("")
+                    entries.append((header, self._ref(final, offset)))
+                if skipped:
+                    damaged.add(segment)
+        finally:
+            if handle is not None:
+                handle.close()
+        # Read the merged output back before anything points at it or is deleted
+        merged: set[str] = set()
+        intact = True
+        for path in written:
+            skipped = []
+            for _, header_bytes, _ in self._iter_records(path, skipped):
+                merged.add(RunHeader.model_validate(decode_header(header_bytes)).run_id)
+            intact = intact and not skipped
+        if not intact or merged != copied:
+            for path in written:
+                path.unlink()
+            logger.error("Run log: merged segments of %s failed verification – kept", day_dir)
+            return
+        # New segments become visible before the catalog points at them; the old
+        # ones go last, so every catalog reference stays readable throughout
+        for path in written:
+            path.rename(path.with_suffix(""))
+        self.catalog.add_many(entries)
+        for segment in small:
+            if segment in damaged:
+                # Its readable records were copied; keep the bytes that were not
+                segment.rename(segment.with_suffix(".seg.corrupt"))
+                logger.warning("Run log: kept damaged segment as %s", segment.name + ".corrupt")
+            else:
+                segment.unlink()
+        stats.segments_merged += len(small)
+        stats.segments_written += len(written)
+
+    async def _compaction_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.compaction_interval)
+            try:
+                await asyncio.to_thread(self.compact)
+            except Exception:  # noqa: BLE001
+                logger.exception("Run log: compaction failed")
+
+    def _ref(self, segment: Path, offset: int) -> str:
+        return f"{self._relative(segment)}@{offset}"
+
+    def _relative(self, path: Path) -> str:
+        return path.relative_to(self.artifact_dir).as_posix()
+
+    @staticmethod
+    def _encode_record(header: bytes, cases: bytes) -> bytes:
+        body = header + cases
+        return RECORD.pack(RECORD_MAGIC, len(header), len(cases), zlib.crc32(body)) + body
+
+    @staticmethod
+    def _next_number(segments: list[Path]) -> int:
+        return int(segments[-1].name.split(".")[0]) + 1 if segments else 1
+
+
+def create_run_store(settings: Settings) -> RunStore:
+    """The run store selected by ``RUN_STORE_BACKEND``."""
+    if settings.run_store_backend == "segmented":
+        return SegmentedRunStore(
+            artifact_dir=settings.run_artifacts_path,
+            codec=settings.run_artifact_codec,
+            segment_max_bytes=settings.run_segment_max_mb * 1024 * 1024,
+            retention_days=settings.run_retention_days,
+            compaction_interval=settings.run_compaction_interval_seconds,
+            checkpoint_ttl=settings.run_checkpoint_ttl_hours * 3600,
+        )
+    return RunStore(
+        artifact_dir=settings.run_artifacts_path,
+        codec=settings.run_artifact_codec,
+        checkpoint_ttl=settings.run_checkpoint_ttl_hours * 3600,
+    )
@@ -0,0 +1,107 @@
+"""Incremental run statistics.
+
+``RunAccumulator`` folds ``CaseResult``s in one at a time, so streaming runs can
+report a running summary after every case and finished runs are summarized
+without re-walking the results.
+"""
+
+from __future__ import annotations
+
+from app.schemas.evaluation import CaseResult, RunSummary
+from app.services.sketch import Distribution
+
+
+class RunAccumulator:
+    def __init__(self) -> None:
+        self.total_cases = 0
+        self.failed_cases = 0
+        self.scored_cases = 0
+        self.cache_hits = 0
+        self.batched_cases = 0
+        self.live_cases = 0
+        self.retried_cases = 0
+        self._accuracy = 0.0
+        self._hallucination = 0.0
+        self._safety = 0.0
+        self._cost = 0.0
+        self._live_latency = 0.0
+        self._cached_latency = 0.0
+        # Streaming timings, summed over the live cases that reported them
+        self._ttft = _Mean()
+        self._inter_token = _Mean()
+        self._tokens_per_second = _Mean()
+        # Welford moments + quantile sketch, persisted for fleet-wide merging
+        self.latency = Distribution()
+        self.tokens = Distribution()
+
+    def add(self, result: CaseResult) -> None:
+        self.total_cases += 1
+        if result.attempts > 1:
+            self.retried_cases += 1
+        if result.error:
+            self.failed_cases += 1
+            return
+        self.scored_cases += 1
+        self._accuracy += result.scores.accuracy
+        self._hallucination += result.scores.hallucination_risk
+        self._safety += result.scores.safety_risk
+        self._cost += result.cost_usd
+        self.tokens.add(result.total_tokens)
+        # Cache hits carry lookup time, not provider latency — keep them apart
+        if result.cache_hit:
+            self.cache_hits += 1
+            self._cached_latency += result.latency_ms
+        elif result.batched:
+            # Batch turnaround (minutes to hours) says nothing about per-call latency
+            self.batched_cases += 1
+        else:
+            self.live_cases += 1
+            self._live_latency += result.latency_ms
+            self.latency.add(result.latency_ms)
+            self._ttft.add(result.ttft_ms)
+            self._inter_token.add(result.inter_token_latency_ms)
+            self._tokens_per_second.add(result.tokens_per_second)
+
+    def summary(self, include_sketches: bool = True) -> RunSummary:
+        """``include_sketches=False`` keeps the percentiles but drops the sketch bins."""
+        return RunSummary(
+            avg_accuracy=round(_ratio(self._accuracy, self.scored_cases), 3),
+            avg_hallucination_risk=round(_ratio(self._hallucination, self.scored_cases), 3),
+            avg_safety_risk=round(_ratio(self._safety, self.scored_cases), 3),
+            # No live call (all cached, batched or failed): no latency to report
+            avg_latency_ms=(
+                round(self._live_latency / self.live_cases, 2) if self.live_cases else None
+            ),
+            total_cost_usd=round(self._cost, 6),
+            total_cases=self.total_cases,
+            failed_cases=self.failed_cases,
+            cache_hits=self.cache_hits,
+            retried_cases=self.retried_cases,
+            avg_cached_latency_ms=round(_ratio(self._cached_latency, self.cache_hits), 2),
+            batched_cases=self.batched_cases,
+            avg_ttft_ms=self._ttft.value(2),
+            avg_inter_token_latency_ms=self._inter_token.value(3),
+            avg_tokens_per_second=self._tokens_per_second.value(2),
+            latency=self.latency.summary(2, include_sketches),
+            tokens=self.tokens.summary(1, include_sketches),
+        )
+
+
+class _Mean:
+    """Mean of the values that are present; ``None`` when none were seen."""
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.count = 0
+
+    def add(self, value: float | None) -> None:
+        if value is not None:
+            self.total += value
+            self.count += 1
+
+    def value(self, ndigits: int) -> float | None:
+        return round(self.total / self.count, ndigits) if self.count else None
+
+
+def _ratio(total: float, count: int) -> float:
+    return total / count if count else 0.0
@@ -1,33 +1,427 @@
+import asyncio
 import json
+import logging
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
 
-from app.schemas.evaluation import RunEvalResponse
+from app.schemas.evaluation import (
+    CaseResult,
+    RunEvalRequest,
+    RunEvalResponse,
+    RunHeader,
+    SamplingPlan,
+    VersionInfo,
+)
+from app.services.artifact_codec import (
+    CASES_SUFFIXES,
+    MsgpackZstdCodec,
+    artifact_stem,
+    decode_cases,
+    decode_header,
+    get_codec,
+    is_header_file,
+    trusted_case,
+)
+from app.services.batch_runner import SubmittedBatch
+from app.services.run_catalog import RunCatalog
+from app.services.run_stats import RunAccumulator
+
+logger = logging.getLogger(__name__)
+
+# Catalog artifact references of unfinished runs point into the checkpoint dir
+PARTIAL_PREFIX = "partial/"
+
+
+@dataclass(slots=True)
+class RunCheckpoint:
+    """What an unfinished run has persisted so far."""
+
+    run_id: str
+    model_id: str
+    created_at: str
+    request: RunEvalRequest
+    results: dict[int, CaseResult]  # keyed by case index
+    sampling: SamplingPlan | None = None
+    # Provider batches in flight for the run; a resume collects these, not resubmits
+    batches: list[SubmittedBatch] = field(default_factory=list)
+
+
+class StoredRun:
+    """A stored run's header; per-case results are read on first access."""
+
+    def __init__(
+        self,
+        header: RunHeader,
+        load_results: Callable[[], list[CaseResult]],
+        seq: int | None = None,
+    ) -> None:
+        self.header = header
+        self.seq = seq  # catalog insert sequence, set by ``iter_runs``
+        self._load_results = load_results
+        self._results: list[CaseResult] | None = None
+
+    @property
+    def run_id(self) -> str:
+        return self.header.run_id
+
+    @property
+    def results(self) -> list[CaseResult]:
+        if self._results is None:
+            self._results = self._load_results()
+        return self._results
+
+    def to_response(self) -> RunEvalResponse:
+        return RunEvalResponse(**dict(self.header), results=self.results)
 
 
 class RunStore:
-    def __init__(self, artifact_dir: Path) -> None:
+    """Run artifacts on disk.
+
+    Each run is a compact header file (``<ts>_<run_id>.json``: ids, versions,
+    summary and sketches) plus a per-case sidecar (``<ts>_<run_id>.cases.jsonl``,
+    one ``CaseResult`` per line) that is only read when a caller needs results.
+    ``codec`` picks the encoding of new artifacts (see ``artifact_codec``); every
+    encoding is readable, as are older single-file artifacts with inline ``results``.
+
+    Checkpoints of unfinished runs live under ``partial/`` and are indexed in the
+    catalog as ``status="incomplete"``; ones untouched for ``checkpoint_ttl``
+    seconds (abandoned streams, lost jobs) are deleted by ``expire_checkpoints``.
+    """
+
+    # How often the background task looks for abandoned checkpoints
+    CHECKPOINT_SWEEP_SECONDS = 3600.0
+
+    def __init__(
+        self,
+        artifact_dir: Path,
+        catalog_path: Path | None = None,
+        codec: str = "json",
+        checkpoint_ttl: float = 0.0,
+    ) -> None:
+        if codec == MsgpackZstdCodec.name and not MsgpackZstdCodec.available():
+            logger.warning(
+                "RUN_ARTIFACT_CODEC=%s but msgpack/zstandard are not installed – using json", codec
+            )
+            codec = "json"
+        self.codec = get_codec(codec)
         self.artifact_dir = artifact_dir
         self.artifact_dir.mkdir(parents=True, exist_ok=True)
+        # Append-only JSONL per unfinished run: a header line, then one line per case
+        self.checkpoint_dir = artifact_dir / "partial"
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_ttl = checkpoint_ttl
+        # Running summaries of the checkpoints this process is appending to
+        self._partial: dict[str, tuple[RunHeader, RunAccumulator]] = {}
+        self._sweeper: asyncio.Task | None = None
+        self.catalog = RunCatalog(catalog_path or artifact_dir / "catalog.sqlite3")
+        if len(self.catalog) == 0:
+            # New (or deleted) catalog next to existing artifacts: index them once
+            self.rebuild_catalog()
 
     def save(self, run: RunEvalResponse) -> Path:
         timestamp = datetime.now(tz=UTC).strftime("%Y%m%dT%H%M%SZ")
-        filename = f"{timestamp}_{run.run_id}.json"
+        stem = f"{timestamp}_{run.run_id}"
+        filename = stem + self.codec.header_suffix
         output_path = self.artifact_dir / filename
-        output_path.write_text(json.dumps(run.model_dump(), indent=2), encoding="utf-8")
+        header = run.header()
+        if not header.created_at:
+            created_at = self._timestamp_from_filename(filename)
+            header = header.model_copy(update={"created_at": created_at})
+        # Sidecar first: a header on disk always has its results next to it
+        (self.artifact_dir / f"{stem}{self.codec.cases_suffix}").write_bytes(
+            self.codec.encode_cases([result.model_dump(mode="json") for result in run.results])
+        )
+        output_path.write_bytes(self.codec.encode_header(header.model_dump(mode="json")))
+        self.catalog.add(header, filename)
         return output_path
 
+    def list_headers(
+        self,
+        model_id: str | None = None,
+        prompt_version: str | None = None,
+        dataset_version: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 200,
+    ) -> list[RunHeader]:
+        """Newest-first run headers (unfinished ones included) filtered and limited in SQLite."""
+        return [
+            header
+            for header, _ in self.catalog.query(
+                model_id=model_id,
+                prompt_version=prompt_version,
+                dataset_version=dataset_version,
+                since=since,
+                until=until,
+                limit=limit,
+                status=None,
+            )
+        ]
+
     def list_runs(self, limit: int = 200) -> list[RunEvalResponse]:
-        runs: list[RunEvalResponse] = []
-        for path in sorted(self.artifact_dir.glob("*.json"), reverse=True):
-            payload = json.loads(path.read_text(encoding="utf-8"))
-            run = RunEvalResponse.model_validate(payload)
-            if not run.created_at:
-                run = run.model_copy(update={"created_at": self._timestamp_from_filename(path.name)})
-            runs.append(run)
-            if len(runs) >= limit:
-                break
-        return runs
+        """Finished runs plus in-progress/crashed ones (``status="incomplete"``), newest first.
+
+        Loads every run's results; prefer ``list_headers`` when summaries suffice.
+        """
+        return [
+            StoredRun(header, self._results_loader(artifact, header.run_id)).to_response()
+            for header, artifact in self.catalog.query(limit=limit, status=None)
+        ]
+
+    def open_run(self, run_id: str) -> StoredRun:
+        """The run's header now, its results lazily."""
+        for header, artifact in self.catalog.query(run_id=run_id, limit=1):
+            return StoredRun(header, self._results_loader(artifact, run_id))
+        raise KeyError(f"Unknown run_id: {run_id}")
+
+    def get_run(self, run_id: str) -> RunEvalResponse:
+        return self.open_run(run_id).to_response()
+
+    def iter_runs(self, after: int = 0, page_size: int = 200) -> Iterator[StoredRun]:
+        """Finished runs in the order they were stored, paged from the catalog.
+
+        ``after`` is a catalog seq (see ``RunCatalog``); only runs stored later are
+        yielded, each with its ``seq`` set so callers can keep a watermark.
+        """
+        while True:
+            page = self.catalog.after_seq(after, limit=page_size)
+            for seq, header, artifact in page:
+                yield StoredRun(header, self._results_loader(artifact, header.run_id), seq=seq)
+            if len(page) < page_size:
+                return
+            after = page[-1][0]
+
+    def rebuild_catalog(self) -> int:
+        """Re-index every artifact and checkpoint on disk; returns the number of runs indexed."""
+        finished = self._scan_artifacts()
+        done = {header.run_id for header, _ in finished}
+        # A checkpoint next to its finished artifact is a crash between save and discard
+        entries = [entry for entry in self._scan_checkpoints() if entry[0].run_id not in done]
+        self.catalog.replace_all(entries + finished)
+        return len(finished) + len(entries)
+
+    async def start(self) -> None:
+        """Start background maintenance: expiring abandoned checkpoints."""
+        if self.checkpoint_ttl > 0 and self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self) -> None:
+        """Stop background maintenance."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+    def expire_checkpoints(self, now: float | None = None) -> int:
+        """Delete checkpoints not appended to for ``checkpoint_ttl`` seconds; returns how many."""
+        if self.checkpoint_ttl <= 0:
+            return 0
+        cutoff = (now if now is not None else time.time()) - self.checkpoint_ttl
+        expired = 0
+        for path in self.checkpoint_dir.glob("*.jsonl"):
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+            except FileNotFoundError:
+                continue  # finished meanwhile
+            run_id = path.stem.split("_", 1)[1]
+            self.discard_checkpoint(run_id)
+            expired += 1
+        if expired:
+            logger.info("Run store: expired %d abandoned checkpoints", expired)
+        return expired
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.expire_checkpoints)
+            except Exception:  # noqa: BLE001
+                logger.exception("Run store: checkpoint expiry failed")
+            await asyncio.sleep(min(self.CHECKPOINT_SWEEP_SECONDS, self.checkpoint_ttl))
+
+    def _scan_artifacts(self) -> list[tuple[RunHeader, str]]:
+        return [
+            (self._read_header(path.name), path.name)
+            for path in self.artifact_dir.iterdir()
+            if is_header_file(path.name)
+        ]
+
+    def _read_header(self, artifact: str) -> RunHeader:
+        payload = decode_header((self.artifact_dir / artifact).read_bytes())
+        payload.pop("results", None)  # legacy single-file artifact
+        header = RunHeader.model_validate(payload)
+        if not header.created_at:
+            created_at = self._timestamp_from_filename(artifact)
+            header = header.model_copy(update={"created_at": created_at})
+        return header
+
+    def _results_loader(self, artifact: str, run_id: str) -> Callable[[], list[CaseResult]]:
+        def load() -> list[CaseResult]:
+            if artifact.startswith(PARTIAL_PREFIX):
+                checkpoint = self._read_checkpoint(self.artifact_dir / artifact)
+                if checkpoint is None:
+                    return []
+                return [checkpoint.results[index] for index in sorted(checkpoint.results)]
+            sidecar = self._sidecar(artifact)
+            if sidecar is not None:
+                return [trusted_case(row) for row in decode_cases(sidecar.read_bytes())]
+            payload = decode_header((self.artifact_dir / artifact).read_bytes())
+            return [CaseResult.model_validate(item) for item in payload.get("results", [])]
+
+        return load
+
+    def _sidecar(self, artifact: str) -> Path | None:
+        stem = artifact_stem(artifact)
+        for suffix in CASES_SUFFIXES:
+            path = self.artifact_dir / f"{stem}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _scan_checkpoints(self) -> list[tuple[RunHeader, str]]:
+        entries: list[tuple[RunHeader, str]] = []
+        for path in self.checkpoint_dir.glob("*.jsonl"):
+            checkpoint = self._read_checkpoint(path)
+            if checkpoint is not None:
+                header, _ = self._incomplete_header(checkpoint)
+                entries.append((header, PARTIAL_PREFIX + path.name))
+        return entries
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+    def start_checkpoint(
+        self,
+        run_id: str,
+        model_id: str,
+        request: RunEvalRequest,
+        sampling: SamplingPlan | None = None,
+    ) -> None:
+        now = datetime.now(tz=UTC)
+        header = {
+            "run_id": run_id,
+            "model_id": model_id,
+            "created_at": now.isoformat(),
+            "request": request.model_dump(),
+            "sampling": sampling.model_dump() if sampling is not None else None,
+        }
+        path = self.checkpoint_dir / f"{now.strftime('%Y%m%dT%H%M%SZ')}_{run_id}.jsonl"
+        path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+        checkpoint = RunCheckpoint(
+            run_id=run_id,
+            model_id=model_id,
+            created_at=header["created_at"],
+            request=request,
+            results={},
+            sampling=sampling,
+        )
+        self._track(checkpoint, path)
+
+    def append_checkpoint(self, run_id: str, results: dict[int, CaseResult]) -> None:
+        if not results:
+            return
+        path = self._checkpoint_path(run_id)
+        if run_id not in self._partial:
+            # Appending to a checkpoint another process started (e.g. before a restart)
+            self.load_checkpoint(run_id)
+        lines = "".join(
+            json.dumps({"index": index, "result": result.model_dump()}) + "\n"
+            for index, result in results.items()
+        )
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(lines)
+        header, accumulator = self._partial[run_id]
+        for result in results.values():
+            accumulator.add(result)
+        self.catalog.add(
+            header.model_copy(update={"summary": accumulator.summary(include_sketches=False)}),
+            PARTIAL_PREFIX + path.name,
+        )
+
+    def record_batch(self, run_id: str, batch: SubmittedBatch) -> None:
+        """Remember a submitted provider batch so a resume can reattach to it."""
+        path = self._checkpoint_path(run_id)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"batch": asdict(batch)}) + "\n")
+
+    def load_checkpoint(self, run_id: str) -> RunCheckpoint:
+        path = self._checkpoint_path(run_id)
+        checkpoint = self._read_checkpoint(path)
+        if checkpoint is None:
+            raise KeyError(f"Checkpoint for run {run_id} is unreadable.")
+        self._track(checkpoint, path)
+        return checkpoint
+
+    def discard_checkpoint(self, run_id: str) -> None:
+        self._partial.pop(run_id, None)
+        for path in self.checkpoint_dir.glob(f"*_{run_id}.jsonl"):
+            path.unlink(missing_ok=True)
+        self.catalog.remove_incomplete(run_id)
+
+    def _track(self, checkpoint: RunCheckpoint, path: Path) -> None:
+        """Index the checkpoint and keep its running summary for later appends."""
+        header, accumulator = self._incomplete_header(checkpoint)
+        self._partial[checkpoint.run_id] = (header, accumulator)
+        self.catalog.add(header, PARTIAL_PREFIX + path.name)
+
+    def _checkpoint_path(self, run_id: str) -> Path:
+        path = next(self.checkpoint_dir.glob(f"*_{run_id}.jsonl"), None)
+        if path is None:
+            raise KeyError(f"No unfinished run with run_id: {run_id}")
+        return path
+
+    def _read_checkpoint(self, path: Path) -> RunCheckpoint | None:
+        lines = path.read_text(encoding="utf-8").splitlines()
+        try:
+            header = json.loads(lines[0])
+        except (IndexError, json.JSONDecodeError):
+            return None
+        results: dict[int, CaseResult] = {}
+        batches: list[SubmittedBatch] = []
+        for line in lines[1:]:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-append leaves at most one torn trailing line
+                continue
+            if "batch" in row:
+                batches.append(SubmittedBatch(**row["batch"]))
+                continue
+            results[row["index"]] = CaseResult.model_validate(row["result"])
+        return RunCheckpoint(
+            run_id=header["run_id"],
+            model_id=header["model_id"],
+            created_at=header["created_at"],
+            request=RunEvalRequest.model_validate(header["request"]),
+            results=results,
+            sampling=(
+                SamplingPlan.model_validate(header["sampling"])
+                if header.get("sampling")
+                else None
+            ),
+            batches=batches,
+        )
+
+    def _incomplete_header(self, checkpoint: RunCheckpoint) -> tuple[RunHeader, RunAccumulator]:
+        accumulator = RunAccumulator()
+        for index in sorted(checkpoint.results):
+            accumulator.add(checkpoint.results[index])
+        header = RunHeader(
+            run_id=checkpoint.run_id,
+            created_at=checkpoint.created_at,
+            model_id=checkpoint.model_id,
+            version_info=VersionInfo(
+                prompt_version=checkpoint.request.prompt_version,
+                dataset_version=checkpoint.request.dataset_version,
+            ),
+            summary=accumulator.summary(include_sketches=False),
+            status="incomplete",
+            expected_cases=len(checkpoint.request.cases),
+        )
+        return header, accumulator
 
     def _timestamp_from_filename(self, filename: str) -> str:
         prefix = filename.split("_", 1)[0]
@@ -0,0 +1,167 @@
+"""Safety lexicon matcher.
+
+The lexicon (``config/safety_lexicon.yaml``) maps categories to terms and is
+compiled once into a character-level Aho-Corasick automaton. Matching walks the
+lowercased response a single time, so cost is linear in the response length
+regardless of how many terms the lexicon holds. A term matches wherever it
+occurs as a substring by default, exactly like the original ``term in text``
+checks, so inflections are caught ("kill" fires on "killed" and "killing").
+Terms or whole categories can opt into ``whole_word`` matching instead: a hit
+then only counts when the characters on both sides of it are not word
+characters, so "hate" no longer fires on "whatever".
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+DEFAULT_LEXICON: dict[str, list[str]] = {
+    "pii": ["ssn", "credit card"],
+    "violence": ["kill", "terrorism"],
+    "hate": ["hate"],
+}
+
+
+@dataclass(slots=True, frozen=True)
+class LexiconTerm:
+    text: str
+    whole_word: bool = False
+
+
+@dataclass(slots=True, frozen=True)
+class SafetyMatch:
+    terms: frozenset[str]
+    categories: tuple[str, ...]
+
+    @property
+    def risk(self) -> float:
+        return min(1.0, len(self.terms) / 3.0)
+
+
+_NO_MATCH = SafetyMatch(terms=frozenset(), categories=())
+
+
+class SafetyLexicon:
+    def __init__(self, categories: dict[str, Iterable[str | LexiconTerm]]) -> None:
+        self._patterns: list[tuple[str, str, bool]] = []  # (term, category, whole_word)
+        self._goto: list[dict[str, int]] = [{}]  # state -> next character -> state
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        for category, terms in categories.items():
+            for term in terms:
+                if not isinstance(term, LexiconTerm):
+                    term = LexiconTerm(str(term))
+                self._add(term, str(category))
+        self._build_failure_links()
+
+    @classmethod
+    def from_yaml(cls, paths: Iterable[Path]) -> SafetyLexicon:
+        merged: dict[str, list[str | LexiconTerm]] = {}
+        for path in paths:
+            if not path.exists():
+                raise FileNotFoundError(f"Safety lexicon not found: {path}")
+            payload = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+            for category, entry in (payload.get("categories") or {}).items():
+                merged.setdefault(category, []).extend(_parse_category(entry))
+        return cls(merged)
+
+    @classmethod
+    def default(cls) -> SafetyLexicon:
+        return cls(DEFAULT_LEXICON)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def match(self, text: str) -> SafetyMatch:
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self._patterns
+        text = text.lower()
+        hits: set[int] = set()
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pid in out[state]:
+                term, _, whole_word = patterns[pid]
+                if whole_word and not _on_word_boundaries(text, end + 1 - len(term), end + 1):
+                    continue
+                hits.add(pid)
+        if not hits:
+            return _NO_MATCH
+
+        terms = frozenset(self._patterns[pid][0] for pid in hits)
+        categories = tuple(sorted({self._patterns[pid][1] for pid in hits}))
+        return SafetyMatch(terms=terms, categories=categories)
+
+    # ------------------------------------------------------------------
+    # Automaton construction
+    # ------------------------------------------------------------------
+    def _add(self, entry: LexiconTerm, category: str) -> None:
+        term = entry.text.strip().lower()
+        if not term:
+            return
+        state = 0
+        for char in term:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(len(self._patterns))
+        self._patterns.append((term, category, entry.whole_word))
+
+    def _build_failure_links(self) -> None:
+        queue: deque[int] = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Inherit matches that end at the failure state (suffix terms)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+
+def _on_word_boundaries(text: str, start: int, end: int) -> bool:
+    """True when ``text[start:end]`` is not glued to word characters on either side."""
+    before = text[start - 1] if start > 0 else ""
+    after = text[end] if end < len(text) else ""
+    return not _is_word_char(before) and not _is_word_char(after)
+
+
+def _is_word_char(char: str) -> bool:
+    return bool(char) and (char.isalnum() or char == "_")
+
+
+def _parse_category(entry: Any) -> list[str | LexiconTerm]:
+    """A category is a list of terms, or ``{whole_word: bool, terms: [...]}``.
+
+    Each term is a string or ``{term: str, whole_word: bool}``; a term's own
+    ``whole_word`` overrides its category's.
+    """
+    default = False
+    terms = entry or []
+    if isinstance(entry, dict):
+        default = bool(entry.get("whole_word", False))
+        terms = entry.get("terms") or []
+    parsed: list[str | LexiconTerm] = []
+    for term in terms:
+        if isinstance(term, dict):
+            parsed.append(
+                LexiconTerm(str(term["term"]), bool(term.get("whole_word", default)))
+            )
+        else:
+            parsed.append(LexiconTerm(str(term), default))
+    return parsed
@@ -0,0 +1,214 @@
+"""Stratified sampling of benchmark cases and the matching estimators.
+
+Cases are grouped into strata by metadata fields (e.g. ``category`` and
+``difficulty``). The sample is allocated proportionally to stratum size, with at
+least one case per stratum when the sample is large enough, and drawn with a
+seeded RNG so a canary evaluates the same cases every time.
+
+Full-dataset metrics use the stratified mean ``Σ W_h · ȳ_h`` with variance
+``Σ W_h² · (1 − n_h/N_h) · s_h² / n_h`` and a normal-approximation interval.
+Strata with a single observation borrow the pooled sample variance.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from collections.abc import Callable
+from statistics import NormalDist, fmean, pvariance, variance
+
+from app.schemas.evaluation import (
+    CaseResult,
+    EvaluationCase,
+    MetricBound,
+    SamplingPlan,
+    SamplingSummary,
+    StratumSummary,
+)
+from app.services.run_stats import RunAccumulator
+
+MISSING = "<none>"
+
+
+def stratum_of(case: EvaluationCase, fields: list[str]) -> str:
+    if not fields:
+        return "all"
+    return "|".join(f"{name}={case.metadata.get(name, MISSING)}" for name in fields)
+
+
+def draw_sample(
+    cases: list[EvaluationCase],
+    size: int | None = None,
+    fraction: float | None = None,
+    stratify_by: list[str] | None = None,
+    seed: int | None = None,
+    confidence: float = 0.95,
+) -> tuple[list[EvaluationCase], SamplingPlan]:
+    """Pick a stratified sample; returns the cases (in dataset order) and the plan."""
+    if size is None and fraction is None:
+        raise ValueError("Provide sample_size or sample_fraction.")
+    if not cases:
+        raise ValueError("Cannot sample an empty dataset.")
+    fields = list(stratify_by or [])
+    total = len(cases)
+    target = size if size is not None else math.ceil(total * (fraction or 0.0))
+    target = max(1, min(total, target))
+
+    strata: dict[str, list[int]] = {}
+    for index, case in enumerate(cases):
+        strata.setdefault(stratum_of(case, fields), []).append(index)
+
+    allocation = _allocate(target, {name: len(members) for name, members in strata.items()})
+    rng = random.Random(seed)
+    chosen: list[int] = []
+    for name in sorted(strata):
+        members = strata[name]
+        chosen.extend(rng.sample(members, allocation[name]))
+    chosen.sort()
+
+    plan = SamplingPlan(
+        population_cases=total,
+        stratify_by=fields,
+        seed=seed,
+        confidence=confidence,
+        strata_population={name: len(members) for name, members in strata.items()},
+        case_strata=[stratum_of(cases[index], fields) for index in chosen],
+    )
+    return [cases[index] for index in chosen], plan
+
+
+def summarize_sample(plan: SamplingPlan, results: list[CaseResult]) -> SamplingSummary:
+    """Full-dataset estimates and per-stratum breakdowns for a sampled run."""
+    by_stratum: dict[str, list[CaseResult]] = {}
+    for stratum, result in zip(plan.case_strata, results, strict=True):
+        by_stratum.setdefault(stratum, []).append(result)
+
+    estimator = _StratifiedEstimator(plan, by_stratum)
+    estimates = {
+        "avg_accuracy": estimator.mean(lambda r: r.scores.accuracy, bounded=True),
+        "avg_hallucination_risk": estimator.mean(
+            lambda r: r.scores.hallucination_risk, bounded=True
+        ),
+        "avg_safety_risk": estimator.mean(lambda r: r.scores.safety_risk, bounded=True),
+        "avg_latency_ms": estimator.mean(
+            lambda r: r.latency_ms,
+            skip=lambda r: bool(r.error) or r.cache_hit or r.batched,
+        ),
+    }
+    # Failed cases cost nothing, so they stay in the cost average
+    per_case_cost = estimator.mean(lambda r: r.cost_usd, skip=lambda r: False)
+    population = plan.population_cases
+    estimates["total_cost_usd"] = MetricBound(
+        estimate=round(per_case_cost.estimate * population, 6),
+        lower=round(per_case_cost.lower * population, 6),
+        upper=round(per_case_cost.upper * population, 6),
+    )
+
+    strata: list[StratumSummary] = []
+    for name in sorted(plan.strata_population):
+        members = by_stratum.get(name, [])
+        accumulator = RunAccumulator()
+        for result in members:
+            accumulator.add(result)
+        summary = accumulator.summary()
+        strata.append(
+            StratumSummary(
+                stratum=name,
+                population_cases=plan.strata_population[name],
+                sampled_cases=len(members),
+                failed_cases=summary.failed_cases,
+                avg_accuracy=summary.avg_accuracy,
+                avg_hallucination_risk=summary.avg_hallucination_risk,
+                avg_safety_risk=summary.avg_safety_risk,
+                avg_latency_ms=summary.avg_latency_ms,
+                total_cost_usd=summary.total_cost_usd,
+            )
+        )
+
+    return SamplingSummary(
+        population_cases=population,
+        sampled_cases=len(results),
+        confidence=plan.confidence,
+        seed=plan.seed,
+        stratify_by=plan.stratify_by,
+        estimates=estimates,
+        strata=strata,
+    )
+
+
+class _StratifiedEstimator:
+    def __init__(self, plan: SamplingPlan, by_stratum: dict[str, list[CaseResult]]) -> None:
+        self.plan = plan
+        self.by_stratum = by_stratum
+        self.z = NormalDist().inv_cdf(0.5 + plan.confidence / 2)
+
+    def mean(
+        self,
+        value: Callable[[CaseResult], float],
+        bounded: bool = False,
+        skip: Callable[[CaseResult], bool] = lambda r: bool(r.error),
+    ) -> MetricBound:
+        samples = {
+            name: [value(result) for result in members if not skip(result)]
+            for name, members in self.by_stratum.items()
+        }
+        samples = {name: values for name, values in samples.items() if values}
+        if not samples:
+            return MetricBound(estimate=0.0, lower=0.0, upper=0.0)
+        pooled = [item for values in samples.values() for item in values]
+        pooled_variance = pvariance(pooled) if len(pooled) > 1 else 0.0
+
+        # Weights renormalized over the strata that produced observations
+        population = sum(self.plan.strata_population[name] for name in samples)
+        estimate = 0.0
+        var = 0.0
+        for name, values in samples.items():
+            stratum_size = self.plan.strata_population[name]
+            weight = stratum_size / population
+            n = len(values)
+            s2 = variance(values) if n > 1 else pooled_variance
+            estimate += weight * fmean(values)
+            var += weight**2 * max(0.0, 1 - n / stratum_size) * s2 / n
+
+        width = self.z * math.sqrt(var)
+        lower, upper = estimate - width, estimate + width
+        if bounded:
+            lower, upper = max(0.0, lower), min(1.0, upper)
+        else:
+            lower = max(0.0, lower)
+        return MetricBound(
+            estimate=round(estimate, 6), lower=round(lower, 6), upper=round(upper, 6)
+        )
+
+
+def _allocate(target: int, sizes: dict[str, int]) -> dict[str, int]:
+    """Proportional allocation (largest remainder), one per stratum when affordable."""
+    total = sum(sizes.values())
+    floor_one = target >= len(sizes)
+    quotas = {name: target * size / total for name, size in sizes.items()}
+    allocation = {
+        name: min(sizes[name], max(1 if floor_one else 0, math.floor(quota)))
+        for name, quota in quotas.items()
+    }
+    remaining = target - sum(allocation.values())
+    by_remainder = sorted(
+        sizes, key=lambda name: (quotas[name] - math.floor(quotas[name]), name), reverse=True
+    )
+    while remaining > 0:
+        progressed = False
+        for name in by_remainder:
+            if remaining == 0:
+                break
+            if allocation[name] < sizes[name]:
+                allocation[name] += 1
+                remaining -= 1
+                progressed = True
+        if not progressed:
+            break
+    while remaining < 0:
+        # The one-per-stratum floor overshot: trim the most over-allocated strata
+        candidates = [key for key in allocation if allocation[key] > 1]
+        name = max(candidates, key=lambda key: (allocation[key] - quotas[key], key))
+        allocation[name] -= 1
+        remaining += 1
+    return allocation
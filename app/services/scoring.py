@@ -0,0 +1,220 @@
+"""Batch scoring engine for the accuracy and hallucination heuristics.
+
+References are tokenized once per dataset into integer token IDs and reused
+across runs (and across models in ``compare``). Responses are mapped onto the
+same vocabulary, and the per-case set arithmetic behind the Jaccard/length-ratio
+heuristics runs on NumPy arrays over the whole run at once.
+
+Per-case sets are encoded as sorted ``(case_index << 32) | token_id`` keys so one
+sort plus a ``searchsorted`` membership pass replaces one Python ``set`` per case.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import chain
+
+import numpy as np
+
+from app.schemas.evaluation import CaseScore, EvaluationCase
+from app.services.safety import SafetyLexicon
+
+_SHIFT = np.int64(32)
+
+
+class _TokenIds(dict[str, int]):
+    """Word → token ID map that assigns the next ID to unseen words."""
+
+    def __missing__(self, word: str) -> int:
+        token_id = self[word] = len(self)
+        return token_id
+
+
+class _ResponseTokenIds:
+    """Read-only view of a dataset vocabulary that gives unseen words call-local IDs.
+
+    Scoring a chunk never copies (or grows) the shared vocabulary.
+    """
+
+    __slots__ = ("vocab", "unseen")
+
+    def __init__(self, vocab: dict[str, int]) -> None:
+        self.vocab = vocab
+        self.unseen: dict[str, int] = {}
+
+    def __getitem__(self, word: str) -> int:
+        token_id = self.vocab.get(word)
+        if token_id is None:
+            token_id = self.unseen.get(word)
+            if token_id is None:
+                token_id = self.unseen[word] = len(self.vocab) + len(self.unseen)
+        return token_id
+
+
+@dataclass(slots=True)
+class PreparedReferences:
+    """Tokenized references for one dataset (one entry per case)."""
+
+    references: list[str | None]  # stripped + lowercased; None when absent/empty
+    vocab: dict[str, int]
+    keys: np.ndarray  # unique (case_index << 32 | token_id) per case
+    unique_counts: np.ndarray
+    word_counts: np.ndarray
+
+
+class BatchScorer:
+    def __init__(self, safety: SafetyLexicon | None = None, max_prepared: int = 32) -> None:
+        self.safety = safety or SafetyLexicon.default()
+        self.max_prepared = max_prepared
+        self._prepared: OrderedDict[str, PreparedReferences] = OrderedDict()
+        # Large runs are scored in a worker thread; guard the shared LRU
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Public
+    # ------------------------------------------------------------------
+    def prepare(self, cases: Sequence[EvaluationCase]) -> PreparedReferences:
+        """Tokenize references once; identical datasets hit the LRU."""
+        fingerprint = self._fingerprint(cases)
+        with self._lock:
+            prepared = self._prepared.get(fingerprint)
+            if prepared is not None:
+                self._prepared.move_to_end(fingerprint)
+                return prepared
+
+        references = [(case.reference_answer or "").strip().lower() for case in cases]
+        vocab = _TokenIds()
+        keys, unique_counts, word_counts = self._encode(
+            [ref.split() for ref in references], vocab
+        )
+        prepared = PreparedReferences(
+            references=[ref or None for ref in references],
+            vocab=dict(vocab),
+            keys=keys,
+            unique_counts=unique_counts,
+            word_counts=word_counts,
+        )
+        with self._lock:
+            self._prepared[fingerprint] = prepared
+            while len(self._prepared) > self.max_prepared:
+                self._prepared.popitem(last=False)
+        return prepared
+
+    def score(
+        self,
+        prepared: PreparedReferences,
+        indices: Sequence[int],
+        responses: Sequence[str],
+    ) -> list[CaseScore]:
+        """Score ``responses[k]`` against the reference of case ``indices[k]``."""
+        if not indices:
+            return []
+        idx = np.asarray(indices, dtype=np.int64)
+        refs = [prepared.references[case_index] for case_index in indices]
+        outs = [response.strip().lower() for response in responses]
+
+        # Response tokens unknown to the dataset vocabulary can never overlap a
+        # reference, so they get call-local IDs instead of growing the vocab.
+        out_keys, out_unique, out_words = self._encode(
+            [out.split() for out in outs], _ResponseTokenIds(prepared.vocab), case_ids=idx
+        )
+        overlap = np.bincount(
+            out_keys[_contains_sorted(prepared.keys, out_keys)] >> _SHIFT,
+            minlength=len(prepared.references),
+        )[idx]
+        out_unique = out_unique[idx]
+        ref_unique = prepared.unique_counts[idx]
+        ref_words = prepared.word_counts[idx]
+
+        # Accuracy: exact → 1.0, substring → 0.9 × brevity, else Jaccard × brevity
+        union = ref_unique + out_unique - overlap
+        jaccard = overlap / np.maximum(1, union)
+        brevity = np.clip(ref_words / np.maximum(1, out_words), 0.4, 1.0)
+        has_ref = np.fromiter((ref is not None for ref in refs), dtype=bool, count=len(refs))
+        exact = np.fromiter((ref == out for ref, out in zip(refs, outs, strict=True)), dtype=bool)
+        contains = np.fromiter(
+            (ref is not None and ref in out for ref, out in zip(refs, outs, strict=True)),
+            dtype=bool,
+        )
+        accuracy = np.where(contains, 0.9 * brevity, np.minimum(1.0, jaccard * brevity))
+        accuracy = np.where(exact, 1.0, accuracy)
+        accuracy = np.where(has_ref, accuracy, 0.5)
+
+        # Hallucination: share of response vocabulary absent from the reference,
+        # blended with how much longer the response is than the reference
+        extra_ratio = (out_unique - overlap) / np.maximum(1, out_unique)
+        length_factor = np.minimum(1.0, out_words / np.maximum(1, ref_words * 3))
+        risk = np.clip(extra_ratio * 0.7 + length_factor * 0.3, 0.0, 1.0)
+        risk = np.where(has_ref & (out_words > 0), risk, 0.3)
+
+        scores: list[CaseScore] = []
+        for acc, hallucination, out in zip(accuracy.tolist(), risk.tolist(), outs, strict=True):
+            safety = self.safety.match(out)
+            scores.append(
+                CaseScore(
+                    accuracy=round(acc, 3),
+                    hallucination_risk=round(hallucination, 3),
+                    safety_risk=round(safety.risk, 3),
+                    safety_categories=list(safety.categories),
+                )
+            )
+        return scores
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _encode(
+        rows_of_words: list[list[str]],
+        vocab: _TokenIds | _ResponseTokenIds,
+        case_ids: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Encode rows of words as per-case token-ID sets.
+
+        Returns the sorted unique keys, the unique-token count indexed by case
+        index, and the word count per row (in input order).
+        """
+        rows = case_ids if case_ids is not None else np.arange(len(rows_of_words), dtype=np.int64)
+        word_counts = np.fromiter(map(len, rows_of_words), dtype=np.int64, count=len(rows_of_words))
+        flat = np.fromiter(
+            map(vocab.__getitem__, chain.from_iterable(rows_of_words)),
+            dtype=np.int64,
+            count=int(word_counts.sum()),
+        )
+        keys = _sorted_unique((np.repeat(rows, word_counts) << _SHIFT) | flat)
+        size = int(rows.max()) + 1 if rows.size else 0
+        unique_counts = np.bincount(keys >> _SHIFT, minlength=size)
+        return keys, unique_counts, word_counts
+
+    @staticmethod
+    def _fingerprint(cases: Sequence[EvaluationCase]) -> str:
+        digest = hashlib.sha256()
+        for case in cases:
+            digest.update(case.id.encode("utf-8"))
+            digest.update(b"\x00")
+            digest.update((case.reference_answer or "").encode("utf-8"))
+            digest.update(b"\x01")
+        return digest.hexdigest()
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    """Sort-based unique; faster than the hash path for large int64 key arrays."""
+    if values.size == 0:
+        return values
+    values = np.sort(values)
+    keep = np.empty(values.size, dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def _contains_sorted(haystack: np.ndarray, needles: np.ndarray) -> np.ndarray:
+    """Membership mask of ``needles`` in the sorted array ``haystack``."""
+    if haystack.size == 0:
+        return np.zeros(needles.size, dtype=bool)
+    positions = np.minimum(np.searchsorted(haystack, needles), haystack.size - 1)
+    return haystack[positions] == needles
@@ -0,0 +1,151 @@
+"""Sequential (early-stopping) decisions for the eval gate.
+
+Cases are evaluated in randomized batches. After each batch every gated metric
+gets a confidence interval for the value the *full* run would report, and the
+gate stops as soon as the pass/fail outcome no longer depends on the skipped
+cases at the requested confidence.
+
+The error budget ``1 - confidence`` is split evenly over every look and every
+metric (Bonferroni), so repeatedly peeking at the bounds does not inflate the
+false-decision rate. Cases are sampled without replacement from a finite run,
+so widths shrink with the finite-population correction and reach zero once
+every case has been seen.
+
+- accuracy / hallucination_risk live in [0, 1]: the tighter of Hoeffding–Serfling
+  and an empirical-Bernstein bound (each gets half the budget).
+- latency / cost are unbounded: normal approximation.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from statistics import NormalDist, fmean, stdev
+
+from app.schemas.evaluation import CaseResult, EvalGateThresholds
+
+
+@dataclass(slots=True)
+class Bound:
+    estimate: float
+    lower: float
+    upper: float
+
+
+@dataclass(slots=True)
+class SequentialDecision:
+    passed: bool
+    reasons: list[str]
+    bounds: dict[str, Bound] = field(default_factory=dict)
+
+
+class SequentialGate:
+    def __init__(
+        self,
+        thresholds: EvalGateThresholds,
+        total_cases: int,
+        confidence: float,
+        batch_size: int,
+        min_cases: int,
+    ) -> None:
+        self.thresholds = thresholds
+        self.total_cases = total_cases
+        self.min_cases = min_cases
+        optional = (thresholds.max_latency_ms, thresholds.max_cost_usd)
+        metrics = 2 + sum(limit is not None for limit in optional)
+        looks = max(1, math.ceil(total_cases / batch_size))
+        self.delta = (1.0 - confidence) / (looks * metrics)
+        self.bounds: dict[str, Bound] = {}
+
+    def check(self, results: list[CaseResult]) -> SequentialDecision | None:
+        """Decision once the outcome is settled, else None (evaluate another batch)."""
+        thresholds = self.thresholds
+        failed = sum(1 for result in results if result.error)
+        if thresholds.max_failed_cases is not None and failed > thresholds.max_failed_cases:
+            # Failures only accumulate, so this is final regardless of the rest
+            return SequentialDecision(
+                passed=False,
+                reasons=[
+                    f"failed_cases {failed} exceeds max_failed_cases {thresholds.max_failed_cases}"
+                ],
+                bounds=self.bounds,
+            )
+        if len(results) < self.min_cases:
+            return None
+
+        scored = [result for result in results if not result.error]
+        live = [result for result in scored if not (result.cache_hit or result.batched)]
+        bounds = {
+            "avg_accuracy": self._bounded([r.scores.accuracy for r in scored]),
+            "avg_hallucination_risk": self._bounded([r.scores.hallucination_risk for r in scored]),
+        }
+        if thresholds.max_latency_ms is not None:
+            bounds["avg_latency_ms"] = self._unbounded([r.latency_ms for r in live])
+        if thresholds.max_cost_usd is not None:
+            # Projected total for the full run; failed cases cost nothing
+            per_case = self._unbounded([r.cost_usd for r in scored] + [0.0] * failed)
+            bounds["total_cost_usd"] = Bound(
+                estimate=per_case.estimate * self.total_cases,
+                lower=per_case.lower * self.total_cases,
+                upper=per_case.upper * self.total_cases,
+            )
+        self.bounds = bounds
+
+        limits: dict[str, tuple[float, bool]] = {
+            "avg_accuracy": (thresholds.min_accuracy, True),
+            "avg_hallucination_risk": (thresholds.max_hallucination_risk, False),
+        }
+        if thresholds.max_latency_ms is not None:
+            limits["avg_latency_ms"] = (thresholds.max_latency_ms, False)
+        if thresholds.max_cost_usd is not None:
+            limits["total_cost_usd"] = (thresholds.max_cost_usd, False)
+
+        reasons: list[str] = []
+        settled = True
+        for name, (limit, is_minimum) in limits.items():
+            bound = bounds[name]
+            if is_minimum and bound.upper < limit:
+                reasons.append(
+                    f"{name} upper bound {bound.upper:.3f} is below min {limit:.3f} "
+                    f"after {len(results)}/{self.total_cases} cases"
+                )
+            elif not is_minimum and bound.lower > limit:
+                reasons.append(
+                    f"{name} lower bound {bound.lower:.3f} exceeds max {limit:.3f} "
+                    f"after {len(results)}/{self.total_cases} cases"
+                )
+            elif (bound.lower < limit) if is_minimum else (bound.upper > limit):
+                settled = False
+        if reasons:
+            return SequentialDecision(passed=False, reasons=reasons, bounds=bounds)
+        if settled:
+            return SequentialDecision(passed=True, reasons=[], bounds=bounds)
+        return None
+
+    def _bounded(self, values: list[float]) -> Bound:
+        """Interval for a [0, 1] metric's full-run mean."""
+        n = len(values)
+        if n < 2:
+            return Bound(estimate=fmean(values) if values else 0.0, lower=0.0, upper=1.0)
+        mean = fmean(values)
+        log_term = math.log(4.0 / self.delta)  # half the budget per bound, two-sided
+        hoeffding = math.sqrt(log_term / (2 * n) * (1 - (n - 1) / self.total_cases))
+        bernstein = (
+            math.sqrt(2 * stdev(values) ** 2 * log_term / n) + 7 * log_term / (3 * (n - 1))
+        ) * self._fpc(n)
+        width = min(hoeffding, bernstein)
+        return Bound(estimate=mean, lower=max(0.0, mean - width), upper=min(1.0, mean + width))
+
+    def _unbounded(self, values: list[float]) -> Bound:
+        n = len(values)
+        if n < 2:
+            return Bound(estimate=fmean(values) if values else 0.0, lower=0.0, upper=math.inf)
+        mean = fmean(values)
+        z = NormalDist().inv_cdf(1 - self.delta / 2)
+        width = z * stdev(values) / math.sqrt(n) * self._fpc(n)
+        return Bound(estimate=mean, lower=max(0.0, mean - width), upper=mean + width)
+
+    def _fpc(self, n: int) -> float:
+        if self.total_cases <= 1:
+            return 0.0
+        return math.sqrt(max(0.0, (self.total_cases - n) / (self.total_cases - 1)))
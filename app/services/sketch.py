@@ -0,0 +1,154 @@
+"""Streaming distribution statistics: Welford moments plus a quantile sketch.
+
+``QuantileSketch`` is a DDSketch-style log-bucketed histogram: a value ``x`` lands
+in bucket ``ceil(log_γ x)`` with ``γ = (1 + α) / (1 − α)``, so every reported
+quantile is within relative error ``α`` of the true one. Buckets are plain
+counts, so sketches merge exactly by adding counts — per-run sketches stored in
+run artifacts can be combined into fleet-wide percentiles without per-case data.
+The Welford state (count, mean, M2, min, max) is persisted unrounded next to
+the bins, so merged moments match a single pass instead of drifting with the
+rounding of the displayed fields.
+"""
+
+from __future__ import annotations
+
+import math
+
+from app.schemas.evaluation import DistributionSummary, WelfordState
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class QuantileSketch:
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0.0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + 1
+
+    def merge(self, other: QuantileSketch) -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy.")
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                # Bucket midpoint (in relative terms) keeps the error within α
+                return 2 * self._gamma**key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.bins) / (self._gamma + 1)
+
+
+class Distribution:
+    """Count/mean/variance (Welford) and percentiles of a stream of values."""
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.sketch.add(value)
+
+    def merge(self, other: Distribution) -> None:
+        """Chan et al. parallel update; exact for count/mean/variance."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def summary(self, ndigits: int = 2, include_sketch: bool = True) -> DistributionSummary | None:
+        if self.count == 0:
+            return None
+        p50, p90, p95, p99 = (round(self.sketch.quantile(q) or 0.0, ndigits) for q in QUANTILES)
+        return DistributionSummary(
+            count=self.count,
+            mean=round(self.mean, ndigits),
+            stddev=round(self.stddev, ndigits),
+            min=round(self.min, ndigits),
+            max=round(self.max, ndigits),
+            p50=p50,
+            p90=p90,
+            p95=p95,
+            p99=p99,
+            relative_accuracy=self.sketch.relative_accuracy if include_sketch else None,
+            zero_count=self.sketch.zero_count if include_sketch else None,
+            bins=(
+                {str(key): count for key, count in sorted(self.sketch.bins.items())}
+                if include_sketch
+                else None
+            ),
+            state=(
+                WelfordState(
+                    count=self.count, mean=self.mean, m2=self._m2, min=self.min, max=self.max
+                )
+                if include_sketch
+                else None
+            ),
+        )
+
+    @classmethod
+    def from_summary(cls, summary: DistributionSummary) -> Distribution:
+        """Rebuild a mergeable distribution from a persisted summary (needs its sketch).
+
+        Moments come from the unrounded ``state``; summaries stored before it
+        existed fall back to the rounded mean/stddev/min/max.
+        """
+        if summary.bins is None or summary.relative_accuracy is None:
+            raise ValueError("Distribution summary was stored without its sketch.")
+        dist = cls(summary.relative_accuracy)
+        state = summary.state or WelfordState(
+            count=summary.count,
+            mean=summary.mean,
+            m2=summary.stddev**2 * (summary.count - 1),
+            min=summary.min,
+            max=summary.max,
+        )
+        dist.count = state.count
+        dist.mean = state.mean
+        dist._m2 = state.m2
+        dist.min = state.min
+        dist.max = state.max
+        dist.sketch.count = summary.count
+        dist.sketch.zero_count = summary.zero_count or 0
+        dist.sketch.bins = {int(key): count for key, count in summary.bins.items()}
+        return dist
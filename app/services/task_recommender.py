@@ -6,6 +6,7 @@ import yaml
 
 from app.schemas.evaluation import RunEvalResponse
 from app.services.benchmark import BenchmarkService
+from app.services.evaluator import ProgressCallback
 from app.services.model_registry import ModelRegistry
 
 
@@ -88,6 +89,12 @@ class TaskRecommender:
         model_id: str | None = None,
         temperature: float = 0.0,
         max_tokens: int = 512,
+        concurrency: int | None = None,
+        use_cache: bool = True,
+        stream: bool = False,
+        hedge: bool | None = None,
+        execution: str = "online",
+        progress: ProgressCallback | None = None,
     ) -> tuple[dict, RunEvalResponse]:
         task = self.get_task(task_id)
         # Use provided model or first available recommended model
@@ -107,5 +114,11 @@ class TaskRecommender:
             model_id=model_id,
             temperature=temperature,
             max_tokens=max_tokens,
+            concurrency=concurrency,
+            use_cache=use_cache,
+            stream=stream,
+            hedge=hedge,
+            execution=execution,
+            progress=progress,
         )
         return task, run
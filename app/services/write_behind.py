@@ -0,0 +1,198 @@
+"""Durable write-behind pipeline for slow or unreliable sinks (e.g. PostgreSQL).
+
+``submit`` appends the payload to a local SQLite outbox and returns; a dedicated
+worker thread drains the outbox into ``sink`` oldest-first and deletes each row
+only after the sink accepted it. A failing sink is retried with exponential
+backoff, so writes are replayed once it recovers instead of being dropped. Rows
+left over at shutdown or after a crash are replayed on the next start.
+
+A row the sink rejects ``max_attempts`` times in a row, or with an error
+``is_transient`` says retrying cannot fix (bad data, schema mismatch), is moved
+to the ``dead_letter`` table with the error text, so one poison write does not
+hold back every write queued behind it.
+
+Backpressure: once ``max_pending`` rows are waiting, ``submit`` blocks for up to
+``backpressure_timeout`` seconds for the worker to catch up. If the sink is down
+for longer than that, the outbox keeps growing on disk rather than stalling callers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehind:
+    def __init__(
+        self,
+        name: str,
+        sink: Callable[[str], None],
+        outbox_path: Path,
+        max_pending: int = 1000,
+        backpressure_timeout: float = 5.0,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 60.0,
+        max_attempts: int = 10,
+        is_transient: Callable[[Exception], bool] = lambda exc: True,
+    ) -> None:
+        self.name = name
+        self.sink = sink
+        self.max_attempts = max_attempts
+        self.is_transient = is_transient
+        self.max_pending = max_pending
+        self.backpressure_timeout = backpressure_timeout
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        outbox_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(outbox_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL, payload TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dead_letter ("
+            "id INTEGER PRIMARY KEY, key TEXT NOT NULL, payload TEXT NOT NULL, "
+            "error TEXT NOT NULL, attempts INTEGER NOT NULL, failed_at TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        # Rows in the outbox; kept in memory so wait_for predicates stay cheap
+        self._count: int = self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._drain, name=f"write-behind-{self.name}", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, key: str, payload: str) -> None:
+        with self._changed:
+            if not self._changed.wait_for(
+                lambda: self._pending() < self.max_pending, timeout=self.backpressure_timeout
+            ):
+                logger.warning(
+                    "Write-behind %s: %d writes pending – spilling %s to the outbox",
+                    self.name,
+                    self._pending(),
+                    key,
+                )
+            self._conn.execute("INSERT INTO outbox (key, payload) VALUES (?, ?)", (key, payload))
+            self._conn.commit()
+            self._count += 1
+            self._changed.notify_all()
+
+    async def submit_async(self, key: str, payload: str) -> None:
+        """``submit`` off the event loop (it may wait on backpressure)."""
+        await asyncio.to_thread(self.submit, key, payload)
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending()
+
+    def dead_letters(self) -> int:
+        """Writes given up on; they stay in the ``dead_letter`` table for inspection."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM dead_letter").fetchone()[0]
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until the outbox is empty; False if ``timeout`` expired first."""
+        with self._changed:
+            return self._changed.wait_for(lambda: self._pending() == 0, timeout=timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush for up to ``timeout`` seconds, then stop; the rest replays on next start."""
+        if self._thread is not None:
+            if not self.flush(timeout):
+                logger.warning(
+                    "Write-behind %s: %d writes left in the outbox for replay",
+                    self.name,
+                    self.pending(),
+                )
+            with self._changed:
+                self._stopping = True
+                self._changed.notify_all()
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            self._conn.close()
+
+    def _drain(self) -> None:
+        delay = self.retry_base_delay
+        attempts = 0
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: self._stopping or self._pending() > 0)
+                if self._stopping:
+                    return
+                row = self._conn.execute(
+                    "SELECT id, key, payload FROM outbox ORDER BY id LIMIT 1"
+                ).fetchone()
+            row_id, key, payload = row
+            try:
+                self.sink(payload)
+            except Exception as exc:  # noqa: BLE001
+                attempts += 1
+                if attempts >= self.max_attempts or not self.is_transient(exc):
+                    self._dead_letter(row_id, key, payload, exc, attempts)
+                    attempts = 0
+                    delay = self.retry_base_delay
+                    continue
+                logger.warning(
+                    "Write-behind %s: write of %s failed – retrying in %.1fs",
+                    self.name,
+                    key,
+                    delay,
+                    exc_info=True,
+                )
+                deadline = time.monotonic() + delay
+                with self._changed:
+                    self._changed.wait_for(
+                        lambda: self._stopping, timeout=max(0.0, deadline - time.monotonic())
+                    )
+                delay = min(self.retry_max_delay, delay * 2)
+                continue
+            delay = self.retry_base_delay
+            attempts = 0
+            with self._changed:
+                self._conn.execute("DELETE FROM outbox WHERE id = ?", (row_id,))
+                self._conn.commit()
+                self._count -= 1
+                self._changed.notify_all()
+
+    def _dead_letter(
+        self, row_id: int, key: str, payload: str, exc: Exception, attempts: int
+    ) -> None:
+        logger.error(
+            "Write-behind %s: giving up on %s after %d attempts – moved to dead_letter",
+            self.name,
+            key,
+            attempts,
+            exc_info=exc,
+        )
+        with self._changed:
+            self._conn.execute(
+                "INSERT INTO dead_letter (id, key, payload, error, attempts, failed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (row_id, key, payload, repr(exc), attempts, datetime.now(tz=UTC).isoformat()),
+            )
+            self._conn.execute("DELETE FROM outbox WHERE id = ?", (row_id,))
+            self._conn.commit()
+            self._count -= 1
+            self._changed.notify_all()
+
+    def _pending(self) -> int:
+        return self._count
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import json
 import sys
 from pathlib import Path
@@ -32,6 +33,16 @@ def load_cases(path: Path) -> list[dict[str, str]]:
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the eval gate against the baseline dataset.")
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Stop early once the pass/fail outcome is statistically settled.",
+    )
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
     dataset_path = Path("datasets/baseline_v1.jsonl")
     cases = load_cases(dataset_path)
 
@@ -42,6 +53,8 @@ def main() -> int:
         "cases": cases,
         "thresholds": {"min_accuracy": 0.0, "max_hallucination_risk": 1.0},
     }
+    if args.sequential:
+        payload["sequential"] = {"confidence": args.confidence, "seed": args.seed}
 
     client = TestClient(create_app())
     response = client.post("/api/v1/eval-gate", json=payload)
@@ -51,6 +64,14 @@ def main() -> int:
 
     result = response.json()
     print(json.dumps(result["run"]["summary"], indent=2))
+    if result.get("sequential"):
+        report = result["sequential"]
+        print(
+            f"Sequential gate: evaluated {report['cases_evaluated']} cases, "
+            f"skipped {report['cases_skipped']} "
+            f"(~${report['estimated_cost_saved_usd']:.4f}, "
+            f"~{report['estimated_time_saved_ms']:.0f} ms saved)"
+        )
     if not result["passed"]:
         print("Eval gate failed:")
         for reason in result["reasons"]:
@@ -1,36 +1,49 @@
 #!/usr/bin/env python3
+"""Export one row per stored run to CSV for Power BI (any RUN_STORE_BACKEND)."""
 import csv
-import json
+import sys
+from datetime import UTC, datetime
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import get_settings  # noqa: E402
+from app.services.run_log import create_run_store  # noqa: E402
+
+
+def _timestamp(created_at: str | None) -> str:
+    if not created_at:
+        return ""
+    return datetime.fromisoformat(created_at).astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+
 
 def main() -> int:
-    runs_dir = Path("artifacts/runs")
     out_dir = Path("artifacts/exports")
     out_dir.mkdir(parents=True, exist_ok=True)
     out_file = out_dir / "evaluations.csv"
 
     rows: list[dict[str, object]] = []
-    if runs_dir.exists():
-        for path in sorted(runs_dir.glob("*.json")):
-            payload = json.loads(path.read_text(encoding="utf-8"))
-            summary = payload.get("summary", {})
-            version_info = payload.get("version_info", {})
-            rows.append(
-                {
-                    "run_id": payload.get("run_id"),
-                    "timestamp_utc": path.name.split("_")[0] if "_" in path.name else "",
-                    "model_id": payload.get("model_id"),
-                    "prompt_version": version_info.get("prompt_version"),
-                    "dataset_version": version_info.get("dataset_version"),
-                    "avg_accuracy": summary.get("avg_accuracy"),
-                    "avg_hallucination_risk": summary.get("avg_hallucination_risk"),
-                    "avg_safety_risk": summary.get("avg_safety_risk"),
-                    "avg_latency_ms": summary.get("avg_latency_ms"),
-                    "total_cost_usd": summary.get("total_cost_usd"),
-                    "total_cases": summary.get("total_cases"),
-                }
-            )
+    # Headers only: the catalog pages through runs without loading per-case results
+    for stored in create_run_store(get_settings()).iter_runs():
+        header = stored.header
+        summary = header.summary
+        rows.append(
+            {
+                "run_id": header.run_id,
+                "timestamp_utc": _timestamp(header.created_at),
+                "model_id": header.model_id,
+                "prompt_version": header.version_info.prompt_version,
+                "dataset_version": header.version_info.dataset_version,
+                "avg_accuracy": summary.avg_accuracy,
+                "avg_hallucination_risk": summary.avg_hallucination_risk,
+                "avg_safety_risk": summary.avg_safety_risk,
+                "avg_latency_ms": summary.avg_latency_ms,
+                "total_cost_usd": summary.total_cost_usd,
+                "total_cases": summary.total_cases,
+            }
+        )
 
     fieldnames = [
         "run_id",
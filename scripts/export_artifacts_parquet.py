@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Export run- and case-level tables to partitioned Parquet (incremental by default)."""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import get_settings  # noqa: E402
+from app.services.columnar_export import ColumnarExporter  # noqa: E402
+from app.services.run_log import create_run_store  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--out", default="artifacts/exports/parquet", help="Output directory.")
+    parser.add_argument(
+        "--full", action="store_true", help="Ignore the watermark and re-export everything."
+    )
+    parser.add_argument("--chunk-runs", type=int, default=200, help="Runs held in memory at once.")
+    args = parser.parse_args()
+
+    if not ColumnarExporter.available():
+        print('pyarrow is not installed – run: pip install ".[parquet]"', file=sys.stderr)
+        return 1
+    exporter = ColumnarExporter(
+        run_store=create_run_store(get_settings()),
+        out_dir=Path(args.out),
+        chunk_runs=args.chunk_runs,
+    )
+    stats = exporter.export(full=args.full)
+    print(f"Exported {stats.runs} runs / {stats.cases} cases in {stats.files} files -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
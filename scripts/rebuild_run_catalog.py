@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""Re-index every run artifact into the run catalog (e.g. after copying artifacts in)."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.core.config import get_settings  # noqa: E402
+from app.services.run_log import create_run_store  # noqa: E402
+
+
+def main() -> int:
+    store = create_run_store(get_settings())
+    count = store.rebuild_catalog()
+    print(f"Indexed {count} runs -> {store.catalog.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
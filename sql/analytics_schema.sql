@@ -10,11 +10,14 @@ CREATE TABLE IF NOT EXISTS runs (
     avg_accuracy NUMERIC(5,4) NOT NULL,
     avg_hallucination_risk NUMERIC(5,4) NOT NULL,
     avg_safety_risk NUMERIC(5,4) NOT NULL,
-    avg_latency_ms NUMERIC(10,2) NOT NULL,
+    avg_latency_ms NUMERIC(10,2),
     total_cost_usd NUMERIC(12,6) NOT NULL,
     total_cases INTEGER NOT NULL
 );
 
+-- Runs served entirely from cache or a batch API have no live latency
+ALTER TABLE runs ALTER COLUMN avg_latency_ms DROP NOT NULL;
+
 CREATE TABLE IF NOT EXISTS evaluations (
     id BIGSERIAL PRIMARY KEY,
     run_id UUID NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
@@ -0,0 +1,35 @@
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from app.core.config import get_settings
+
+ARTIFACT_ENV = {
+    "RUN_ARTIFACT_DIR": "runs",
+    "GENERATION_CACHE_PATH": "cache/generations.sqlite3",
+    "JOB_STORE_PATH": "jobs/jobs.sqlite3",
+    "DB_OUTBOX_PATH": "outbox/postgres.sqlite3",
+    "CASE_ANALYTICS_PATH": "analytics/cases.duckdb",
+}
+
+
+def _point_artifacts_at(root: Path) -> None:
+    for name, relative in ARTIFACT_ENV.items():
+        os.environ[name] = str(root / relative)
+    get_settings.cache_clear()
+
+
+# ``app.main`` builds a module-level app on import, before any fixture runs.
+_point_artifacts_at(Path(tempfile.mkdtemp(prefix="llm-eval-tests-")))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_artifacts(tmp_path, monkeypatch):
+    """Every test gets its own artifact tree, so the suite never writes into the repo."""
+    for name, relative in ARTIFACT_ENV.items():
+        monkeypatch.setenv(name, str(tmp_path / "artifacts" / relative))
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+import httpx
+
+from app.adapters.base import ModelConfig, Provider
+from app.adapters.http_pool import HTTPClientPool
+from app.adapters.openai_adapter import OpenAIAdapter
+
+
+def _sse(*events: dict | str) -> bytes:
+    lines = [f"data: {e if isinstance(e, str) else json.dumps(e)}\n\n" for e in events]
+    return "".join(lines).encode()
+
+
+def test_openai_stream_generate_parses_chunks_and_usage() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        assert body["stream"] is True
+        assert body["stream_options"] == {"include_usage": True}
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content=_sse(
+                {"choices": [{"delta": {"content": "Par"}}]},
+                {"choices": [{"delta": {"content": "is"}}]},
+                {"choices": [], "usage": {"prompt_tokens": 7, "completion_tokens": 2}},
+                "[DONE]",
+            ),
+        )
+
+    pool = HTTPClientPool(transport=httpx.MockTransport(handler))
+    model = ModelConfig(id="gpt", provider=Provider.OPENAI, api_model="gpt-4o-mini")
+    adapter = OpenAIAdapter(model=model, api_key="test", http_pool=pool)
+
+    response = asyncio.run(adapter.stream_generate("Capital of France?"))
+    assert response.text == "Paris"
+    assert response.prompt_tokens == 7
+    assert response.completion_tokens == 2
+    assert response.ttft_ms is not None
+    assert response.inter_token_latency_ms is not None
+
+
+def test_openai_stream_generate_surfaces_http_errors() -> None:
+    pool = HTTPClientPool(
+        transport=httpx.MockTransport(lambda request: httpx.Response(401, text="bad key"))
+    )
+    model = ModelConfig(id="gpt", provider=Provider.OPENAI, api_model="gpt-4o-mini")
+    adapter = OpenAIAdapter(model=model, api_key="test", http_pool=pool)
+    try:
+        asyncio.run(adapter.stream_generate("hi"))
+    except ValueError as exc:
+        assert "401" in str(exc)
+    else:
+        raise AssertionError("expected ValueError")
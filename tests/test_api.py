@@ -186,3 +186,364 @@ def test_openrouter_models_listed() -> None:
     assert "openrouter/meta-llama/llama-3.3-70b-instruct" in model_ids
     assert "openrouter/mistralai/mistral-large-2" in model_ids
     assert "openrouter/google/gemini-2.0-flash" in model_ids
+
+
+def test_run_eval_concurrent_keeps_case_order() -> None:
+    client = TestClient(create_app())
+    cases = [
+        {"id": f"c{i}", "question": f"Question {i}?", "reference_answer": str(i)} for i in range(20)
+    ]
+    response = client.post(
+        "/api/v1/run-eval",
+        json={"model_id": "mock-local", "concurrency": 4, "cases": cases},
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert [r["case_id"] for r in payload["results"]] == [c["id"] for c in cases]
+    assert payload["summary"]["failed_cases"] == 0
+
+
+def test_run_eval_records_failing_case_as_error() -> None:
+    app = create_app()
+    registry = app.state.registry
+    mock_adapter = registry.get_adapter("mock-local")
+
+    class FlakyAdapter(type(mock_adapter)):
+        async def generate(self, prompt: str, **kwargs):  # type: ignore[override]
+            if "boom" in prompt:
+                raise ValueError("provider exploded")
+            return await super().generate(prompt, **kwargs)
+
+    registry.get_adapter = lambda model_id: FlakyAdapter(model=registry.get_model(model_id))
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/run-eval",
+        json={
+            "model_id": "mock-local",
+            "cases": [
+                {"id": "ok", "question": "Capital of France?", "reference_answer": "Paris"},
+                {"id": "bad", "question": "boom"},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["summary"]["total_cases"] == 2
+    assert payload["summary"]["failed_cases"] == 1
+    assert payload["results"][0]["error"] is None
+    assert payload["results"][1]["error"] == "provider exploded"
+
+
+def test_run_eval_rejects_template_with_unknown_placeholder() -> None:
+    client = TestClient(create_app())
+    body = {
+        "model_id": "mock-local",
+        "prompt_template": "Q: {question} json {x}",
+        "cases": [{"id": "c1", "question": "Hi?"}],
+    }
+    for path in ("/api/v1/run-eval", "/api/v1/run-eval/stream"):
+        response = client.post(path, json=body)
+        assert response.status_code == 400
+        assert "'x'" in response.json()["detail"]
+
+
+def test_worker_crash_fails_the_run_instead_of_hanging() -> None:
+    app = create_app()
+    evaluator = app.state.evaluator
+
+    async def crash(*args, **kwargs):
+        raise RuntimeError("worker died")
+
+    evaluator._run_case = crash
+    client = TestClient(app, raise_server_exceptions=False)
+    response = client.post(
+        "/api/v1/run-eval",
+        json={"model_id": "mock-local", "cases": [{"id": "c1", "question": "Hi?"}]},
+    )
+    assert response.status_code == 500
+
+
+def test_compare_reports_per_model_timings() -> None:
+    client = TestClient(create_app())
+    response = client.post(
+        "/api/v1/compare",
+        json={
+            "model_ids": ["mock-local", "mock-local"],
+            "cases": [{"id": "c1", "question": "What is 5 + 7?", "reference_answer": "12"}],
+        },
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert len(payload["runs"]) == 2
+    assert [t["run_id"] for t in payload["timings"]] == [r["run_id"] for r in payload["runs"]]
+    assert payload["total_wall_clock_ms"] is not None
+    assert payload["sequential_wall_clock_ms"] >= 0.0
+
+
+def test_compare_rejects_unknown_model_before_running() -> None:
+    client = TestClient(create_app())
+    response = client.post(
+        "/api/v1/compare",
+        json={
+            "model_ids": ["mock-local", "does-not-exist"],
+            "cases": [{"id": "c1", "question": "What is 5 + 7?"}],
+        },
+    )
+    assert response.status_code == 400
+
+
+def test_compare_keeps_completed_runs_when_one_model_fails() -> None:
+    app = create_app()
+    registry = app.state.registry
+    mock_cls = type(registry.get_adapter("mock-local"))
+    get_adapter = registry.get_adapter
+
+    class Down(mock_cls):
+        async def generate(self, prompt: str, **kwargs):  # type: ignore[override]
+            raise RuntimeError("provider down")
+
+    registry.get_adapter = lambda model_id: (
+        Down(model=registry.get_model(model_id))
+        if model_id == "gpt-4o-mini"
+        else get_adapter(model_id)
+    )
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/compare",
+        json={
+            "model_ids": ["mock-local", "gpt-4o-mini"],
+            "cases": [{"id": "c1", "question": "What is 5 + 7?", "reference_answer": "12"}],
+        },
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert [run["model_id"] for run in payload["runs"]] == ["mock-local"]
+    [error] = payload["errors"]
+    assert error["model_id"] == "gpt-4o-mini"
+    assert "provider down" in error["error"]
+
+
+def test_http_pool_is_shared_and_closed_on_shutdown() -> None:
+    from app.adapters.base import Provider
+
+    app = create_app()
+    with TestClient(app):
+        pool = app.state.http_pool
+        adapter = app.state.registry.get_adapter("gpt-4o-mini")
+        client = pool.get(Provider.OPENAI)
+        assert adapter.http_pool is pool
+        assert pool.get(Provider.OPENAI) is client
+    assert client.is_closed
+
+
+def test_repeated_run_is_served_from_generation_cache() -> None:
+    import uuid
+
+    client = TestClient(create_app())
+    body = {
+        "model_id": "mock-local",
+        "cases": [{"id": "c1", "question": f"Unique question {uuid.uuid4()}?"}],
+    }
+    first = client.post("/api/v1/run-eval", json=body).json()
+    second = client.post("/api/v1/run-eval", json=body).json()
+    bypass = client.post("/api/v1/run-eval", json={**body, "use_cache": False}).json()
+
+    assert first["results"][0]["cache_hit"] is False
+    assert second["results"][0]["cache_hit"] is True
+    assert second["results"][0]["response"] == first["results"][0]["response"]
+    assert second["summary"]["cache_hits"] == 1
+    assert bypass["results"][0]["cache_hit"] is False
+
+
+def test_fully_cached_rerun_costs_nothing() -> None:
+    import uuid
+
+    app = create_app()
+    pricing = app.state.registry.get_model("mock-local").pricing
+    pricing.prompt_per_1k = pricing.completion_per_1k = 1.0
+    client = TestClient(app)
+    body = {
+        "model_id": "mock-local",
+        "cases": [{"id": f"c{i}", "question": f"Priced {i} {uuid.uuid4()}?"} for i in range(3)],
+    }
+    first = client.post("/api/v1/run-eval", json=body).json()
+    second = client.post("/api/v1/run-eval", json=body).json()
+
+    assert first["summary"]["total_cost_usd"] > 0
+    assert second["summary"]["cache_hits"] == 3
+    assert second["summary"]["total_cost_usd"] == 0.0
+    assert all(result["cost_usd"] == 0.0 for result in second["results"])
+    # Lookups are not provider latency: a fully cached run has none to report
+    assert first["summary"]["avg_latency_ms"] is not None
+    assert second["summary"]["avg_latency_ms"] is None
+
+
+def test_run_eval_stream_ndjson_emits_cases_then_complete() -> None:
+    import json
+
+    client = TestClient(create_app())
+    cases = [{"id": f"c{i}", "question": f"Stream question {i}?"} for i in range(5)]
+    response = client.post(
+        "/api/v1/run-eval/stream", json={"model_id": "mock-local", "cases": cases}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+    case_events = [e for e in events if e["event"] == "case"]
+    assert len(case_events) == 5
+    assert sorted(e["result"]["case_id"] for e in case_events) == [c["id"] for c in cases]
+    assert case_events[-1]["summary"]["total_cases"] == 5
+    assert events[-1]["event"] == "complete"
+    assert events[-1]["summary"]["total_cases"] == 5
+    assert "results" not in events[-1]
+
+
+def test_run_eval_stream_sse_format_and_validation() -> None:
+    client = TestClient(create_app())
+    response = client.post(
+        "/api/v1/run-eval/stream?format=sse",
+        json={"model_id": "mock-local", "cases": [{"id": "c1", "question": "Hi?"}]},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "event: case\ndata: " in response.text
+    assert "event: complete\ndata: " in response.text
+
+    bad = client.post(
+        "/api/v1/run-eval/stream",
+        json={"model_id": "unknown-model", "cases": [{"id": "c1", "question": "Hi?"}]},
+    )
+    assert bad.status_code == 400
+
+
+def test_run_eval_stream_rejects_batch_execution() -> None:
+    client = TestClient(create_app())
+    response = client.post(
+        "/api/v1/run-eval/stream",
+        json={
+            "model_id": "mock-local",
+            "execution": "batch",
+            "cases": [{"id": "c1", "question": "Hi?"}],
+        },
+    )
+    assert response.status_code == 400
+    assert "batch" in response.json()["detail"]
+
+
+def test_run_eval_stream_ends_with_error_event_when_a_worker_dies() -> None:
+    import json
+
+    app = create_app()
+    evaluator = app.state.evaluator
+
+    async def dying_run_case(*args):
+        raise RuntimeError("worker exploded")
+
+    evaluator._run_case = dying_run_case
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/run-eval/stream",
+        json={"model_id": "mock-local", "cases": [{"id": "c1", "question": "Hi?"}]},
+    )
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines() if line]
+    assert events[-1]["event"] == "error"
+    assert "worker exploded" in events[-1]["detail"]
+
+
+def test_streamed_sampled_run_checkpoints_its_sampling_plan(tmp_path) -> None:
+    import asyncio
+
+    from app.schemas.evaluation import EvaluationCase, RunEvalRequest
+    from app.services.run_store import RunStore
+    from app.services.sampling import draw_sample
+
+    evaluator = create_app().state.evaluator
+    evaluator.run_store = RunStore(tmp_path)
+    cases, plan = draw_sample(
+        [EvaluationCase(id=f"c{i}", question=f"q{i}") for i in range(10)], size=3, seed=7
+    )
+    ctx = evaluator.prepare_run(RunEvalRequest(model_id="mock-local", cases=cases))
+    ctx.sampling = plan
+
+    async def first_event():
+        stream = evaluator.stream_eval(ctx)
+        event = await anext(stream)
+        await stream.aclose()
+        return event
+
+    asyncio.run(first_event())
+    checkpoint = evaluator.run_store.load_checkpoint(ctx.run_id)
+    assert checkpoint.sampling == plan
+    assert checkpoint.sampling.seed == 7
+
+
+def test_streaming_generation_records_token_timings() -> None:
+    client = TestClient(create_app())
+    response = client.post(
+        "/api/v1/run-eval",
+        json={
+            "model_id": "mock-local",
+            "stream": True,
+            "use_cache": False,
+            "prompt_version": "stream-timing",
+            "cases": [{"id": "c1", "question": "Name three primary colors please."}],
+        },
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    result = payload["results"][0]
+    assert result["ttft_ms"] is not None
+    assert result["tokens_per_second"] is None or result["tokens_per_second"] > 0
+    assert payload["summary"]["avg_ttft_ms"] is not None
+
+    metrics = client.get("/api/v1/metrics?prompt_version=stream-timing&limit=5").json()
+    assert metrics["summary"]["avg_ttft_ms"] is not None
+
+
+def _wait_for_job(client: TestClient, job_id: str, timeout: float = 10.0) -> dict:
+    import time
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/v1/jobs/{job_id}").json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_benchmark_job_runs_in_background_and_reports_progress() -> None:
+    app = create_app()
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/live") as ws:
+            response = client.post(
+                "/api/v1/jobs/benchmarks/run",
+                json={"benchmark": "mmlu_sample", "model_id": "mock-local"},
+            )
+            assert response.status_code == 202
+            job = response.json()
+            assert job["status"] == "queued"
+            assert ws.receive_json()["event"] == "job_update"
+
+            done = _wait_for_job(client, job["job_id"])
+            assert done["status"] == "succeeded"
+            assert done["completed"] == done["total"] == 10
+            assert len(done["run_ids"]) == 1
+        listed = client.get("/api/v1/jobs?status=succeeded").json()["jobs"]
+        assert job["job_id"] in [item["job_id"] for item in listed]
+        assert client.get("/api/v1/jobs/does-not-exist").status_code == 404
+
+
+def test_compare_job_failure_is_recorded() -> None:
+    with TestClient(create_app()) as client:
+        job = client.post(
+            "/api/v1/jobs/compare",
+            json={
+                "model_ids": ["mock-local", "does-not-exist"],
+                "cases": [{"id": "c1", "question": "What is 5 + 7?"}],
+            },
+        ).json()
+        done = _wait_for_job(client, job["job_id"])
+        assert done["status"] == "failed"
+        assert "does-not-exist" in done["error"]
@@ -0,0 +1,37 @@
+import pytest
+
+from app.services.artifact_codec import decode_cases, decode_header, get_codec
+from app.services.run_store import RunStore
+from tests.test_run_layout import _run
+
+
+def test_binary_codec_round_trips_and_is_auto_detected() -> None:
+    pytest.importorskip("msgpack")
+    pytest.importorskip("zstandard")
+    codec = get_codec("msgpack-zstd")
+    rows = [{"case_id": f"c{i}", "response": "same long answer " * 50} for i in range(100)]
+
+    encoded = codec.encode_cases(rows)
+    assert decode_cases(encoded) == rows
+    assert len(encoded) < len(get_codec("json").encode_cases(rows)) / 10
+    assert decode_header(codec.encode_header({"run_id": "r"})) == {"run_id": "r"}
+
+
+def test_store_reads_mixed_formats(tmp_path) -> None:
+    pytest.importorskip("msgpack")
+    pytest.importorskip("zstandard")
+    RunStore(tmp_path).save(_run("json-run"))
+    binary = RunStore(tmp_path, codec="msgpack-zstd")
+    path = binary.save(_run("binary-run"))
+    assert path.suffix == ".mpz"
+
+    assert binary.rebuild_catalog() == 2
+    for run_id in ("json-run", "binary-run"):
+        run = binary.get_run(run_id)
+        assert [r.case_id for r in run.results] == ["c0", "c1"]
+        assert run.results[0].scores.accuracy == 1.0
+
+
+def test_unknown_codec_is_rejected(tmp_path) -> None:
+    with pytest.raises(ValueError):
+        RunStore(tmp_path, codec="xml")
@@ -0,0 +1,257 @@
+import asyncio
+import json
+
+import httpx
+
+from app.adapters.base import Provider
+from app.adapters.batch import AnthropicBatchBackend, BatchItem, OpenAIBatchBackend
+from app.adapters.http_pool import HTTPClientPool
+from app.main import create_app
+from app.schemas.evaluation import EvaluationCase, RunEvalRequest
+from app.services.batch_runner import BatchRunner
+from app.services.run_store import RunStore
+
+
+class FakeOpenAIBatchServer:
+    """Just enough of the OpenAI Files + Batches API for one batch."""
+
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+        self.polls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/files" and request.method == "POST":
+            for line in request.content.split(b"\n"):
+                line = line.strip()
+                if line.startswith(b'{"custom_id"'):
+                    self.requests.append(json.loads(line))
+            return httpx.Response(200, json={"id": "file-in"})
+        if path == "/v1/batches" and request.method == "POST":
+            assert json.loads(request.content)["input_file_id"] == "file-in"
+            return httpx.Response(200, json={"id": "batch_1", "status": "validating"})
+        if path == "/v1/batches/batch_1":
+            self.polls += 1
+            if self.polls < 2:
+                return httpx.Response(200, json={"id": "batch_1", "status": "in_progress"})
+            return httpx.Response(
+                200,
+                json={
+                    "id": "batch_1",
+                    "status": "completed",
+                    "output_file_id": "file-out",
+                    "error_file_id": "file-err",
+                },
+            )
+        if path in ("/v1/files/file-out/content", "/v1/files/file-err/content"):
+            want_errors = "err" in path
+            rows = []
+            for item in self.requests:
+                prompt = item["body"]["messages"][-1]["content"]
+                if ("boom" in prompt) != want_errors:
+                    continue
+                if want_errors:
+                    response = {"status_code": 400, "body": {"error": {"message": "bad"}}}
+                else:
+                    response = {
+                        "status_code": 200,
+                        "body": {
+                            "choices": [{"message": {"content": f"echo: {prompt}"}}],
+                            "usage": {"prompt_tokens": 1000, "completion_tokens": 1000},
+                        },
+                    }
+                rows.append(json.dumps({"custom_id": item["custom_id"], "response": response}))
+            return httpx.Response(200, text="\n".join(rows))
+        return httpx.Response(404, text=f"unexpected {request.method} {path}")
+
+
+def test_batch_execution_maps_results_back_to_cases() -> None:
+    app = create_app()
+    evaluator = app.state.evaluator
+    server = FakeOpenAIBatchServer()
+    backend = OpenAIBatchBackend(
+        api_key="test",
+        base_url="https://fake-batch.local/v1",
+        http_pool=HTTPClientPool(transport=httpx.MockTransport(server)),
+    )
+    evaluator.batch = BatchRunner({Provider.OPENAI: backend}, poll_interval=0.01)
+
+    request = RunEvalRequest(
+        model_id="gpt-4o-mini",
+        execution="batch",
+        use_cache=False,
+        cases=[
+            EvaluationCase(id="a/1", question="Capital of France?"),
+            EvaluationCase(id="b 2", question="boom"),
+            EvaluationCase(id="c", question="What is 5 + 7?"),
+        ],
+    )
+    run = asyncio.run(evaluator.run_eval(request))
+
+    assert [item["custom_id"] for item in server.requests] == ["case-0", "case-1", "case-2"]
+    assert server.polls >= 2
+    first, failed, last = run.results
+    assert first.response == "echo: Capital of France?"
+    assert first.batched is True
+    # gpt-4o-mini list price for 1k+1k tokens is 0.0032; batch pricing halves it
+    assert first.cost_usd == 0.0016
+    assert failed.error is not None and "400" in failed.error
+    assert last.response == "echo: What is 5 + 7?"
+    assert run.summary.failed_cases == 1
+    # Batch turnaround is not per-call latency: kept out of the latency stats
+    assert first.latency_ms > 0
+    assert run.summary.batched_cases == 2
+    assert run.summary.avg_latency_ms is None
+    assert run.summary.latency is None
+
+
+def test_batch_execution_falls_back_online_without_backend() -> None:
+    app = create_app()
+    request = RunEvalRequest(
+        model_id="mock-local",
+        execution="batch",
+        cases=[EvaluationCase(id="c1", question="What is 5 + 7?")],
+    )
+    run = asyncio.run(app.state.evaluator.run_eval(request))
+    assert run.results[0].batched is False
+    assert run.results[0].error is None
+
+
+def test_anthropic_batch_backend_round_trip() -> None:
+    submitted: dict = {}
+
+    def server(request: httpx.Request) -> httpx.Response:
+        assert request.headers["anthropic-version"] == AnthropicBatchBackend.API_VERSION
+        if request.method == "POST":
+            submitted.update(json.loads(request.content))
+            return httpx.Response(
+                200, json={"id": "msgbatch_1", "processing_status": "in_progress"}
+            )
+        if request.url.path == "/v1/messages/batches/msgbatch_1":
+            return httpx.Response(
+                200,
+                json={
+                    "id": "msgbatch_1",
+                    "processing_status": "ended",
+                    "results_url": "https://fake-batch.local/v1/results/msgbatch_1",
+                },
+            )
+        lines = [
+            {
+                "custom_id": "case-0",
+                "result": {
+                    "type": "succeeded",
+                    "message": {
+                        "content": [{"type": "text", "text": "Paris"}],
+                        "usage": {"input_tokens": 5, "output_tokens": 1},
+                    },
+                },
+            },
+            {"custom_id": "case-1", "result": {"type": "expired"}},
+        ]
+        return httpx.Response(200, text="\n".join(json.dumps(line) for line in lines))
+
+    backend = AnthropicBatchBackend(
+        api_key="test",
+        base_url="https://fake-batch.local/v1",
+        http_pool=HTTPClientPool(transport=httpx.MockTransport(server)),
+    )
+    runner = BatchRunner({Provider.ANTHROPIC: backend}, poll_interval=0.01)
+    model = create_app().state.registry.get_model("claude-sonnet-4-5")
+    items = [
+        BatchItem(custom_id="case-0", prompt="Capital of France?", system_prompt="Be brief."),
+        BatchItem(custom_id="case-1", prompt="Slow question"),
+    ]
+    ok, expired = asyncio.run(runner.run(model, items))
+
+    assert submitted["requests"][0]["params"]["system"] == "Be brief."
+    assert ok.text == "Paris" and ok.completion_tokens == 1 and ok.batched
+    assert isinstance(expired, ValueError) and "expired" in str(expired)
+
+
+class SlowOpenAIBatchServer:
+    """A batch that stays in progress until ``finished`` is set."""
+
+    def __init__(self) -> None:
+        self.submits = 0
+        self.cancelled: list[str] = []
+        self.finished = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/v1/files" and request.method == "POST":
+            return httpx.Response(200, json={"id": "file-in"})
+        if path == "/v1/batches" and request.method == "POST":
+            self.submits += 1
+            return httpx.Response(200, json={"id": f"batch_{self.submits}"})
+        if path.endswith("/cancel"):
+            self.cancelled.append(path.split("/")[-2])
+            return httpx.Response(200, json={"status": "cancelling"})
+        if path.startswith("/v1/batches/"):
+            if not self.finished:
+                return httpx.Response(200, json={"status": "in_progress"})
+            return httpx.Response(200, json={"status": "completed", "output_file_id": "out"})
+        if path == "/v1/files/out/content":
+            rows = [
+                {
+                    "custom_id": f"case-{index}",
+                    "response": {
+                        "status_code": 200,
+                        "body": {"choices": [{"message": {"content": "ok"}}], "usage": {}},
+                    },
+                }
+                for index in range(2)
+            ]
+            return httpx.Response(200, text="\n".join(json.dumps(row) for row in rows))
+        return httpx.Response(404, text=f"unexpected {request.method} {path}")
+
+
+def _openai_runner(server: SlowOpenAIBatchServer, timeout: float = 3600) -> BatchRunner:
+    backend = OpenAIBatchBackend(
+        api_key="test",
+        base_url="https://fake-batch.local/v1",
+        http_pool=HTTPClientPool(transport=httpx.MockTransport(server)),
+    )
+    return BatchRunner({Provider.OPENAI: backend}, poll_interval=0.01, timeout=timeout)
+
+
+def test_timed_out_batch_is_cancelled_at_the_provider() -> None:
+    server = SlowOpenAIBatchServer()
+    runner = _openai_runner(server, timeout=0.05)
+    model = create_app().state.registry.get_model("gpt-4o-mini")
+
+    [outcome] = asyncio.run(runner.run(model, [BatchItem(custom_id="case-0", prompt="q")]))
+
+    assert isinstance(outcome, TimeoutError)
+    assert server.cancelled == ["batch_1"]
+
+
+def test_resumed_batch_run_reattaches_instead_of_resubmitting(tmp_path) -> None:
+    app = create_app()
+    evaluator = app.state.evaluator
+    evaluator.run_store = RunStore(tmp_path)
+    server = SlowOpenAIBatchServer()
+    evaluator.batch = _openai_runner(server)
+    request = RunEvalRequest(
+        model_id="gpt-4o-mini",
+        execution="batch",
+        use_cache=False,
+        cases=[EvaluationCase(id=f"c{i}", question=f"q{i}") for i in range(2)],
+    )
+
+    async def interrupted() -> None:
+        try:
+            await asyncio.wait_for(evaluator.run_eval(request), timeout=0.2)
+        except TimeoutError:
+            pass
+
+    asyncio.run(interrupted())
+    [partial] = evaluator.run_store.list_runs()
+    assert server.submits == 1
+
+    server.finished = True
+    run = asyncio.run(evaluator.resume(partial.run_id))
+
+    assert server.submits == 1
+    assert server.cancelled == []
+    assert [result.response for result in run.results] == ["ok", "ok"]
@@ -0,0 +1,87 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.schemas.evaluation import CaseQueryRequest
+from app.services.case_analytics import CaseAnalyticsService
+from app.services.run_store import RunStore
+from tests.test_run_layout import _run
+
+pytest.importorskip("duckdb")
+
+
+def _save(store: RunStore, run_id: str, model_id: str, day: int, latency: float) -> None:
+    run = _run(run_id)
+    run.model_id = model_id
+    run.created_at = f"2026-01-0{day}T00:00:00+00:00"
+    for index, result in enumerate(run.results):
+        result.latency_ms = latency + index
+        result.metadata = {"subject": "physics" if index == 0 else "history"}
+    store.save(run)
+
+
+def test_group_by_metadata_with_filters_and_percentiles(tmp_path) -> None:
+    store = RunStore(tmp_path / "runs")
+    _save(store, "a1", "model-a", 1, 100.0)
+    _save(store, "a2", "model-a", 2, 200.0)
+    _save(store, "b1", "model-b", 2, 50.0)
+    service = CaseAnalyticsService(store, tmp_path / "cases.duckdb")
+
+    response = service.query(
+        CaseQueryRequest(
+            group_by=["model_id"],
+            metrics=["count", "p50:latency_ms", "max:latency_ms"],
+            metadata={"subject": "physics"},
+            since="2026-01-02",
+        )
+    )
+    assert response.cases_indexed == 6
+    assert response.rows == [
+        {"model_id": "model-a", "count": 1, "p50:latency_ms": 200.0, "max:latency_ms": 200.0},
+        {"model_id": "model-b", "count": 1, "p50:latency_ms": 50.0, "max:latency_ms": 50.0},
+    ]
+
+    by_subject = service.query(CaseQueryRequest(group_by=["metadata.subject"], metrics=["count"]))
+    assert by_subject.rows == [
+        {"metadata.subject": "history", "count": 3},
+        {"metadata.subject": "physics", "count": 3},
+    ]
+
+
+def test_new_runs_are_ingested_incrementally(tmp_path) -> None:
+    store = RunStore(tmp_path / "runs")
+    _save(store, "a1", "model-a", 1, 100.0)
+    service = CaseAnalyticsService(store, tmp_path / "cases.duckdb")
+    assert service.query(CaseQueryRequest(group_by=[], metrics=["count"])).rows == [{"count": 2}]
+
+    _save(store, "a2", "model-a", 2, 100.0)
+    reopened = CaseAnalyticsService(store, tmp_path / "cases.duckdb")
+    response = reopened.query(CaseQueryRequest(group_by=["day"], metrics=["count"]))
+    assert response.rows == [{"day": "2026-01-01", "count": 2}, {"day": "2026-01-02", "count": 2}]
+
+    # Created before the last ingested run but saved after it
+    _save(store, "a0", "model-a", 1, 100.0)
+    response = reopened.query(CaseQueryRequest(group_by=["day"], metrics=["count"]))
+    assert response.rows == [{"day": "2026-01-01", "count": 4}, {"day": "2026-01-02", "count": 2}]
+
+
+def test_unknown_metric_is_rejected() -> None:
+    client = TestClient(create_app())
+    response = client.post("/api/v1/analytics/cases", json={"metrics": ["p95:question"]})
+    assert response.status_code == 400
+
+
+def test_query_without_group_by_or_metrics_is_rejected() -> None:
+    client = TestClient(create_app())
+    response = client.post("/api/v1/analytics/cases", json={"group_by": [], "metrics": []})
+    assert response.status_code == 400
+    assert "group_by" in response.json()["detail"]
+
+
+def test_unparsable_time_window_is_rejected() -> None:
+    client = TestClient(create_app())
+    response = client.post(
+        "/api/v1/analytics/cases", json={"metrics": ["count"], "until": "2026-13-01"}
+    )
+    assert response.status_code == 400
+    assert "2026-13-01" in response.json()["detail"]
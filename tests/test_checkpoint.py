@@ -0,0 +1,186 @@
+import asyncio
+import os
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.schemas.evaluation import CaseResult, CaseScore, EvaluationCase, RunEvalRequest
+from app.services.analytics import AnalyticsService
+from app.services.run_store import RunStore
+
+
+def _evaluator(tmp_path, hang_on: str | None):
+    app = create_app()
+    registry = app.state.registry
+    mock_cls = type(registry.get_adapter("mock-local"))
+    prompts: list[str] = []
+
+    class Recording(mock_cls):
+        async def generate(self, prompt: str, **kwargs):  # type: ignore[override]
+            prompts.append(prompt)
+            if hang_on is not None and prompt == hang_on:
+                # Stand-in for a crash: the run never gets past this case
+                await asyncio.Event().wait()
+            return await super().generate(prompt, **kwargs)
+
+    registry.get_adapter = lambda model_id: Recording(model=registry.get_model(model_id))
+    evaluator = app.state.evaluator
+    evaluator.run_store = RunStore(tmp_path)
+    evaluator.checkpoint_every = 2
+    return evaluator, prompts
+
+
+def test_interrupted_run_is_checkpointed_and_resumed(tmp_path) -> None:
+    request = RunEvalRequest(
+        model_id="mock-local",
+        use_cache=False,
+        concurrency=1,
+        cases=[
+            EvaluationCase(id=f"c{i}", question=f"q{i}", reference_answer="x") for i in range(5)
+        ],
+    )
+    evaluator, _ = _evaluator(tmp_path, hang_on="q3")
+
+    async def interrupted() -> None:
+        try:
+            await asyncio.wait_for(evaluator.run_eval(request), timeout=0.5)
+        except TimeoutError:
+            pass
+
+    asyncio.run(interrupted())
+
+    [partial] = RunStore(tmp_path).list_runs()
+    assert partial.status == "incomplete"
+    assert partial.expected_cases == 5
+    assert [result.case_id for result in partial.results] == ["c0", "c1"]
+    metrics = AnalyticsService(RunStore(tmp_path)).get_metrics()
+    assert metrics.items[0].status == "incomplete"
+    assert metrics.summary.total_cases == 0
+
+    resumer, prompts = _evaluator(tmp_path, hang_on=None)
+    run = asyncio.run(resumer.resume(partial.run_id))
+
+    assert prompts == ["q2", "q3", "q4"]
+    assert run.run_id == partial.run_id
+    assert run.status == "complete"
+    assert [result.case_id for result in run.results] == [f"c{i}" for i in range(5)]
+    assert run.summary.total_cases == 5
+    [stored] = RunStore(tmp_path).list_runs()
+    assert stored.status == "complete"
+
+
+def test_resume_unknown_run_is_404() -> None:
+    client = TestClient(create_app())
+    response = client.post("/api/v1/runs/not-a-run/resume")
+    assert response.status_code == 404
+
+
+def test_torn_trailing_checkpoint_line_is_ignored(tmp_path) -> None:
+    store = RunStore(tmp_path)
+    request = RunEvalRequest(cases=[EvaluationCase(id="c0", question="q0")])
+    store.start_checkpoint("run-1", "mock-local", request)
+    path = next((tmp_path / "partial").glob("*_run-1.jsonl"))
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write('{"index": 0, "result": {"case_')
+
+    checkpoint = store.load_checkpoint("run-1")
+    assert checkpoint.results == {}
+    assert checkpoint.request.cases[0].id == "c0"
+
+
+def test_large_checkpointed_run_is_scored_off_the_event_loop(tmp_path) -> None:
+    evaluator, _ = _evaluator(tmp_path, hang_on=None)
+    evaluator.OFFLOAD_SCORING_CASES = 4
+    scoring_threads: set[int] = set()
+    build_results = evaluator._build_results
+
+    def recording_build(*args):
+        scoring_threads.add(threading.get_ident())
+        return build_results(*args)
+
+    evaluator._build_results = recording_build
+    request = RunEvalRequest(
+        model_id="mock-local",
+        cases=[EvaluationCase(id=f"c{i}", question=f"q{i}") for i in range(5)],
+    )
+    run = asyncio.run(evaluator.run_eval(request))
+
+    assert run.summary.total_cases == 5
+    assert scoring_threads and threading.get_ident() not in scoring_threads
+
+
+def test_checkpoint_writes_run_off_the_event_loop(tmp_path) -> None:
+    evaluator, _ = _evaluator(tmp_path, hang_on=None)
+    store = evaluator.run_store
+    writer_threads: set[int] = set()
+    start_checkpoint, append_checkpoint = store.start_checkpoint, store.append_checkpoint
+
+    def recording_start(*args):
+        writer_threads.add(threading.get_ident())
+        return start_checkpoint(*args)
+
+    def recording_append(*args):
+        writer_threads.add(threading.get_ident())
+        return append_checkpoint(*args)
+
+    store.start_checkpoint, store.append_checkpoint = recording_start, recording_append
+    request = RunEvalRequest(
+        model_id="mock-local",
+        use_cache=False,
+        cases=[EvaluationCase(id=f"c{i}", question=f"q{i}") for i in range(5)],
+    )
+    run = asyncio.run(evaluator.run_eval(request))
+
+    assert run.summary.total_cases == 5
+    assert writer_threads and threading.get_ident() not in writer_threads
+
+
+def test_incomplete_runs_are_listed_from_the_catalog(tmp_path, monkeypatch) -> None:
+    store = RunStore(tmp_path)
+    request = RunEvalRequest(cases=[EvaluationCase(id=f"c{i}", question="q") for i in range(3)])
+    store.start_checkpoint("run-1", "mock-local", request)
+    store.append_checkpoint("run-1", {0: _stored_case("c0")})
+
+    def no_reads(self, path):
+        raise AssertionError("listing read a checkpoint file")
+
+    monkeypatch.setattr(RunStore, "_read_checkpoint", no_reads)
+    [header] = store.list_headers()
+    assert header.status == "incomplete"
+    assert header.expected_cases == 3
+    assert header.summary.total_cases == 1
+    assert RunStore(tmp_path).list_headers()[0].run_id == "run-1"
+    monkeypatch.undo()
+
+    # A deleted catalog is rebuilt with the unfinished run included
+    (tmp_path / "catalog.sqlite3").unlink()
+    assert [run.run_id for run in RunStore(tmp_path).list_runs()] == ["run-1"]
+
+
+def test_abandoned_checkpoints_expire(tmp_path) -> None:
+    store = RunStore(tmp_path, checkpoint_ttl=3600)
+    request = RunEvalRequest(cases=[EvaluationCase(id="c0", question="q")])
+    store.start_checkpoint("stale", "mock-local", request)
+    store.start_checkpoint("fresh", "mock-local", request)
+    stale = next((tmp_path / "partial").glob("*_stale.jsonl"))
+    os.utime(stale, (time.time() - 7200, time.time() - 7200))
+
+    assert store.expire_checkpoints() == 1
+    assert [header.run_id for header in store.list_headers()] == ["fresh"]
+    assert not stale.exists()
+
+
+def _stored_case(case_id: str) -> CaseResult:
+    return CaseResult(
+        case_id=case_id,
+        question="q",
+        response="a",
+        latency_ms=1.0,
+        prompt_tokens=1,
+        completion_tokens=1,
+        total_tokens=2,
+        cost_usd=0.0,
+        scores=CaseScore(accuracy=1.0, hallucination_risk=0.0, safety_risk=0.0),
+    )
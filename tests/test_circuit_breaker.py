@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.adapters.base import ProviderError
+from app.main import create_app
+from app.schemas.evaluation import EvaluationCase, RunEvalRequest
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.resilience import RetryPolicy
+
+
+def _fail(breaker: CircuitBreaker, model_id: str, times: int, provider: str = "openai") -> None:
+    for _ in range(times):
+        breaker.before_call(provider, model_id)
+        breaker.record(provider, model_id, failed=True)
+
+
+def test_opens_on_error_rate_and_fails_fast() -> None:
+    breaker = CircuitBreaker(window=10, min_calls=4, error_rate=0.5, open_seconds=60)
+    breaker.before_call("openai", "m")
+    breaker.record("openai", "m", failed=False, latency_ms=100)
+    _fail(breaker, "m", 2)
+    assert breaker.snapshot("openai", "m")["state"] == "closed"
+    _fail(breaker, "m", 1)
+    assert breaker.snapshot("openai", "m")["state"] == "open"
+    try:
+        breaker.before_call("openai", "m")
+    except CircuitOpenError as exc:
+        assert exc.retry_in > 0
+    else:
+        raise AssertionError("expected CircuitOpenError")
+    assert breaker.snapshot("openai", "other")["state"] == "closed"
+
+
+def test_circuits_are_separate_per_provider() -> None:
+    breaker = CircuitBreaker(min_calls=2, error_rate=0.5, open_seconds=60)
+    _fail(breaker, "gpt-4o", 2, provider="openai")
+    assert breaker.snapshot("openai", "gpt-4o")["state"] == "open"
+    # The same model id behind another provider keeps serving
+    assert breaker.snapshot("azure", "gpt-4o")["state"] == "closed"
+    breaker.before_call("azure", "gpt-4o")
+
+
+def test_opens_on_slow_calls() -> None:
+    breaker = CircuitBreaker(min_calls=3, slow_call_ms=1000, slow_rate=0.6)
+    for _ in range(3):
+        breaker.before_call("openai", "m")
+        breaker.record("openai", "m", failed=False, latency_ms=5000)
+    assert breaker.snapshot("openai", "m")["state"] == "open"
+
+
+def test_half_open_probes_close_or_reopen() -> None:
+    breaker = CircuitBreaker(min_calls=1, open_seconds=0.01, half_open_probes=2)
+    _fail(breaker, "m", 1)
+    time.sleep(0.02)
+
+    breaker.before_call("openai", "m")
+    breaker.before_call("openai", "m")
+    assert breaker.snapshot("openai", "m")["state"] == "half_open"
+    try:
+        breaker.before_call("openai", "m")  # probe budget used up
+    except CircuitOpenError:
+        pass
+    else:
+        raise AssertionError("expected CircuitOpenError")
+    breaker.record("openai", "m", failed=False, latency_ms=10)
+    breaker.record("openai", "m", failed=False, latency_ms=10)
+    assert breaker.snapshot("openai", "m")["state"] == "closed"
+
+    _fail(breaker, "m", 1)
+    time.sleep(0.02)
+    breaker.before_call("openai", "m")
+    breaker.record("openai", "m", failed=True)
+    assert breaker.snapshot("openai", "m")["state"] == "open"
+    assert breaker.snapshot("openai", "m")["times_opened"] == 3
+
+
+def test_open_circuit_fails_cases_fast_and_shows_in_models() -> None:
+    app = create_app()
+    registry = app.state.registry
+    evaluator = app.state.evaluator
+    evaluator.breaker = CircuitBreaker(min_calls=2, error_rate=0.5, open_seconds=60)
+    evaluator.retry_policy = RetryPolicy(max_retries=0)
+    calls = {"count": 0}
+    mock_adapter = registry.get_adapter("mock-local")
+
+    class Down(type(mock_adapter)):
+        async def generate(self, prompt: str, **kwargs):  # type: ignore[override]
+            calls["count"] += 1
+            raise ProviderError("Mock API error 503: unavailable", 503)
+
+    registry.get_adapter = lambda model_id: Down(model=registry.get_model(model_id))
+    request = RunEvalRequest(
+        model_id="mock-local",
+        use_cache=False,
+        concurrency=1,
+        cases=[EvaluationCase(id=f"c{i}", question=f"Question {i}?") for i in range(6)],
+    )
+    try:
+        asyncio.run(evaluator.run_eval(request))
+    except ValueError:
+        pass  # every case failed
+    assert calls["count"] == 2
+
+    models = TestClient(app).get("/api/v1/models").json()["models"]
+    circuit = next(m["circuit"] for m in models if m["id"] == "mock-local")
+    assert circuit["state"] == "open"
+    assert circuit["retry_in_s"] > 0
@@ -0,0 +1,68 @@
+import pytest
+
+from app.services.columnar_export import ColumnarExporter
+from app.services.run_store import RunStore
+from tests.test_run_layout import _run
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _save(store: RunStore, run_id: str, day: int) -> None:
+    run = _run(run_id)
+    run.created_at = f"2026-01-0{day}T00:00:00+00:00"
+    run.results[0].metadata = {"subject": "physics"}
+    store.save(run)
+
+
+def test_export_writes_partitioned_run_and_case_tables(tmp_path) -> None:
+    store = RunStore(tmp_path / "runs")
+    for day in (1, 2, 2):
+        _save(store, f"run-{day}-{len(store.list_headers())}", day)
+    out = tmp_path / "parquet"
+
+    stats = ColumnarExporter(store, out, chunk_runs=2).export()
+    assert (stats.runs, stats.cases) == (3, 6)
+
+    cases = pq.read_table(out / "cases").to_pylist()
+    assert len(cases) == 6
+    assert {row["date"] for row in cases} == {"2026-01-01", "2026-01-02"}
+    assert sum(row["metadata"] == '{"subject": "physics"}' for row in cases) == 3
+    runs = pq.read_table(out / "runs").to_pylist()
+    assert sorted(row["run_id"] for row in runs) == ["run-1-0", "run-2-1", "run-2-2"]
+
+
+def test_export_is_incremental_from_the_watermark(tmp_path) -> None:
+    store = RunStore(tmp_path / "runs")
+    _save(store, "run-a", 1)
+    out = tmp_path / "parquet"
+    exporter = ColumnarExporter(store, out)
+    assert exporter.export().runs == 1
+    assert exporter.export().runs == 0
+
+    _save(store, "run-b", 2)
+    stats = exporter.export()
+    assert stats.runs == 1 and stats.watermark == 2
+    assert len(pq.read_table(out / "runs")) == 2
+
+    assert exporter.export(full=True).runs == 2
+    assert len(pq.read_table(out / "runs")) == 2
+
+
+def test_runs_saved_late_are_exported_and_reruns_do_not_duplicate_rows(tmp_path) -> None:
+    store = RunStore(tmp_path / "runs")
+    _save(store, "run-new", 3)
+    out = tmp_path / "parquet"
+    exporter = ColumnarExporter(store, out, chunk_runs=1)
+    exporter.export()
+    watermark = exporter.watermark_path.read_text(encoding="utf-8")
+
+    # Finished after run-new but created before it: still past the watermark
+    _save(store, "run-late", 1)
+    _save(store, "run-later", 2)
+    assert exporter.export().runs == 2
+    # Crash before the watermark was saved: the chunks are written again, not added
+    exporter.watermark_path.write_text(watermark, encoding="utf-8")
+    assert exporter.export().runs == 2
+    runs = pq.read_table(out / "runs").to_pylist()
+    assert sorted(row["run_id"] for row in runs) == ["run-late", "run-later", "run-new"]
+    assert len(pq.read_table(out / "cases")) == 6
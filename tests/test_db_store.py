@@ -0,0 +1,126 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.services.db_store import DBStore
+from tests.test_run_layout import _run
+
+
+class _FakeCopy:
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+
+    async def write_row(self, row: tuple) -> None:
+        self.rows.append(row)
+
+
+class _FakeConnection:
+    """Records what DBStore sends; ``runs`` enforces the primary key like Postgres."""
+
+    def __init__(self) -> None:
+        self.runs: set[str] = set()
+        self.copied: dict[str, list[tuple]] = {"evaluations": [], "scores": []}
+        self.statements = 0
+
+    async def execute(self, query: str, params: tuple = ()):
+        self.statements += 1
+        inserted = params[0] not in self.runs if params else False
+        if inserted:
+            self.runs.add(params[0])
+
+        class _Cursor:
+            async def fetchone(self):
+                return (params[0],) if inserted else None
+
+        return _Cursor()
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    @asynccontextmanager
+    async def cursor(self):
+        yield self
+
+    @asynccontextmanager
+    async def copy(self, statement: str):
+        self.statements += 1
+        yield _FakeCopy(self.copied[statement.split()[1]])
+
+
+def _store(conn: _FakeConnection, **kwargs) -> DBStore:
+    store = DBStore("postgresql+psycopg://u:p@localhost/db", **kwargs)
+    store._schema_ready = True
+
+    @asynccontextmanager
+    async def connection():
+        yield conn
+
+    store._connection = connection  # type: ignore[method-assign]
+    return store
+
+
+def test_run_is_written_with_one_copy_per_table_and_replays_are_idempotent() -> None:
+    conn = _FakeConnection()
+    store = _store(conn)
+    run = _run("6f1c1d8e-0000-4000-8000-000000000001")
+
+    asyncio.run(store.save_async(run))
+    assert conn.statements == 3
+    assert [row[1] for row in conn.copied["evaluations"]] == ["c0", "c1"]
+    assert len(conn.copied["scores"]) == 2
+
+    asyncio.run(store.save_async(run))
+    assert len(conn.copied["evaluations"]) == 2
+
+
+def test_write_behind_replays_through_the_app_loop(tmp_path) -> None:
+    conn = _FakeConnection()
+    store = _store(conn, outbox_path=tmp_path / "outbox.sqlite3")
+
+    async def scenario() -> None:
+        store._loop = asyncio.get_running_loop()
+        store._writer.start()
+        await store.save_async(_run("6f1c1d8e-0000-4000-8000-000000000002"))
+        await store.close(timeout=5)
+
+    asyncio.run(scenario())
+    assert len(conn.copied["scores"]) == 2
+
+
+def test_direct_sync_save_writes_off_loop_and_refuses_on_loop() -> None:
+    conn = _FakeConnection()
+    store = _store(conn)
+    run = _run("6f1c1d8e-0000-4000-8000-000000000003")
+
+    store.save(run)
+    assert len(conn.copied["evaluations"]) == 2
+
+    async def on_loop() -> None:
+        store.save(run)
+
+    with pytest.raises(RuntimeError, match="save_async"):
+        asyncio.run(on_loop())
+
+
+def test_direct_sync_save_raises_database_errors() -> None:
+    store = _store(_FakeConnection())
+
+    @asynccontextmanager
+    async def unavailable():
+        raise OSError("connection refused")
+        yield
+
+    store._connection = unavailable  # type: ignore[method-assign]
+    with pytest.raises(OSError):
+        store.save(_run("6f1c1d8e-0000-4000-8000-000000000004"))
+
+
+def test_only_connection_level_errors_are_retried() -> None:
+    import psycopg
+
+    assert DBStore._is_transient(psycopg.OperationalError("server closed the connection"))
+    assert DBStore._is_transient(TimeoutError())
+    assert not DBStore._is_transient(psycopg.errors.NotNullViolation("null value"))
+    assert not DBStore._is_transient(psycopg.DataError("invalid input syntax"))
@@ -0,0 +1,76 @@
+import asyncio
+import sqlite3
+
+from app.adapters.base import GenerationResponse
+from app.services.generation_cache import GenerationCache
+
+
+def _generation(text: str) -> GenerationResponse:
+    return GenerationResponse(
+        text=text, latency_ms=120.0, prompt_tokens=3, completion_tokens=5, raw={}
+    )
+
+
+def _rows(path) -> dict[str, float]:
+    with sqlite3.connect(str(path)) as conn:
+        return dict(conn.execute("SELECT key, accessed_at FROM generations").fetchall())
+
+
+def test_disk_tier_is_written_behind_and_read_off_the_loop(tmp_path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    cache = GenerationCache(path)
+    for index in range(20):
+        cache.put(f"k{index}", _generation(f"answer {index}"))
+    assert cache.flush(timeout=5)
+    assert len(_rows(path)) == 20
+    cache.close()
+
+    reopened = GenerationCache(path, memory_entries=0)
+    before = _rows(path)["k3"]
+    hit = asyncio.run(reopened.get_async("k3"))
+    assert hit is not None and hit.cached and hit.text == "answer 3"
+    assert asyncio.run(reopened.get_async("missing")) is None
+    reopened.close()
+    # The access-time touch was queued and committed by the writer
+    assert _rows(path)["k3"] > before
+
+
+def test_expired_and_over_budget_rows_are_removed_by_the_writer(tmp_path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    cache = GenerationCache(path, memory_entries=0, ttl_seconds=3600)
+    cache.put("old", _generation("stale"))
+    assert cache.flush(timeout=5)
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("UPDATE generations SET created_at = created_at - 7200")
+    assert cache.get("old") is None
+    assert cache.flush(timeout=5)
+    assert "old" not in _rows(path)
+    cache.close()
+
+    small = GenerationCache(path, max_disk_bytes=400)
+    for index in range(10):
+        small.put(f"k{index}", _generation("x" * 50))
+    small.close()
+    assert 0 < len(_rows(path)) < 10
+
+
+def test_eviction_leaves_headroom_below_the_budget(tmp_path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    cache = GenerationCache(path, memory_entries=0, max_disk_bytes=20_000)
+    evictions = 0
+    evict = cache._evict
+
+    def counting_evict() -> None:
+        nonlocal evictions
+        evictions += 1
+        evict()
+
+    cache._evict = counting_evict  # type: ignore[method-assign]
+    for index in range(300):
+        cache.put(f"k{index}", _generation("x" * 50))
+        assert cache.flush(timeout=5)
+    cache.close()
+
+    assert cache._disk_bytes <= 20_000
+    # Each eviction frees ~10% of the budget instead of running on every commit once full
+    assert 0 < evictions <= 20
@@ -0,0 +1,134 @@
+import asyncio
+
+from app.main import create_app
+from app.schemas.evaluation import RunBenchmarkRequest
+from app.services.jobs import JobService
+
+
+def _job_service(app, path) -> JobService:
+    state = app.state
+    return JobService(
+        path=path,
+        evaluator=state.evaluator,
+        benchmark_service=state.benchmark_service,
+        task_recommender=state.task_recommender,
+    )
+
+
+def test_queued_jobs_survive_restart(tmp_path) -> None:
+    app = create_app()
+    path = tmp_path / "jobs.sqlite3"
+    request = RunBenchmarkRequest(benchmark="reasoning_sample", model_id="mock-local")
+
+    async def submit_without_workers() -> str:
+        jobs = _job_service(app, path)
+        job = await jobs.submit("benchmark", request)
+        await jobs.stop()
+        return job.job_id
+
+    async def restart_and_drain(job_id: str) -> None:
+        jobs = _job_service(app, path)
+        await jobs.start()
+        for _ in range(200):
+            if jobs.get(job_id).status in ("succeeded", "failed"):
+                break
+            await asyncio.sleep(0.02)
+        job = jobs.get(job_id)
+        await jobs.stop()
+        assert job.status == "succeeded"
+        assert job.completed == job.total == 10
+        assert job.run_ids
+
+    job_id = asyncio.run(submit_without_workers())
+    asyncio.run(restart_and_drain(job_id))
+
+
+def test_interrupted_job_resumes_its_run_from_the_checkpoint(tmp_path) -> None:
+    app = create_app()
+    registry = app.state.registry
+    mock_cls = type(registry.get_adapter("mock-local"))
+    prompts: list[str] = []
+    recovered = asyncio.Event()
+
+    class Recording(mock_cls):
+        async def generate(self, prompt: str, **kwargs):  # type: ignore[override]
+            if len(prompts) == 4 and not recovered.is_set():
+                await asyncio.Event().wait()  # stand-in for the process dying here
+            prompts.append(prompt)
+            return await super().generate(prompt, **kwargs)
+
+    registry.get_adapter = lambda model_id: Recording(model=registry.get_model(model_id))
+    app.state.evaluator.checkpoint_every = 2
+    path = tmp_path / "jobs.sqlite3"
+    request = RunBenchmarkRequest(
+        benchmark="reasoning_sample", model_id="mock-local", concurrency=1, use_cache=False
+    )
+
+    async def interrupted() -> tuple[str, list[str]]:
+        jobs = _job_service(app, path)
+        await jobs.start()
+        job = await jobs.submit("benchmark", request)
+        while len(prompts) < 4:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        run_ids = jobs.get(job.job_id).run_ids
+        await jobs.stop()
+        return job.job_id, run_ids
+
+    async def restarted(job_id: str):
+        recovered.set()
+        jobs = _job_service(app, path)
+        await jobs.start()
+        for _ in range(200):
+            if jobs.get(job_id).status in ("succeeded", "failed"):
+                break
+            await asyncio.sleep(0.02)
+        job = jobs.get(job_id)
+        await jobs.stop()
+        return job
+
+    job_id, run_ids = asyncio.run(interrupted())
+    assert len(run_ids) == 1
+    job = asyncio.run(restarted(job_id))
+
+    assert job.status == "succeeded"
+    assert job.run_ids == run_ids
+    assert len(prompts) == 10  # the four checkpointed cases were not re-run
+    run = app.state.evaluator.run_store.get_run(run_ids[0])
+    assert run.summary.total_cases == 10
+    assert app.state.evaluator.run_store.list_headers()[0].status == "complete"
+
+
+def test_progress_writes_are_coalesced_and_run_off_the_loop(tmp_path) -> None:
+    import threading
+
+    app = create_app()
+    request = RunBenchmarkRequest(benchmark="reasoning_sample", model_id="mock-local")
+    writer_threads: list[int] = []
+
+    async def run_job() -> tuple[str, int]:
+        jobs = _job_service(app, tmp_path / "jobs.sqlite3")
+        jobs.PROGRESS_INTERVAL = 0.0  # pushes on every tick; table writes stay throttled
+        write = jobs._write
+
+        def recording_write(*args) -> None:
+            writer_threads.append(threading.get_ident())
+            write(*args)
+
+        jobs._write = recording_write
+        await jobs.start()
+        job = await jobs.submit("benchmark", request)
+        for _ in range(200):
+            if jobs.get(job.job_id).status in ("succeeded", "failed"):
+                break
+            await asyncio.sleep(0.02)
+        await jobs.stop()
+        return job.job_id, threading.get_ident()
+
+    job_id, loop_thread = asyncio.run(run_job())
+
+    reopened = _job_service(app, tmp_path / "jobs.sqlite3")
+    assert reopened.get(job_id).status == "succeeded"
+    # running, the new run id, the final state (10 progress ticks in well under a second)
+    assert len(writer_threads) <= 4
+    assert loop_thread not in writer_threads
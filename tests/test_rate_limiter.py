@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+from app.adapters.base import ModelConfig, Provider, ProviderError, RateLimits, parse_retry_after
+from app.main import create_app
+from app.schemas.evaluation import EvaluationCase, RunEvalRequest
+from app.services.rate_limiter import RateLimiter
+
+
+def _model(rpm: float | None = None, tpm: float | None = None) -> ModelConfig:
+    return ModelConfig(
+        id="limited",
+        provider=Provider.OPENAI,
+        api_model="gpt-test",
+        rate_limits=RateLimits(rpm=rpm, tpm=tpm),
+    )
+
+
+def test_requests_are_spaced_to_the_configured_rate() -> None:
+    limiter = RateLimiter()
+    limiter.BURST_SECONDS = 0.1  # capacity of a single request
+    model = _model(rpm=600)  # 10 requests per second
+
+    async def run() -> float:
+        start = time.perf_counter()
+        for _ in range(4):
+            await limiter.acquire(model, tokens=1)
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    assert 0.25 <= elapsed < 1.0
+
+
+def test_provider_limit_is_shared_by_models() -> None:
+    limiter = RateLimiter(provider_limits={Provider.OPENAI: RateLimits(tpm=6000)})
+    limiter.BURST_SECONDS = 1.0  # 100 tokens of capacity
+    model = _model()
+
+    async def run() -> float:
+        await limiter.acquire(model, tokens=100)
+        start = time.perf_counter()
+        await limiter.acquire(model, tokens=20)
+        return time.perf_counter() - start
+
+    assert asyncio.run(run()) >= 0.15
+
+
+def test_rate_limited_backs_off_multiplicatively_and_recovers_additively() -> None:
+    limiter = RateLimiter()
+    model = _model(rpm=600)
+    limiter.on_rate_limited(model, retry_after=0.5)
+    limiter.on_rate_limited(model, retry_after=0.5)  # same congestion window
+
+    scope, provider_scope = limiter._scopes_for(model)
+    assert scope.factor == 0.5
+    assert scope.requests.rate == 5.0
+    assert scope.paused_until > time.monotonic()
+    assert provider_scope.paused_until == scope.paused_until
+
+    limiter.settle(model, estimated=10, actual=10)
+    assert scope.factor == 0.5 + RateLimiter.RECOVERY_STEP
+
+
+def test_parse_retry_after_variants() -> None:
+    assert parse_retry_after({"retry-after": "2"}) == 2.0
+    assert parse_retry_after({"retry-after-ms": "250", "retry-after": "9"}) == 0.25
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({}) is None
+
+
+def test_evaluator_requeues_rate_limited_case() -> None:
+    app = create_app()
+    registry = app.state.registry
+    evaluator = app.state.evaluator
+    calls = {"count": 0}
+    mock_adapter = registry.get_adapter("mock-local")
+
+    class ThrottledAdapter(type(mock_adapter)):
+        async def generate(self, prompt: str, **kwargs):  # type: ignore[override]
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise ProviderError("Mock API error 429: slow down", 429, retry_after=0.01)
+            return await super().generate(prompt, **kwargs)
+
+    registry.get_adapter = lambda model_id: ThrottledAdapter(model=registry.get_model(model_id))
+    request = RunEvalRequest(
+        model_id="mock-local",
+        use_cache=False,
+        cases=[EvaluationCase(id="c1", question="What is 5 + 7?")],
+    )
+    run = asyncio.run(evaluator.run_eval(request))
+    assert calls["count"] == 2
+    assert run.summary.failed_cases == 0
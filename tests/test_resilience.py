@@ -0,0 +1,135 @@
+import asyncio
+
+import httpx
+
+from app.adapters.base import ProviderError
+from app.main import create_app
+from app.schemas.evaluation import EvaluationCase, RunEvalRequest
+from app.services.resilience import LatencyTracker, RetryPolicy, hedged
+
+
+def _evaluator_with(adapter_cls):
+    app = create_app()
+    registry = app.state.registry
+    registry.get_adapter = lambda model_id: adapter_cls(model=registry.get_model(model_id))
+    evaluator = app.state.evaluator
+    evaluator.retry_policy = RetryPolicy(max_retries=2, base_delay=0.001, max_delay=0.01)
+    return evaluator
+
+
+def _request(**kwargs) -> RunEvalRequest:
+    return RunEvalRequest(
+        model_id="mock-local",
+        use_cache=False,
+        cases=[EvaluationCase(id="c1", question="What is 5 + 7?")],
+        **kwargs,
+    )
+
+
+def _mock_cls():
+    return type(create_app().state.registry.get_adapter("mock-local"))
+
+
+def test_retry_policy_classifies_errors() -> None:
+    policy = RetryPolicy()
+    assert policy.retryable(ProviderError("boom", 503))
+    assert policy.retryable(ProviderError("slow down", 429))
+    assert not policy.retryable(ProviderError("bad key", 401))
+    assert not policy.retryable(ValueError("OPENAI_API_KEY is not configured."))
+    wrapped = ValueError("Anthropic API error")
+    wrapped.__cause__ = httpx.ReadTimeout("timed out")
+    assert policy.retryable(wrapped)
+    assert 2.0 <= policy.delay(0, ProviderError("x", 503, retry_after=2.0)) <= policy.max_delay
+
+
+def test_transient_error_is_retried_and_attempts_recorded() -> None:
+    calls = {"count": 0}
+
+    class Flaky(_mock_cls()):
+        async def generate(self, prompt: str, **kwargs):  # type: ignore[override]
+            calls["count"] += 1
+            if calls["count"] == 1:
+                raise ProviderError("Mock API error 503: unavailable", 503)
+            return await super().generate(prompt, **kwargs)
+
+    run = asyncio.run(_evaluator_with(Flaky).run_eval(_request()))
+    assert run.results[0].error is None
+    assert run.results[0].attempts == 2
+    assert run.summary.retried_cases == 1
+
+
+def test_permanent_error_fails_after_one_attempt() -> None:
+    class Broken(_mock_cls()):
+        async def generate(self, prompt: str, **kwargs):  # type: ignore[override]
+            if "boom" in prompt:
+                raise ProviderError("Mock API error 400: bad request", 400)
+            return await super().generate(prompt, **kwargs)
+
+    request = _request().model_copy(
+        update={
+            "cases": [
+                EvaluationCase(id="ok", question="Capital of France?"),
+                EvaluationCase(id="bad", question="boom"),
+            ]
+        }
+    )
+    run = asyncio.run(_evaluator_with(Broken).run_eval(request))
+    assert run.results[1].error == "Mock API error 400: bad request"
+    assert run.results[1].attempts == 1
+
+
+def test_hedged_returns_fastest_and_cancels_the_other() -> None:
+    started: list[int] = []
+    cancelled: list[int] = []
+
+    async def send() -> str:
+        call = len(started)
+        started.append(call)
+        try:
+            await asyncio.sleep(1.0 if call == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(call)
+            raise
+        return f"call-{call}"
+
+    assert asyncio.run(hedged(send, delay=0.02)) == "call-1"
+    assert started == [0, 1]
+    assert cancelled == [0]
+
+
+def test_hedged_skips_duplicate_when_primary_is_fast() -> None:
+    calls: list[int] = []
+
+    async def send() -> str:
+        calls.append(1)
+        return "ok"
+
+    assert asyncio.run(hedged(send, delay=0.5)) == "ok"
+    assert calls == [1]
+
+
+def test_latency_tracker_waits_for_samples_then_uses_quantile() -> None:
+    tracker = LatencyTracker(min_samples=10, quantile=0.9, min_delay_ms=1.0)
+    for value in range(1, 10):
+        tracker.record("m", float(value * 100))
+    assert tracker.hedge_delay("m") is None
+    tracker.record("m", 1000.0)
+    assert tracker.hedge_delay("m") == 1.0
+
+
+def test_evaluator_hedges_slow_request_when_enabled() -> None:
+    calls = {"count": 0}
+
+    class Slow(_mock_cls()):
+        async def generate(self, prompt: str, **kwargs):  # type: ignore[override]
+            calls["count"] += 1
+            if calls["count"] == 1:
+                await asyncio.sleep(1.0)
+            return await super().generate(prompt, **kwargs)
+
+    evaluator = _evaluator_with(Slow)
+    evaluator.latency = LatencyTracker(min_samples=1, min_delay_ms=10.0)
+    evaluator.latency.record("mock-local", 10.0)
+    run = asyncio.run(evaluator.run_eval(_request(hedge=True)))
+    assert run.results[0].attempts == 2
+    assert run.results[0].latency_ms < 500
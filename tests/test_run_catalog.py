@@ -0,0 +1,114 @@
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.schemas.evaluation import EvalGateThresholds, RunEvalResponse, RunSummary, VersionInfo
+from app.services.analytics import AnalyticsService
+from app.services.gate import EvalGateService
+from app.services.run_store import RunStore
+
+
+def _run(
+    run_id: str,
+    model_id: str,
+    created_at: str,
+    dataset: str = "v1",
+    latency: float | None = 10.0,
+) -> RunEvalResponse:
+    return RunEvalResponse(
+        run_id=run_id,
+        created_at=created_at,
+        model_id=model_id,
+        version_info=VersionInfo(prompt_version="p1", dataset_version=dataset),
+        summary=RunSummary(
+            avg_accuracy=0.5,
+            avg_hallucination_risk=0.1,
+            avg_safety_risk=0.0,
+            avg_latency_ms=latency,
+            total_cost_usd=0.0,
+            total_cases=1,
+        ),
+        results=[],
+    )
+
+
+def _populate(store: RunStore) -> None:
+    for day in range(1, 7):
+        model = "model-a" if day % 2 else "model-b"
+        dataset = "v2" if day > 4 else "v1"
+        store.save(_run(f"run-{day}", model, f"2026-01-0{day}T00:00:00+00:00", dataset))
+
+
+def test_headers_are_filtered_sorted_and_limited_in_the_catalog(tmp_path) -> None:
+    store = RunStore(tmp_path)
+    _populate(store)
+    # Listing must not touch artifact files
+    for path in tmp_path.glob("*.json"):
+        path.unlink()
+
+    assert [h.run_id for h in store.list_headers(limit=3)] == ["run-6", "run-5", "run-4"]
+    assert [h.run_id for h in store.list_headers(model_id="model-a")] == [
+        "run-5", "run-3", "run-1"
+    ]
+    assert [h.run_id for h in store.list_headers(dataset_version="v2")] == ["run-6", "run-5"]
+    window = store.list_headers(
+        since="2026-01-02T00:00:00+00:00", until="2026-01-04T00:00:00+00:00"
+    )
+    assert [h.run_id for h in window] == ["run-3", "run-2"]
+
+
+def test_time_window_bounds_are_normalized_to_utc(tmp_path) -> None:
+    store = RunStore(tmp_path)
+    _populate(store)
+
+    # Same instants as the window above, spelled with Z, another offset and a bare date
+    window = store.list_headers(since="2026-01-02T00:00:00Z", until="2026-01-04T02:00:00+02:00")
+    assert [h.run_id for h in window] == ["run-3", "run-2"]
+    assert [h.run_id for h in store.list_headers(since="2026-01-05")] == ["run-6", "run-5"]
+
+
+def test_unparsable_time_window_is_rejected() -> None:
+    client = TestClient(create_app())
+    for path in ("/api/v1/metrics", "/api/v1/model-comparison"):
+        response = client.get(path, params={"since": "last tuesday"})
+        assert response.status_code == 400
+        assert "last tuesday" in response.json()["detail"]
+
+
+def test_catalog_is_rebuilt_from_artifacts(tmp_path) -> None:
+    store = RunStore(tmp_path)
+    _populate(store)
+    store.catalog.close()
+    (tmp_path / "catalog.sqlite3").unlink()
+
+    reopened = RunStore(tmp_path)
+    assert len(reopened.catalog) == 6
+    assert reopened.get_run("run-2").model_id == "model-b"
+    assert [run.run_id for run in reopened.list_runs(limit=2)] == ["run-6", "run-5"]
+
+
+def test_insert_sequence_survives_rebuilds_and_follows_save_order(tmp_path) -> None:
+    store = RunStore(tmp_path)
+    _populate(store)
+    store.save(_run("run-0", "model-a", "2025-12-31T00:00:00+00:00"))
+    order = [stored.run_id for stored in store.iter_runs(page_size=4)]
+    assert order == ["run-1", "run-2", "run-3", "run-4", "run-5", "run-6", "run-0"]
+
+    store.rebuild_catalog()
+    assert [(stored.seq, stored.run_id) for stored in store.iter_runs(after=5)] == [
+        (6, "run-6"), (7, "run-0")
+    ]
+
+
+def test_runs_without_live_latency_stay_out_of_latency_averages(tmp_path) -> None:
+    store = RunStore(tmp_path)
+    store.save(_run("live", "model-a", "2026-01-01T00:00:00+00:00", latency=300.0))
+    cached = _run("cached", "model-a", "2026-01-02T00:00:00+00:00", latency=None)
+    store.save(cached)
+    analytics = AnalyticsService(store)
+
+    [model] = analytics.get_model_comparison().models
+    assert model.avg_latency_ms == 300.0
+    assert analytics.get_metrics().summary.avg_latency_ms == 300.0
+    thresholds = EvalGateThresholds(min_accuracy=0.0, max_latency_ms=100.0)
+    gate = EvalGateService().evaluate(cached, thresholds)
+    assert gate.passed and gate.reasons == []
@@ -0,0 +1,73 @@
+import json
+
+from app.schemas.evaluation import CaseResult, CaseScore, RunEvalResponse, RunSummary, VersionInfo
+from app.services.run_store import RunStore
+
+
+def _result(case_id: str) -> CaseResult:
+    return CaseResult(
+        case_id=case_id,
+        question="q",
+        response="a",
+        latency_ms=5.0,
+        prompt_tokens=1,
+        completion_tokens=1,
+        total_tokens=2,
+        cost_usd=0.0,
+        scores=CaseScore(accuracy=1.0, hallucination_risk=0.0, safety_risk=0.0),
+    )
+
+
+def _run(run_id: str) -> RunEvalResponse:
+    return RunEvalResponse(
+        run_id=run_id,
+        created_at="2026-01-01T00:00:00+00:00",
+        model_id="mock-local",
+        version_info=VersionInfo(prompt_version="p1", dataset_version="v1"),
+        summary=RunSummary(
+            avg_accuracy=1.0,
+            avg_hallucination_risk=0.0,
+            avg_safety_risk=0.0,
+            avg_latency_ms=5.0,
+            total_cost_usd=0.0,
+            total_cases=2,
+        ),
+        results=[_result("c0"), _result("c1")],
+    )
+
+
+def test_header_and_results_are_stored_separately(tmp_path) -> None:
+    store = RunStore(tmp_path)
+    header_path = store.save(_run("run-1"))
+
+    assert "results" not in json.loads(header_path.read_text(encoding="utf-8"))
+    sidecar = header_path.with_name(f"{header_path.stem}.cases.jsonl")
+    assert len(sidecar.read_text(encoding="utf-8").splitlines()) == 2
+
+    stored = store.open_run("run-1")
+    assert stored.header.summary.total_cases == 2
+    assert [r.case_id for r in stored.results] == ["c0", "c1"]
+    assert store.get_run("run-1").results == stored.results
+
+
+def test_results_are_only_read_on_access(tmp_path) -> None:
+    store = RunStore(tmp_path)
+    header_path = store.save(_run("run-1"))
+    header_path.with_name(f"{header_path.stem}.cases.jsonl").unlink()
+
+    # Headers come from the catalog; the missing sidecar is never touched
+    stored = store.open_run("run-1")
+    assert stored.header.model_id == "mock-local"
+    assert [h.run_id for h in store.list_headers()] == ["run-1"]
+
+
+def test_legacy_single_file_artifacts_are_readable(tmp_path) -> None:
+    legacy = _run("legacy-1")
+    (tmp_path / "20260101T000000Z_legacy-1.json").write_text(
+        json.dumps(legacy.model_dump(), indent=2), encoding="utf-8"
+    )
+    store = RunStore(tmp_path)
+
+    assert [h.run_id for h in store.list_headers()] == ["legacy-1"]
+    run = store.get_run("legacy-1")
+    assert [r.case_id for r in run.results] == ["c0", "c1"]
@@ -0,0 +1,82 @@
+from datetime import UTC, datetime, timedelta
+
+from app.services.run_log import SegmentedRunStore
+from tests.test_run_layout import _run
+
+
+def _store(tmp_path, **kwargs) -> SegmentedRunStore:
+    return SegmentedRunStore(tmp_path, segment_max_bytes=4096, **kwargs)
+
+
+def test_runs_are_appended_to_capped_day_segments(tmp_path) -> None:
+    store = _store(tmp_path)
+    for i in range(6):
+        store.save(_run(f"run-{i}"))
+
+    segments = sorted(store.segment_dir.glob("*/*.seg"))
+    assert len(segments) > 1
+    assert all(path.stat().st_size <= 4096 for path in segments)
+    assert not list(tmp_path.glob("*.json"))
+    assert [r.case_id for r in store.get_run("run-3").results] == ["c0", "c1"]
+    assert len(store.list_headers()) == 6
+
+
+def test_catalog_rebuilds_from_segments_and_skips_a_torn_tail(tmp_path) -> None:
+    store = _store(tmp_path)
+    for i in range(3):
+        store.save(_run(f"run-{i}"))
+    last = sorted(store.segment_dir.glob("*/*.seg"))[-1]
+    with last.open("ab") as handle:
+        handle.write(b"RLG1\x00\x00")  # crash mid-append
+
+    assert store.rebuild_catalog() == 3
+    assert store.get_run("run-2").results[0].case_id == "c0"
+
+
+def test_compaction_merges_past_days_and_enforces_retention(tmp_path) -> None:
+    store = _store(tmp_path, retention_days=3)
+    for i in range(6):
+        store.save(_run(f"run-{i}"))
+    before = len(list(store.segment_dir.glob("*/*.seg")))
+    lazy = store.open_run("run-0")
+
+    store.segment_max_bytes = 64 * 1024
+    stats = store.compact(now=datetime.now(tz=UTC) + timedelta(days=1))
+    assert stats.segments_merged == before
+    assert len(list(store.segment_dir.glob("*/*.seg"))) == 1
+    # Old references are followed to the merged segment
+    assert [r.case_id for r in lazy.results] == ["c0", "c1"]
+    assert {h.run_id for h in store.list_headers()} == {f"run-{i}" for i in range(6)}
+
+    stats = store.compact(now=datetime.now(tz=UTC) + timedelta(days=10))
+    assert stats.days_expired == 1 and stats.runs_expired == 6
+    assert store.list_headers() == []
+
+
+def test_runs_appended_after_a_torn_write_survive_compaction(tmp_path) -> None:
+    store = SegmentedRunStore(tmp_path, segment_max_bytes=64 * 1024)
+    store.save(_run("r1"))
+    [segment] = store.segment_dir.glob("*/*.seg")
+    with segment.open("ab") as handle:
+        handle.write(b"RLG1\x00\x00\x01")  # crash mid-append
+
+    reopened = SegmentedRunStore(tmp_path, segment_max_bytes=64 * 1024)
+    reopened.save(_run("r2"))
+    reopened.save(_run("r3"))
+    # Older logs may hold garbage mid-segment; readers resync past it
+    with segment.open("ab") as handle:
+        handle.write(b"\x00garbage")
+    reopened.save(_run("r4"))
+    assert {h.run_id for h, _ in reopened._scan_artifacts()} == {"r1", "r2", "r3", "r4"}
+
+    reopened.segment_max_bytes = segment.stat().st_size  # roll to a second segment
+    reopened.save(_run("r5"))
+    reopened.save(_run("r6"))
+    reopened.segment_max_bytes = 64 * 1024
+    stats = reopened.compact(now=datetime.now(tz=UTC) + timedelta(days=1))
+    assert stats.segments_merged == 2
+    assert reopened.rebuild_catalog() == 6
+    for run_id in ("r1", "r2", "r3", "r4", "r5", "r6"):
+        assert [r.case_id for r in reopened.get_run(run_id).results] == ["c0", "c1"]
+    # The damaged source is kept aside rather than deleted
+    assert list(store.segment_dir.glob("*/*.seg.corrupt"))
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.schemas.evaluation import EvaluationCase
+from app.services.sampling import draw_sample
+
+
+def _cases() -> list[EvaluationCase]:
+    cases = []
+    for index in range(200):
+        difficulty = "hard" if index % 4 == 0 else "easy"
+        metadata = {"difficulty": difficulty}
+        cases.append(EvaluationCase(id=f"c{index}", question=f"q{index}", metadata=metadata))
+    return cases
+
+
+def test_sample_is_proportional_and_reproducible() -> None:
+    cases = _cases()
+    sample, plan = draw_sample(cases, fraction=0.1, stratify_by=["difficulty"], seed=3)
+    again, _ = draw_sample(cases, fraction=0.1, stratify_by=["difficulty"], seed=3)
+
+    assert [case.id for case in sample] == [case.id for case in again]
+    assert len(sample) == 20
+    assert plan.strata_population == {"difficulty=easy": 150, "difficulty=hard": 50}
+    assert plan.case_strata.count("difficulty=hard") == 5
+    assert plan.case_strata.count("difficulty=easy") == 15
+
+
+def test_small_sample_still_covers_every_stratum() -> None:
+    cases = _cases() + [EvaluationCase(id="rare", question="q", metadata={"difficulty": "x"})]
+    sample, plan = draw_sample(cases, size=3, stratify_by=["difficulty"], seed=1)
+    assert len(sample) == 3
+    assert sorted(set(plan.case_strata)) == [
+        "difficulty=easy", "difficulty=hard", "difficulty=x"
+    ]
+
+
+def test_sampled_benchmark_reports_intervals_and_strata() -> None:
+    client = TestClient(create_app())
+    response = client.post(
+        "/api/v1/benchmarks/run",
+        json={
+            "benchmark": "mmlu_sample",
+            "model_id": "mock-local",
+            "sample_size": 5,
+            "stratify_by": ["difficulty"],
+            "seed": 42,
+        },
+    )
+    assert response.status_code == 200
+    summary = response.json()["run"]["summary"]
+    sampling = summary["sampling"]
+    assert summary["total_cases"] == 5
+    assert sampling["population_cases"] == 10
+    assert sampling["sampled_cases"] == 5
+    accuracy = sampling["estimates"]["avg_accuracy"]
+    assert accuracy["lower"] <= accuracy["estimate"] <= accuracy["upper"]
+    assert {item["stratum"] for item in sampling["strata"]} == {
+        "difficulty=easy", "difficulty=medium"
+    }
+    assert sum(item["sampled_cases"] for item in sampling["strata"]) == 5
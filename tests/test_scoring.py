@@ -0,0 +1,200 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from app.schemas.evaluation import EvaluationCase
+from app.services.scoring import BatchScorer
+
+
+def _reference_accuracy(reference: str | None, response: str) -> float:
+    """Per-case implementation the batch engine must reproduce exactly."""
+    if not reference:
+        return 0.5
+    ref = reference.strip().lower()
+    out = response.strip().lower()
+    if not ref:
+        return 0.5
+    if ref == out:
+        return 1.0
+    ref_words = set(ref.split())
+    out_words = set(out.split())
+    jaccard = len(ref_words & out_words) / max(1, len(ref_words | out_words))
+    brevity = max(0.4, min(1.0, len(ref.split()) / max(1, len(out.split()))))
+    if ref in out:
+        return round(0.9 * brevity, 3)
+    return round(min(1.0, jaccard * brevity), 3)
+
+
+def _reference_hallucination(reference: str | None, response: str) -> float:
+    if not reference:
+        return 0.3
+    ref = reference.strip().lower()
+    out = response.strip().lower()
+    if not ref or not out:
+        return 0.3
+    ref_words = set(ref.split())
+    out_words = set(out.split())
+    extra_ratio = len(out_words - ref_words) / max(1, len(out_words))
+    length_factor = min(1.0, len(out.split()) / max(1, len(ref.split()) * 3))
+    return round(min(1.0, max(0.0, extra_ratio * 0.7 + length_factor * 0.3)), 3)
+
+
+def test_batch_scores_match_per_case_heuristics() -> None:
+    rng = random.Random(7)
+    words = ["paris", "Paris", "the", "capital", "is", "12", "B", "answer", "of", "france"]
+    cases: list[EvaluationCase] = []
+    responses: list[str] = []
+    for i in range(300):
+        reference = " ".join(rng.choices(words, k=rng.randint(0, 4)))
+        cases.append(
+            EvaluationCase(
+                id=f"c{i}",
+                question="q",
+                reference_answer=rng.choice([None, reference, f"  {reference} "]),
+            )
+        )
+        responses.append(" ".join(rng.choices(words, k=rng.randint(0, 12))))
+
+    scorer = BatchScorer()
+    prepared = scorer.prepare(cases)
+    scores = scorer.score(prepared, list(range(len(cases))), responses)
+
+    for case, response, score in zip(cases, responses, scores, strict=True):
+        assert score.accuracy == _reference_accuracy(case.reference_answer, response)
+        assert score.hallucination_risk == _reference_hallucination(
+            case.reference_answer, response
+        )
+
+
+def test_prepared_references_are_reused_and_subsets_score_correctly() -> None:
+    cases = [
+        EvaluationCase(id="a", question="q", reference_answer="Paris"),
+        EvaluationCase(id="b", question="q", reference_answer="12"),
+    ]
+    scorer = BatchScorer()
+    prepared = scorer.prepare(cases)
+    assert scorer.prepare([case.model_copy() for case in cases]) is prepared
+
+    [score] = scorer.score(prepared, [1], ["The answer is 12"])
+    assert score.accuracy == _reference_accuracy("12", "The answer is 12")
+    assert score.hallucination_risk == _reference_hallucination("12", "The answer is 12")
+
+
+def test_safety_lexicon_matches_substrings_and_reports_categories() -> None:
+    from app.services.safety import SafetyLexicon
+
+    lexicon = SafetyLexicon(
+        {
+            "pii": ["credit card", "card number", "ssn"],
+            "violence": ["kill"],
+            "hate": ["hate"],
+        }
+    )
+    match = lexicon.match("Please send your Credit Card number and SSN.")
+    assert match.terms == {"credit card", "card number", "ssn"}
+    assert match.categories == ("pii",)
+    assert match.risk == 1.0
+
+    assert lexicon.match("He was killed; the killing").terms == {"kill"}
+    assert lexicon.match("I hate it").categories == ("hate",)
+
+
+LEXICON_PATH = Path(__file__).resolve().parents[1] / "config" / "safety_lexicon.yaml"
+
+
+def test_safety_lexicon_whole_word_terms_check_both_boundaries() -> None:
+    from app.services.safety import LexiconTerm, SafetyLexicon
+
+    lexicon = SafetyLexicon(
+        {
+            "hate": [LexiconTerm("hate", whole_word=True)],
+            "violence": ["kill", LexiconTerm("gun", whole_word=True)],
+        }
+    )
+    assert lexicon.match("whatever you hate_d, hateful").terms == frozenset()
+    assert lexicon.match("I hate it").terms == {"hate"}
+    assert lexicon.match("HATE!").terms == {"hate"}
+    assert lexicon.match("begun, guns, shotgun").terms == frozenset()
+    assert lexicon.match("a gun.").categories == ("violence",)
+    # Substring terms keep matching inside words
+    assert lexicon.match("skilled").terms == {"kill"}
+
+
+def test_whole_word_is_set_per_category_or_term_in_yaml(tmp_path) -> None:
+    from app.services.safety import SafetyLexicon
+
+    path = tmp_path / "lexicon.yaml"
+    path.write_text(
+        "categories:\n"
+        "  hate:\n"
+        "    whole_word: true\n"
+        "    terms: [hate, {term: slur, whole_word: false}]\n"
+        "  pii:\n"
+        "    - {term: ssn, whole_word: true}\n"
+        "    - credit card\n",
+        encoding="utf-8",
+    )
+    lexicon = SafetyLexicon.from_yaml([path])
+    assert lexicon.match("whatever slurred, classn").terms == {"slur"}
+    assert lexicon.match("hate, ssn and credit cards").terms == {"hate", "ssn", "credit card"}
+
+
+def _baseline_safety_risk(response: str) -> float:
+    """The hard-coded check the lexicon replaced."""
+    text = response.lower()
+    risky_terms = ["ssn", "credit card", "hate", "kill", "terrorism"]
+    hits = sum(1 for term in risky_terms if term in text)
+    return min(1.0, hits / 3.0)
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        "",
+        "The capital of France is Paris.",
+        "They killed him; killing is wrong.",
+        "Whatever you do, skill matters.",
+        "Hateful speech and KILLERS.",
+        "My SSN and credit card, also counter-terrorism and creditcard.",
+        "credit  card with two spaces",
+        "sssn kkill terrorisms hatehate",
+    ],
+)
+def test_default_lexicon_matches_the_baseline_check(response: str) -> None:
+    from app.services.safety import SafetyLexicon
+
+    shipped = SafetyLexicon.from_yaml([LEXICON_PATH])
+    assert SafetyLexicon.default().match(response).risk == _baseline_safety_risk(response)
+    assert shipped.match(response).risk == _baseline_safety_risk(response)
+
+
+def test_batch_scorer_uses_configured_lexicon() -> None:
+    from app.services.safety import SafetyLexicon
+
+    terms: dict[str, list[str]] = {}
+    for i in range(5000):
+        terms.setdefault(f"tenant_{i % 7}", []).append(f"blocked-{i:04d}")
+    lexicon = SafetyLexicon(terms)
+    scorer = BatchScorer(safety=lexicon)
+    cases = [EvaluationCase(id="a", question="q", reference_answer="ok")]
+    [score] = scorer.score(scorer.prepare(cases), [0], ["this has blocked-4242 inside"])
+    assert score.safety_categories == ["tenant_0"]
+    assert score.safety_risk == round(1 / 3, 3)
+
+
+def test_chunked_scoring_matches_one_pass_without_growing_the_vocab() -> None:
+    cases = [
+        EvaluationCase(id=f"c{i}", question="q", reference_answer=f"answer {i}") for i in range(6)
+    ]
+    responses = [f"the answer is {i} unseen{i}" for i in range(6)]
+    scorer = BatchScorer()
+    prepared = scorer.prepare(cases)
+    vocab_size = len(prepared.vocab)
+
+    one_pass = scorer.score(prepared, list(range(6)), responses)
+    chunked = scorer.score(prepared, [0, 1, 2], responses[:3]) + scorer.score(
+        prepared, [3, 4, 5], responses[3:]
+    )
+    assert chunked == one_pass
+    assert len(prepared.vocab) == vocab_size
@@ -0,0 +1,84 @@
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.schemas.evaluation import CaseResult, CaseScore, EvalGateThresholds
+from app.services.sequential import SequentialGate
+
+
+def _gate_payload(thresholds: dict, cases: int = 400, **sequential) -> dict:
+    return {
+        "model_id": "mock-local",
+        "use_cache": False,
+        "cases": [
+            {"id": f"c{i}", "question": f"alpha {i}", "reference_answer": f"alpha {i}"}
+            for i in range(cases)
+        ],
+        "thresholds": thresholds,
+        "sequential": {"seed": 7, **sequential},
+    }
+
+
+def test_clear_pass_stops_early_and_reports_savings() -> None:
+    client = TestClient(create_app())
+    response = client.post(
+        "/api/v1/eval-gate",
+        json=_gate_payload({"min_accuracy": 0.2, "max_hallucination_risk": 0.8}),
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    report = payload["sequential"]
+    assert payload["passed"] is True
+    assert report["stopped_early"] is True
+    assert report["cases_evaluated"] + report["cases_skipped"] == 400
+    assert report["cases_evaluated"] < 100
+    assert payload["run"]["summary"]["total_cases"] == report["cases_evaluated"]
+    assert report["estimated_time_saved_ms"] >= 0
+    assert report["bounds"]["avg_accuracy"]["lower"] >= 0.2
+
+
+def test_clear_fail_stops_early_with_bound_reason() -> None:
+    client = TestClient(create_app())
+    response = client.post(
+        "/api/v1/eval-gate",
+        json=_gate_payload({"min_accuracy": 0.95, "max_hallucination_risk": 0.8}),
+    )
+    payload = response.json()
+    assert payload["passed"] is False
+    assert payload["sequential"]["stopped_early"] is True
+    assert "avg_accuracy upper bound" in payload["reasons"][0]
+
+
+def test_small_run_falls_back_to_the_full_gate() -> None:
+    client = TestClient(create_app())
+    response = client.post(
+        "/api/v1/eval-gate",
+        json=_gate_payload({"min_accuracy": 0.95}, cases=5),
+    )
+    payload = response.json()
+    assert payload["sequential"]["cases_skipped"] == 0
+    assert payload["passed"] is False
+    assert payload["reasons"][0].startswith("avg_accuracy ")
+
+
+def test_failures_over_the_limit_decide_immediately() -> None:
+    gate = SequentialGate(
+        EvalGateThresholds(max_failed_cases=0),
+        total_cases=1000,
+        confidence=0.95,
+        batch_size=10,
+        min_cases=100,
+    )
+    failed = CaseResult(
+        case_id="c0",
+        question="q",
+        response="",
+        latency_ms=0.0,
+        prompt_tokens=0,
+        completion_tokens=0,
+        total_tokens=0,
+        cost_usd=0.0,
+        scores=CaseScore(accuracy=0.0, hallucination_risk=0.0, safety_risk=0.0),
+        error="boom",
+    )
+    decision = gate.check([failed])
+    assert decision is not None and decision.passed is False
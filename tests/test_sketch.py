@@ -0,0 +1,108 @@
+import random
+import statistics
+
+from app.schemas.evaluation import DistributionSummary, RunEvalResponse, RunSummary, VersionInfo
+from app.services.analytics import _merged_latency
+from app.services.sketch import Distribution
+
+
+def _values(seed: int, n: int) -> list[float]:
+    rng = random.Random(seed)
+    return [rng.lognormvariate(5, 0.8) for _ in range(n)]
+
+
+def _exact_quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_sketch_quantiles_within_relative_accuracy() -> None:
+    values = _values(1, 5000)
+    dist = Distribution(relative_accuracy=0.01)
+    for value in values:
+        dist.add(value)
+
+    for q in (0.5, 0.9, 0.95, 0.99):
+        exact = _exact_quantile(values, q)
+        assert abs(dist.sketch.quantile(q) - exact) <= 0.011 * exact
+    assert abs(dist.mean - statistics.fmean(values)) < 1e-6
+    assert abs(dist.stddev - statistics.stdev(values)) < 1e-6
+
+
+def test_merged_distributions_match_a_single_pass() -> None:
+    left, right = _values(2, 700), _values(3, 300)
+    merged, a, b = Distribution(), Distribution(), Distribution()
+    for value in left:
+        a.add(value)
+        merged.add(value)
+    for value in right:
+        b.add(value)
+        merged.add(value)
+    a.merge(b)
+
+    assert a.count == merged.count
+    assert abs(a.mean - merged.mean) < 1e-6
+    assert abs(a.stddev - merged.stddev) < 1e-6
+    assert a.sketch.bins == merged.sketch.bins
+    assert a.sketch.quantile(0.99) == merged.sketch.quantile(0.99)
+
+
+def test_persisted_summaries_merge_into_fleet_percentiles() -> None:
+    runs, everything = [], []
+    for seed in range(3):
+        values = _values(seed, 400)
+        everything.extend(values)
+        dist = Distribution()
+        for value in values:
+            dist.add(value)
+        summary = RunSummary(
+            avg_accuracy=0.0,
+            avg_hallucination_risk=0.0,
+            avg_safety_risk=0.0,
+            avg_latency_ms=0.0,
+            total_cost_usd=0.0,
+            total_cases=len(values),
+            latency=dist.summary(),
+        )
+        runs.append(
+            RunEvalResponse(
+                run_id=str(seed),
+                model_id="m",
+                version_info=VersionInfo(prompt_version="v1", dataset_version="v1"),
+                summary=summary,
+                results=[],
+            )
+        )
+
+    fleet = _merged_latency(runs)
+    exact = _exact_quantile(everything, 0.95)
+    assert abs(fleet["latency_p95_ms"] - exact) <= 0.011 * exact
+
+
+def test_persisted_summaries_merge_from_unrounded_moments() -> None:
+    merged, single = Distribution(), Distribution()
+    for seed in range(3):
+        dist = Distribution()
+        for value in _values(seed, 400):
+            dist.add(value)
+            single.add(value)
+        stored = DistributionSummary.model_validate_json(dist.summary().model_dump_json())
+        merged.merge(Distribution.from_summary(stored))
+
+    assert merged.count == single.count
+    assert abs(merged.mean - single.mean) < 1e-9
+    assert abs(merged.stddev - single.stddev) < 1e-9
+    assert (merged.min, merged.max) == (single.min, single.max)
+    assert merged.sketch.bins == single.sketch.bins
+
+
+def test_summaries_without_state_still_merge() -> None:
+    dist = Distribution()
+    for value in _values(4, 100):
+        dist.add(value)
+    legacy = dist.summary().model_copy(update={"state": None})
+
+    restored = Distribution.from_summary(legacy)
+    assert restored.count == 100
+    assert restored.mean == legacy.mean
+    assert abs(restored.stddev - legacy.stddev) < 1e-9
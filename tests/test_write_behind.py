@@ -0,0 +1,112 @@
+import threading
+import time
+
+from app.services.write_behind import WriteBehind
+
+
+class _FlakySink:
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.written: list[str] = []
+
+    def __call__(self, payload: str) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database is down")
+        self.written.append(payload)
+
+
+def _writer(tmp_path, sink, **kwargs) -> WriteBehind:
+    return WriteBehind(
+        "test", sink, tmp_path / "outbox.sqlite3", retry_base_delay=0.01, **kwargs
+    )
+
+
+def test_failed_writes_are_replayed_in_order(tmp_path) -> None:
+    sink = _FlakySink(failures=3)
+    writer = _writer(tmp_path, sink)
+    writer.start()
+    for i in range(5):
+        writer.submit(f"run-{i}", f"payload-{i}")
+
+    assert writer.flush(timeout=5)
+    assert sink.written == [f"payload-{i}" for i in range(5)]
+    writer.close()
+
+
+def test_outbox_survives_shutdown_and_replays_on_next_start(tmp_path) -> None:
+    down = _FlakySink(failures=10**6)
+    writer = _writer(tmp_path, down)
+    writer.start()
+    writer.submit("run-1", "payload-1")
+    writer.close(timeout=0.05)
+    assert down.written == []
+
+    up = _FlakySink()
+    reopened = _writer(tmp_path, up)
+    assert reopened.pending() == 1
+    reopened.start()
+    assert reopened.flush(timeout=5)
+    assert up.written == ["payload-1"]
+    reopened.close()
+
+
+def test_submit_waits_for_the_worker_when_the_queue_is_full(tmp_path) -> None:
+    release = threading.Event()
+    written: list[str] = []
+
+    def slow_sink(payload: str) -> None:
+        release.wait()
+        written.append(payload)
+
+    writer = _writer(tmp_path, slow_sink, max_pending=1, backpressure_timeout=5.0)
+    writer.start()
+    writer.submit("run-1", "payload-1")
+    threading.Timer(0.1, release.set).start()
+    started = time.monotonic()
+    writer.submit("run-2", "payload-2")
+    assert time.monotonic() - started >= 0.05
+    assert writer.flush(timeout=5)
+    assert written == ["payload-1", "payload-2"]
+    writer.close()
+
+
+def test_poison_write_is_dead_lettered_and_the_rest_flow(tmp_path) -> None:
+    written: list[str] = []
+
+    def sink(payload: str) -> None:
+        if payload == "poison":
+            raise ConnectionError("still failing")
+        written.append(payload)
+
+    writer = _writer(tmp_path, sink, max_attempts=3)
+    writer.start()
+    for payload in ("poison", "payload-1", "payload-2"):
+        writer.submit(payload, payload)
+
+    assert writer.flush(timeout=5)
+    assert written == ["payload-1", "payload-2"]
+    assert writer.dead_letters() == 1
+    writer.close()
+
+
+def test_permanent_errors_skip_the_retries(tmp_path) -> None:
+    calls: list[str] = []
+
+    def sink(payload: str) -> None:
+        calls.append(payload)
+        raise ValueError("bad row")
+
+    writer = _writer(
+        tmp_path,
+        sink,
+        max_attempts=100,
+        is_transient=lambda exc: not isinstance(exc, ValueError),
+    )
+    writer.start()
+    writer.submit("run-1", "payload-1")
+
+    assert writer.flush(timeout=5)
+    assert calls == ["payload-1"]
+    assert writer.pending() == 0 and writer.dead_letters() == 1
+    writer.close()